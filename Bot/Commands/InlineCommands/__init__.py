@@ -1,9 +1,20 @@
-from .abjad import handle as abjad
-from .bastet import handle as bastet
-from .nutket import handle as nutket
-from .unsur import handle as unsur
-from .huddam import handle as huddam
-from .magic_square import handle as magic_square
-from .transliterate import handle as transliterate
-from .convert_numbers import handle as convert_numbers
-from .numerology import handle as numerology
\ No newline at end of file
+import importlib
+
+# Inline query handlers, imported on first access rather than with the package
+_HANDLERS = {
+	"abjad": ".abjad",
+	"bastet": ".bastet",
+	"nutket": ".nutket",
+	"unsur": ".unsur",
+	"huddam": ".huddam",
+	"magic_square": ".magic_square",
+	"transliterate": ".transliterate",
+	"convert_numbers": ".convert_numbers",
+	"numerology": ".numerology"
+}
+
+def __getattr__(name):
+	module = _HANDLERS.get(name)
+	if module is None:
+		raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+	return importlib.import_module(module, __name__).handle
@@ -5,7 +5,6 @@ from Bot.InlineCommands import (
 	abjad, bastet, nutket, unsur, huddam, magic_square,
 	transliterate, convert_numbers, numerology
 )
-from Bot.config import Config
 from Bot.database import Database
 from Bot.Helpers.i18n import I18n
 from Bot.utils import register_user_if_not_exists
@@ -19,7 +18,6 @@ async def inline_query(update: Update, context: ContextTypes.DEFAULT_TYPE):
 	logger.info(f"Processing inline query '{query}' from user {user.id if user else 'unknown'}")
 
 	try:
-		config = Config()
 		db = Database()
 		i18n = I18n()
 		user_id = user.id if user else 0
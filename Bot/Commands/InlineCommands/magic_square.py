@@ -1,7 +1,7 @@
 from telegram import InlineQueryResultArticle, InputTextMessageContent
 from Bot.database import Database
 from Bot.Helpers.i18n import I18n
-from Bot.Helpers.MagicSquare import MagicSquareGenerator
+from Bot.Helpers.MagicSquareCatalog import magic_square_catalog
 import logging
 
 logger = logging.getLogger(__name__)
@@ -67,8 +67,7 @@ async def handle(update, context):
 			raise ValueError(i18n.t("ERROR_MIN_SUM", language))
 
 		# Generate the magic square
-		magic_square = MagicSquareGenerator()
-		square = magic_square.generate_magic_square(3, number, 0, False, 'arabic')
+		square = magic_square_catalog.generate_magic_square(3, number, 0, False, 'arabic')
 		response = i18n.t("MAGICSQUARE_RESULT", language, number=number, square=square["box"])
 
 		# Log inline query activity if in a group
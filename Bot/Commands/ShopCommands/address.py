@@ -24,6 +24,8 @@ class AddressCommand:
 
 	def register_handlers(self, application: Application):
 		conv_handler = ConversationHandler(
+			name="address",
+			persistent=True,
 			entry_points=[CommandHandler('address', self.address_command)],
 			states={
 				SELECTING_ACTION: [
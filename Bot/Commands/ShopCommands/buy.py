@@ -25,6 +25,8 @@ class BuyCommand:
 
 	def register_handlers(self, application: Application):
 		conv_handler = ConversationHandler(
+			name="buy",
+			persistent=True,
 			entry_points=[CommandHandler('buy', self.buy_command)],
 			states={
 				SELECTING_PRODUCT: [
@@ -87,7 +89,7 @@ class BuyCommand:
 		language = self.db.get_user_language(user_id) or 'en'
 
 		product_id = int(query.data.split('_')[1])
-		product = self.db.get_product_by_id(product_id)
+		product = self.db.get_product_by_id(product_id, fresh=True)
 
 		if not product:
 			await query.edit_message_text(self.i18n.t('BUY_PRODUCT_UNAVAILABLE', language))
@@ -209,9 +211,13 @@ class BuyCommand:
 		user_id = update.effective_user.id
 		language = self.db.get_user_language(user_id) or 'en'
 
-		product = context.user_data['selected_product']
 		quantity = context.user_data['selected_quantity']
 		address = context.user_data['selected_address']
+		# Price and stock as they are now, not as they were when the product was picked
+		product = self.db.get_product_by_id(context.user_data['selected_product']['id'], fresh=True)
+		if not product or not product['active'] or (product['quantity'] is not None and product['quantity'] < quantity):
+			await query.edit_message_text(self.i18n.t('BUY_PRODUCT_UNAVAILABLE', language))
+			return ConversationHandler.END
 		total_price = float(product['price']) * quantity
 		user_balance = self.db.get_user_balance(user_id)
 
@@ -239,7 +245,7 @@ class BuyCommand:
 			return ConversationHandler.END
 
 		if product['quantity'] is not None:
-			self.db.update_product_quantity(product['id'], product['quantity'] - quantity)
+			self.db.decrement_product_quantity(product['id'], quantity)
 
 		self.db.log_user_activity(
 			user_id=user_id,
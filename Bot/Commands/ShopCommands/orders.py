@@ -23,6 +23,8 @@ class OrdersCommand:
 
 	def register_handlers(self, application: Application):
 		conv_handler = ConversationHandler(
+			name="orders",
+			persistent=True,
 			entry_points=[CommandHandler('orders', self.orders_command)],
 			states={
 				SELECTING_ORDER: [
@@ -24,6 +24,8 @@ class PaparaCommand:
 
 	def register_handlers(self, application: Application):
 		conv_handler = ConversationHandler(
+			name="papara",
+			persistent=True,
 			entry_points=[CommandHandler('papara', self.papara_command)],
 			states={
 				SELECTING_ACTION: [
@@ -23,6 +23,8 @@ class PasswordCommand:
 
 	def register_handlers(self, application: Application):
 		conv_handler = ConversationHandler(
+			name="password",
+			persistent=True,
 			entry_points=[CommandHandler('password', self.password_command)],
 			states={
 				ENTERING_OLD_PASSWORD: [
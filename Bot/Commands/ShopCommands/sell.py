@@ -251,6 +251,8 @@ async def cancel_sell(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
 
 def setup_sell_handler(application: Application) -> None:
 	conv_handler = ConversationHandler(
+		name="sell",
+		persistent=True,
 		entry_points=[CommandHandler("sell", start_sell)],
 		states={
 			CHECK_SELLER: [MessageHandler(filters.TEXT & ~filters.COMMAND, start_sell)],
@@ -1,9 +1,22 @@
-from .settings import settings_handle
-from .help_group_chat import help_group_chat_handle
-from .help import help_handle
-from .start import start_handle
-from .payment import payment_handle, get_payment_handlers
-from .language import language_handle
-from .credits import credits_handle
-from .callback_query import set_language_handle, handle_callback_query
-from .cancel import cancel_handle
\ No newline at end of file
+import importlib
+
+# Handlers are imported on first access rather than with the package
+_EXPORTS = {
+	"settings_handle": ".settings",
+	"help_group_chat_handle": ".help_group_chat",
+	"help_handle": ".help",
+	"start_handle": ".start",
+	"payment_handle": ".payment",
+	"get_payment_handlers": ".payment",
+	"language_handle": ".language",
+	"credits_handle": ".credits",
+	"set_language_handle": ".callback_query",
+	"handle_callback_query": ".callback_query",
+	"cancel_handle": ".cancel"
+}
+
+def __getattr__(name):
+	module = _EXPORTS.get(name)
+	if module is None:
+		raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+	return getattr(importlib.import_module(module, __name__), name)
@@ -7,6 +7,7 @@ from pathlib import Path
 from Bot.config import Config
 from Bot.database import Database
 from Bot.Helpers.i18n import I18n
+from Bot.Helpers.CommandAliases import get_command_aliases
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
 	Application, ExtBot, ConversationHandler, CommandHandler, MessageHandler,
@@ -41,9 +42,8 @@ async def help_handle(update: Update, context: ContextTypes.DEFAULT_TYPE):
 	# Get the command that triggered this help request
 	command_used = query.text.split()[0].lower() if hasattr(query, 'text') and query.text else "/help"
 
-	# Load command aliases to determine which language-specific help to show
-	command_aliases = load_command_aliases()
-	original_command = get_original_command(command_used[1:], command_aliases)  # Remove leading slash
+	# Determine which language-specific help to show
+	original_command = get_command_aliases().original(command_used)
 
 	buttons = [[InlineKeyboardButton(
 		i18n.t("HELP_GROUP_CHAT_USAGE", language),
@@ -60,45 +60,3 @@ async def help_handle(update: Update, context: ContextTypes.DEFAULT_TYPE):
 		context=context,
 		force_new_message=True
 	)
-
-def load_command_aliases():
-	"""Load command aliases from all language files."""
-	command_aliases = {}
-	try:
-		# Path to language files directory
-		lang_dir = Path(__file__).parent.parent / 'Translations'
-
-		if not lang_dir.exists():
-			return command_aliases
-
-		# Process each language file
-		for lang_file in lang_dir.glob('*.json'):
-			try:
-				with open(lang_file, 'r', encoding='utf-8') as f:
-					lang_data = json.load(f)
-
-				if 'COMMAND_ALIASES' in lang_data:
-					# For each command, add all its aliases to our mapping
-					for cmd, aliases in lang_data['COMMAND_ALIASES'].items():
-						if cmd not in command_aliases:
-							command_aliases[cmd] = []
-
-						# Add all aliases for this command
-						for alias in aliases:
-							if alias not in command_aliases[cmd]:
-								command_aliases[cmd].append(alias)
-
-			except Exception as e:
-				pass
-
-	except Exception as e:
-		pass
-
-	return command_aliases
-
-def get_original_command(alias, command_aliases):
-	"""Find the original command for a given alias."""
-	for cmd, aliases in command_aliases.items():
-		if alias in aliases:
-			return cmd
-	return alias  # Return the alias itself if no mapping found
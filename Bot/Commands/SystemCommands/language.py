@@ -2,7 +2,7 @@ import logging
 import os
 import re
 import asyncio
-from Bot.config import Config
+from Bot.config import get_config
 from Bot.database import Database
 from Bot.Helpers.i18n import I18n
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
@@ -30,7 +30,7 @@ async def language_handle(update: Update, context: ContextTypes.DEFAULT_TYPE, la
 
 	await register_user_if_not_exists(update, context, user)
 	user_id = user.id
-	config = Config()
+	config = get_config()
 	db = Database()
 	i18n = I18n()
 	telegram_lang = user.language_code or "en"
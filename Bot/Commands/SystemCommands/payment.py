@@ -1,7 +1,7 @@
 import os
 import logging
 import re
-from Bot.config import Config
+from Bot.config import get_config
 from Bot.database import Database
 from Bot.Helpers.i18n import I18n
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, LabeledPrice
@@ -32,7 +32,7 @@ async def payment_handle(update: Update, context: ContextTypes.DEFAULT_TYPE)	:
 	await register_user_if_not_exists(update, context, user)
 	user_id = user.id
 	db = Database()
-	config = Config()
+	config = get_config()
 	i18n = I18n()
 	language = db.get_user_language(user_id)
 	# await handle_credits(update, context) because payment MUST NOT decrement credits
@@ -70,7 +70,7 @@ async def payment_handle(update: Update, context: ContextTypes.DEFAULT_TYPE)	:
 	await send_long_message(reply_text, parse_mode=ParseMode.HTML, update=update, query_message=query_message,	context=context)
 
 	# Check if payment provider token is set
-	if not Config().payment_provider_token:
+	if not get_config().payment_provider_token:
 		await send_long_message(
 			i18n.t("PAYMENT_MISSING_PROVIDER_TOKEN", language),
 			parse_mode=ParseMode.HTML,
@@ -134,7 +134,7 @@ async def handle_payment_callback(update: Update, context: ContextTypes.DEFAULT_
 			)
 			return
 
-		if not Config().payment_provider_token:
+		if not get_config().payment_provider_token:
 			await send_long_message(
 				i18n.t("PAYMENT_MISSING_PROVIDER_TOKEN", language),
 				parse_mode=ParseMode.HTML,
@@ -160,7 +160,7 @@ async def handle_payment_callback(update: Update, context: ContextTypes.DEFAULT_
 				title=i18n.t("PAYMENT_PRODUCTS_CREDIT_PRODUCT_NAME", language),
 				description=i18n.t("PAYMENT_PRODUCTS_CREDIT_PRODUCT_DESCRIPTION", language),
 				payload="credit_500",
-				provider_token=Config().payment_provider_token,
+				provider_token=get_config().payment_provider_token,
 				currency="USD",
 				prices=[LabeledPrice("500 Credits", 200)],	# $2.00
 				start_parameter="credit-purchase"
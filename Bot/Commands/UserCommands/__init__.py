@@ -1,9 +1,28 @@
-from .huddam import get_huddam_conversation_handler, huddam_start, huddam_cancel	# Added
-from .bastet import get_bastet_conversation_handler, bastet_cancel	# Added
-from .abjad import get_abjad_conversation_handler, abjad_start, abjad_cancel	# Added
-from .unsur import get_unsur_conversation_handler, unsur_cancel
-from .transliterate import get_transliterate_conversation_handler, transliterate_start, transliterate_cancel
-from .magic_square import magic_square_handle
-from .convert_numbers import convert_numbers_handle
-from .nutket import nutket_handle
-from .numerology import numerology_handle
\ No newline at end of file
+import importlib
+
+# Handlers are imported on first access rather than with the package
+_EXPORTS = {
+	"get_huddam_conversation_handler": ".huddam",
+	"huddam_start": ".huddam",
+	"huddam_cancel": ".huddam",
+	"get_bastet_conversation_handler": ".bastet",
+	"bastet_cancel": ".bastet",
+	"get_abjad_conversation_handler": ".abjad",
+	"abjad_start": ".abjad",
+	"abjad_cancel": ".abjad",
+	"get_unsur_conversation_handler": ".unsur",
+	"unsur_cancel": ".unsur",
+	"get_transliterate_conversation_handler": ".transliterate",
+	"transliterate_start": ".transliterate",
+	"transliterate_cancel": ".transliterate",
+	"magic_square_handle": ".magic_square",
+	"convert_numbers_handle": ".convert_numbers",
+	"nutket_handle": ".nutket",
+	"numerology_handle": ".numerology"
+}
+
+def __getattr__(name):
+	module = _EXPORTS.get(name)
+	if module is None:
+		raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+	return getattr(importlib.import_module(module, __name__), name)
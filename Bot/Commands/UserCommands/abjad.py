@@ -2,10 +2,10 @@ import logging
 import re
 import urllib
 from datetime import datetime
-from Bot.config import Config
 from Bot.database import Database
 from Bot.Helpers.i18n import I18n
 from Bot.Helpers.Abjad import Abjad
+from Bot.Helpers.CallbackCodec import callback_codec
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
 	Application, ExtBot, ConversationHandler, CommandHandler, MessageHandler,
@@ -33,7 +33,6 @@ async def abjad_start(update: Update, context: ContextTypes.DEFAULT_TYPE, text:
 		if user:
 			await register_user_if_not_exists(update, context, user)
 		user_id = user.id if user else 0
-		config = Config()
 		db = Database()
 		i18n = I18n()
 		language = db.get_user_language(user_id) if user_id else "en"
@@ -105,7 +104,6 @@ async def abjad_alphabet_order(update: Update, context: ContextTypes.DEFAULT_TYP
 		if update.callback_query:
 			await query.answer()
 		user_id = user.id if user else 0
-		config = Config()
 		db = Database()
 		i18n = I18n()
 		language = db.get_user_language(user_id) if user_id else "en"
@@ -159,7 +157,6 @@ async def abjad_type(update: Update, context: ContextTypes.DEFAULT_TYPE):
 		if update.callback_query:
 			await query.answer()
 		user_id = user.id if user else 0
-		config = Config()
 		db = Database()
 		i18n = I18n()
 		language = db.get_user_language(user_id) if user_id else "en"
@@ -213,7 +210,6 @@ async def abjad_shadda(update: Update, context: ContextTypes.DEFAULT_TYPE):
 		if update.callback_query:
 			await query.answer()
 		user_id = user.id if user else 0
-		config = Config()
 		db = Database()
 		i18n = I18n()
 		language = db.get_user_language(user_id) if user_id else "en"
@@ -263,7 +259,6 @@ async def abjad_detail(update: Update, context: ContextTypes.DEFAULT_TYPE):
 		if update.callback_query:
 			await query.answer()
 		user_id = user.id if user else 0
-		config = Config()
 		db = Database()
 		i18n = I18n()
 		language = db.get_user_language(user_id) if user_id else "en"
@@ -315,7 +310,7 @@ async def abjad_detail(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 		keyboard = [
 			[InlineKeyboardButton(i18n.t("CREATE_MAGIC_SQUARE", language), callback_data=f"magic_square_{value}"),
-			 InlineKeyboardButton(i18n.t("SPELL_NUMBER", language), callback_data=f"nutket_{value}_{alphabeta}")],
+			 InlineKeyboardButton(i18n.t("SPELL_NUMBER", language), callback_data=callback_codec.encode("nutket", value, alphabeta))],
 			[InlineKeyboardButton(i18n.t("GENERATE_ENTITY", language), callback_data=f"huddam_cb_{value}"),
 			 InlineKeyboardButton(i18n.t("CANCEL_BUTTON", language), callback_data="end_conversation_abjad")]
 		]
@@ -352,7 +347,6 @@ async def abjad_cancel(update: Update, context: ContextTypes.DEFAULT_TYPE):
 		if update.callback_query:
 			await query.answer()
 		user_id = user.id if user else 0
-		config = Config()
 		db = Database()
 		i18n = I18n()
 		language = db.get_user_language(user_id) if user_id else "en"
@@ -379,6 +373,8 @@ async def abjad_cancel(update: Update, context: ContextTypes.DEFAULT_TYPE):
 def get_abjad_conversation_handler():
 	try:
 		handler = ConversationHandler(
+			name="abjad",
+			persistent=True,
 			entry_points=[CommandHandler("abjad", abjad_start)],
 			states={
 				ALPHABET_ORDER: [CallbackQueryHandler(abjad_alphabet_order)],
@@ -7,6 +7,7 @@ from Bot.config import Config
 from Bot.database import Database
 from Bot.Helpers.i18n import I18n
 from Bot.Helpers.Abjad import Abjad
+from Bot.Helpers.CallbackCodec import callback_codec
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
 	Application, ExtBot, ConversationHandler, CommandHandler, MessageHandler,
@@ -253,7 +254,7 @@ async def bastet_language(update: Update, context: ContextTypes.DEFAULT_TYPE)	:
 
 		keyboard = [
 			[InlineKeyboardButton(i18n.t("CREATE_MAGIC_SQUARE", language), callback_data=f"magic_square_{number}"),
-			InlineKeyboardButton(i18n.t("SPELL_NUMBER", language), callback_data=f"nutket_{number}_{alphabeta}")],
+			InlineKeyboardButton(i18n.t("SPELL_NUMBER", language), callback_data=callback_codec.encode("nutket", number, alphabeta))],
 			[InlineKeyboardButton(i18n.t("GENERATE_ENTITY", language), callback_data=f"huddam_cb_{number}"),
 			InlineKeyboardButton(i18n.t("CANCEL_BUTTON", language), callback_data="end_conversation_bastet")],
 		]
@@ -306,6 +307,8 @@ async def bastet_cancel(update: Update, context: ContextTypes.DEFAULT_TYPE)	:
 def get_bastet_conversation_handler():
 	try:
 		handler = ConversationHandler(
+			name="bastet",
+			persistent=True,
 			entry_points=[CommandHandler("bastet", bastet_start)],
 			states={
 				REPETITION: [MessageHandler(filters.Text() & ~filters.COMMAND, bastet_repetition)],
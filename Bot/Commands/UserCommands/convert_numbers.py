@@ -15,6 +15,7 @@ from telegram.ext import (
 from telegram.constants import ParseMode
 from telegram.error import BadRequest
 from Bot.Helpers.NumberConverter import NumberConverter
+from Bot.Helpers.CallbackCodec import callback_codec
 from Bot.utils import (
 	register_user_if_not_exists, get_warning_description, get_ai_commentary,
 	timeout, handle_credits, send_long_message, uptodate_query
@@ -97,12 +98,12 @@ async def convert_numbers_handle(update: Update, context: ContextTypes.DEFAULT_T
 		if alt_format in ["invert", "arabic"]:
 			buttons.append([InlineKeyboardButton(
 				i18n.t("INDIAN_NUMBERS", language),
-				callback_data=f"convertnumbers_{encoded_text}_indian"
+				callback_data=callback_codec.encode("convertnumbers", text, "indian")
 			)])
 		if alt_format in ["invert", "indian"]:
 			buttons.append([InlineKeyboardButton(
 				i18n.t("ARABIC_NUMBERS", language),
-				callback_data=f"convertnumbers_{encoded_text}_arabic"
+				callback_data=callback_codec.encode("convertnumbers", text, "arabic")
 			)])
 		reply_markup = InlineKeyboardMarkup(buttons)
 
@@ -6,6 +6,7 @@ from Bot.config import Config
 from Bot.database import Database
 from Bot.Helpers.i18n import I18n
 from Bot.Helpers.Abjad import Abjad
+from Bot.Helpers.CallbackCodec import callback_codec
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
 	Application, ExtBot, ConversationHandler, CommandHandler, MessageHandler,
@@ -223,7 +224,7 @@ async def huddam_multipliar(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
 		response = i18n.t("HUDDAM_RESULT", language, number=number, type=entity_type, huddam_lang=i18n.t(huddam_lang_text, language), name=result)
 		keyboard = [
-			[InlineKeyboardButton(i18n.t("CALCULATE_ABJAD", language), callback_data=f"abjad_text_{result}"),
+			[InlineKeyboardButton(i18n.t("CALCULATE_ABJAD", language), callback_data=callback_codec.encode("abjad_text", result)),
 			InlineKeyboardButton(i18n.t("CANCEL_BUTTON", language), callback_data="end_conversation_huddam")],
 		]
 		await send_long_message(
@@ -275,6 +276,8 @@ async def huddam_cancel(update: Update, context: ContextTypes.DEFAULT_TYPE)	:
 def get_huddam_conversation_handler():
 	try:
 		handler = ConversationHandler(
+			name="huddam",
+			persistent=True,
 			entry_points=[CommandHandler("huddam", huddam_start)],
 			states={
 				ENTITY_TYPE: [CallbackQueryHandler(huddam_entity_type)],
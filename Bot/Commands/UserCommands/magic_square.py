@@ -8,7 +8,7 @@ from datetime import datetime
 from Bot.config import Config
 from Bot.database import Database
 from Bot.Helpers.i18n import I18n
-from Bot.Helpers.MagicSquare import MagicSquareGenerator
+from Bot.Helpers.MagicSquareCatalog import magic_square_catalog
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
 	Application, ExtBot, ConversationHandler, CommandHandler, MessageHandler,
@@ -64,8 +64,7 @@ async def magic_square_handle(update: Update, context: ContextTypes.DEFAULT_TYPE
 				context=context
 			)
 			return
-		magic_square = MagicSquareGenerator()
-		square = magic_square.generate_magic_square(3, row_sum, 0, False, 'arabic')
+		square = magic_square_catalog.generate_magic_square(3, row_sum, 0, False, 'arabic')
 		response = i18n.t("MAGICSQUARE_RESULT", language, number=row_sum, square=square["box"])
 
 		commentary = await get_ai_commentary(response, language)
@@ -9,6 +9,7 @@ from Bot.config import Config
 from Bot.database import Database
 from Bot.Helpers.i18n import I18n
 from Bot.Helpers.Numerology import UnifiedNumerology
+from Bot.Helpers.CallbackCodec import callback_codec
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
 	Application, ExtBot, ConversationHandler, CommandHandler, MessageHandler,
@@ -91,7 +92,7 @@ async def numerology_handle(update: Update, context: ContextTypes.DEFAULT_TYPE,
 			buttons = [
 				[InlineKeyboardButton(
 					get_alphabet_name(alphabet, language, i18n),
-					callback_data=f"numerology_{alphabet}_normal_{encoded_text}"
+					callback_data=callback_codec.encode("numerology", alphabet, "normal", text)
 				)] for alphabet in available_alphabets
 			]
 			reply_markup = InlineKeyboardMarkup(buttons)
@@ -146,12 +147,12 @@ async def numerology_handle(update: Update, context: ContextTypes.DEFAULT_TYPE,
 		buttons = [
 			[InlineKeyboardButton(
 				f"{get_method_name(m, language, i18n)}",
-				callback_data=f"numerology_{alphabet}_{m}_{encoded_text}"
+				callback_data=callback_codec.encode("numerology", alphabet, m, text)
 			)] for m in numerology.get_available_methods() if m != method
 		]
 		keyboard = [
 			[InlineKeyboardButton(i18n.t("CREATE_MAGIC_SQUARE", language), callback_data=f"magic_square_{value}"),
-			InlineKeyboardButton(i18n.t("SPELL_NUMBER", language), callback_data=f"nutket_{value}_{alphabeta}")],
+			InlineKeyboardButton(i18n.t("SPELL_NUMBER", language), callback_data=callback_codec.encode("nutket", value, alphabeta))],
 			[InlineKeyboardButton(i18n.t("GENERATE_ENTITY", language), callback_data=f"huddam_cb_{value}"),
 			InlineKeyboardButton(i18n.t("CANCEL_BUTTON", language), callback_data="end_conversation_abjad")]
 		]
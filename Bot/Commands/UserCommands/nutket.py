@@ -7,6 +7,7 @@ from Bot.config import Config
 from Bot.database import Database
 from Bot.Helpers.i18n import I18n
 from Bot.Helpers.Abjad import Abjad
+from Bot.Helpers.CallbackCodec import callback_codec
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
 	Application, ExtBot, ConversationHandler, CommandHandler, MessageHandler,
@@ -96,7 +97,7 @@ async def nutket_handle(update: Update, context: ContextTypes.DEFAULT_TYPE, numb
 			)])
 		keyboard.append([InlineKeyboardButton(
 			i18n.t("CALCULATE_ABJAD", language),
-			callback_data=f"abjad_text_{spelled}"
+			callback_data=callback_codec.encode("abjad_text", spelled)
 		)])
 		reply_markup = InlineKeyboardMarkup(keyboard)
 
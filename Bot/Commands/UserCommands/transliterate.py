@@ -14,6 +14,7 @@ from Bot.config import Config
 from Bot.database import Database
 from Bot.Helpers.i18n import I18n
 from Bot.Helpers.Transliteration import Transliteration
+from Bot.Helpers.CallbackCodec import callback_codec
 from Bot.utils import register_user_if_not_exists, get_ai_commentary, timeout, handle_credits, send_long_message, uptodate_query
 from Bot.cache import Cache
 from Bot.Commands.UserCommands.abjad import abjad_start
@@ -295,7 +296,7 @@ async def show_suggestions(update: Update, context: ContextTypes.DEFAULT_TYPE):
 			),
 			InlineKeyboardButton(
 				i18n.t("CALCULATE_ABJAD", language),
-				callback_data=f"abjad_text_{urllib.parse.quote(primary)}"
+				callback_data=callback_codec.encode("abjad_text", primary)
 			)
 		])
 		keyboard.append([
@@ -351,6 +352,10 @@ async def handle_suggestion(update: Update, context: ContextTypes.DEFAULT_TYPE):
 			text = urllib.parse.unquote(query.data[len("abjad_text_"):])
 			return await abjad_start(update, context, text=text)
 
+		packed = callback_codec.match(query.data, "abjad_text")
+		if packed:
+			return await abjad_start(update, context, text=packed[0])
+
 		if not query.data.startswith("suggestion_"):
 			logger.debug(f"Ignoring unrelated callback in handle_suggestion: {query.data}")
 			return SUGGESTIONS
@@ -399,7 +404,7 @@ async def handle_suggestion(update: Update, context: ContextTypes.DEFAULT_TYPE):
 			[
 				InlineKeyboardButton(
 					i18n.t("CALCULATE_ABJAD", language),
-					callback_data=f"abjad_text_{urllib.parse.quote(selected)}"
+					callback_data=callback_codec.encode("abjad_text", selected)
 				)
 			],
 			[InlineKeyboardButton(
@@ -518,6 +523,10 @@ async def handle_history_selection(update: Update, context: ContextTypes.DEFAULT
 			text = urllib.parse.unquote(query.data[len("abjad_text_"):])
 			return await abjad_start(update, context, text=text)
 
+		packed = callback_codec.match(query.data, "abjad_text")
+		if packed:
+			return await abjad_start(update, context, text=packed[0])
+
 		if not query.data.startswith("history_select_"):
 			logger.debug(f"Ignoring unrelated callback in handle_history_selection: {query.data}")
 			return HISTORY
@@ -530,7 +539,7 @@ async def handle_history_selection(update: Update, context: ContextTypes.DEFAULT
 			[
 				InlineKeyboardButton(
 					i18n.t("CALCULATE_ABJAD", language),
-					callback_data=f"abjad_text_{urllib.parse.quote(selected)}"
+					callback_data=callback_codec.encode("abjad_text", selected)
 				)
 			],
 			[
@@ -640,6 +649,8 @@ def get_transliterate_conversation_handler():
 	"""Return the conversation handler for /transliterate."""
 	try:
 		handler = ConversationHandler(
+			name="transliterate",
+			persistent=True,
 			entry_points=[CommandHandler("transliterate", transliterate_start)],
 			states={
 				TEXT: [MessageHandler(filters.Text() & ~filters.COMMAND, transliterate_text)],
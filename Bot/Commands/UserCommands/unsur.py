@@ -8,6 +8,7 @@ from Bot.database import Database
 from Bot.Helpers.i18n import I18n
 from Bot.Helpers.Abjad import Abjad
 from Bot.Helpers.ElementClassifier import ElementClassifier
+from Bot.Helpers.CallbackCodec import callback_codec
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
 	Application, ExtBot, ConversationHandler, CommandHandler, MessageHandler,
@@ -165,6 +166,7 @@ async def unsur_language(update: Update, context: ContextTypes.DEFAULT_TYPE)	:
 			InlineKeyboardButton(i18n.t("ELEMENT_WATER", language), callback_data="unsur_table_water")],
 			[InlineKeyboardButton(i18n.t("ELEMENT_AIR", language), callback_data="unsur_table_air"),
 			InlineKeyboardButton(i18n.t("ELEMENT_EARTH", language), callback_data="unsur_table_earth")],
+			[InlineKeyboardButton(i18n.t("ELEMENT_ALL", language), callback_data="unsur_table_all")],
 			[InlineKeyboardButton(i18n.t("CANCEL_BUTTON", language), callback_data="end_conversation")],
 		]
 		await send_long_message(
@@ -213,6 +215,40 @@ async def unsur_table(update: Update, context: ContextTypes.DEFAULT_TYPE)	:
 		shadda = context.user_data.get("shadda", 1)
 
 		unsur = ElementClassifier()
+		elements = {
+			"fire": i18n.t("ELEMENT_FIRE", language),
+			"water": i18n.t("ELEMENT_WATER", language),
+			"air": i18n.t("ELEMENT_AIR", language),
+			"earth": i18n.t("ELEMENT_EARTH", language)
+		}
+		if table == "all":
+			# One pass over the text yields every element for the chosen guide
+			result = unsur.classify_all(input_text, shadda, [lang])
+			if isinstance(result, str):
+				await send_long_message(
+					i18n.t("ERROR_GENERAL", language, error=result),
+					parse_mode="HTML",
+					update=update,
+					query_message=query_message,
+					context=context
+				)
+				return ConversationHandler.END
+			by_element = next(iter(result.values()))
+			lines = "\n".join(
+				f"{elements[element]}: {found['adet']} ({found['liste']})"
+				for element, found in by_element.items()
+			)
+			await send_long_message(
+				i18n.t("UNSUR_RESULT_ALL", language, input=input_text, lines=lines),
+				parse_mode=ParseMode.HTML,
+				reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton(i18n.t("CANCEL_BUTTON", language), callback_data="end_conversation_unsur")]]),
+				update=update,
+				query_message=query_message,
+				context=context
+			)
+			context.user_data.clear()
+			return ConversationHandler.END
+
 		result = unsur.classify_elements(input_text, table, shadda, lang)
 		if isinstance(result, str) and result.startswith("Error"):
 			await send_long_message(
@@ -226,19 +262,13 @@ async def unsur_table(update: Update, context: ContextTypes.DEFAULT_TYPE)	:
 
 		value = result["adet"]
 		liste = result["liste"]
-		elements = {
-			"fire": i18n.t("ELEMENT_FIRE", language),
-			"water": i18n.t("ELEMENT_WATER", language),
-			"air": i18n.t("ELEMENT_AIR", language),
-			"earth": i18n.t("ELEMENT_EARTH", language)
-		}
 		element = elements.get(table, i18n.t("ELEMENT_UNKNOWN", language))
 
 		response = i18n.t("UNSUR_RESULT", language, input=input_text, liste=liste, value=value, element=element)
 		keyboard = [
 			[InlineKeyboardButton(i18n.t("CREATE_MAGIC_SQUARE", language), callback_data=f"magic_square_{value}"),
-			InlineKeyboardButton(i18n.t("SPELL_NUMBER", language), callback_data=f"nutket_{value}_{lang}")],
-			[InlineKeyboardButton(i18n.t("CALCULATE_ABJAD", language), callback_data=f"abjad_text_{liste}"),
+			InlineKeyboardButton(i18n.t("SPELL_NUMBER", language), callback_data=callback_codec.encode("nutket", value, lang))],
+			[InlineKeyboardButton(i18n.t("CALCULATE_ABJAD", language), callback_data=callback_codec.encode("abjad_text", liste)),
 			InlineKeyboardButton(i18n.t("CANCEL_BUTTON", language), callback_data="end_conversation_unsur")]
 		]
 
@@ -297,6 +327,8 @@ async def unsur_cancel(update: Update, context: ContextTypes.DEFAULT_TYPE)	:
 def get_unsur_conversation_handler():
 	try:
 		handler = ConversationHandler(
+			name="unsur",
+			persistent=True,
 			entry_points=[CommandHandler("unsur", unsur_start)],
 			states={
 				LANGUAGE: [CallbackQueryHandler(unsur_language)],
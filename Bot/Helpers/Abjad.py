@@ -2,6 +2,7 @@ import re
 import math
 import random
 from typing import Union, List, Dict, Tuple, Optional
+from .DigitConverter import digit_converter
 
 class Abjad:
 	def __init__(self):
@@ -766,32 +767,12 @@ class Abjad:
 
 	def indian(self, metin: str) -> str:
 		try:
-			na = ""
-			chars = re.findall(r'.', metin, re.UNICODE)
-			num_map = {
-				"0": "٠", "1": "١", "2": "٢", "3": "٣", "4": "٤",
-				"5": "٥", "6": "٦", "7": "٧", "8": "٨", "9": "٩"
-			}
-
-			for char in chars:
-				na += num_map.get(char, char if char != " " else " ")
-
-			return na
+			return digit_converter.to_indian(metin)
 		except Exception as e:
 			return f"Error: {str(e)}"
 
 	def arabic(self, metin: str) -> str:
 		try:
-			na = ""
-			chars = re.findall(r'.', metin, re.UNICODE)
-			num_map = {
-				"٠": "0", "١": "1", "٢": "2", "٣": "3", "٤": "4",
-				"٥": "5", "٦": "6", "٧": "7", "٨": "8", "٩": "9"
-			}
-
-			for char in chars:
-				na += num_map.get(char, char if char != " " else " ")
-
-			return na
+			return digit_converter.to_arabic(metin)
 		except Exception as e:
 			return f"Error: {str(e)}"
\ No newline at end of file
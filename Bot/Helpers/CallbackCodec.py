@@ -0,0 +1,212 @@
+import base64
+import logging
+import secrets
+
+logger = logging.getLogger(__name__)
+
+# Telegram rejects callback_data longer than 64 bytes
+MAX_CALLBACK_BYTES = 64
+# Packed callback_data starts with "~", which no plain-text route uses
+CALLBACK_PREFIX = "~"
+# After the prefix, "!" marks a reference to a payload kept in the ephemeral store
+OVERFLOW_MARKER = "!"
+OVERFLOW_TTL = 7 * 24 * 3600
+CODEC_VERSION = 1
+
+NUTKET_LANGUAGES = ("arabic", "hebrew", "turkish", "english", "latin")
+NUMEROLOGY_ALPHABETS = (
+	"arabic_abjadi", "arabic_maghribi", "arabic_hija", "arabic_maghribi_hija",
+	"hebrew", "english", "latin", "turkish", "ottoman"
+)
+NUMEROLOGY_METHODS = ("normal", "inverse", "base36", "base36_inverse", "base100", "base100_inverse")
+NUMBER_FORMATS = ("arabic", "indian", "persian", "invert", "hebrew")
+
+class CallbackExpired(ValueError):
+	"""An overflowed payload is no longer (or was never) in the ephemeral store this worker reads."""
+
+def write_varint(buffer: bytearray, value: int) -> None:
+	if value < 0:
+		raise ValueError("varint must be non-negative")
+	while value > 0x7F:
+		buffer.append((value & 0x7F) | 0x80)
+		value >>= 7
+	buffer.append(value)
+
+def read_varint(data: bytes, offset: int):
+	value = 0
+	shift = 0
+	while True:
+		if offset >= len(data):
+			raise ValueError("Truncated varint")
+		byte = data[offset]
+		offset += 1
+		value |= (byte & 0x7F) << shift
+		if not byte & 0x80:
+			return value, offset
+		shift += 7
+		if shift > 63:
+			raise ValueError("Varint too long")
+
+class UInt:
+	"""Non-negative integer as a varint."""
+
+	def write(self, buffer: bytearray, value) -> None:
+		write_varint(buffer, int(value))
+
+	def read(self, data: bytes, offset: int):
+		return read_varint(data, offset)
+
+class Str:
+	"""UTF-8 text with a varint length."""
+
+	def write(self, buffer: bytearray, value) -> None:
+		encoded = str(value).encode("utf-8")
+		write_varint(buffer, len(encoded))
+		buffer.extend(encoded)
+
+	def read(self, data: bytes, offset: int):
+		length, offset = read_varint(data, offset)
+		if offset + length > len(data):
+			raise ValueError("Truncated string")
+		return data[offset:offset + length].decode("utf-8"), offset + length
+
+class Enum:
+	"""One of a fixed table of strings as a varint index; other values fall back to text."""
+
+	def __init__(self, values: tuple):
+		self.values = tuple(values)
+		self.index = {value: position for position, value in enumerate(self.values)}
+		self._text = Str()
+
+	def write(self, buffer: bytearray, value) -> None:
+		position = self.index.get(value)
+		if position is None:
+			buffer.append(0)
+			self._text.write(buffer, value)
+		else:
+			write_varint(buffer, position + 1)
+
+	def read(self, data: bytes, offset: int):
+		position, offset = read_varint(data, offset)
+		if position == 0:
+			return self._text.read(data, offset)
+		if position > len(self.values):
+			raise ValueError("Enum index out of range")
+		return self.values[position - 1], offset
+
+class CallbackCodec:
+	"""
+	Versioned binary packing for callback_data.
+
+	A packed value is "~" followed by unpadded base64url of
+	[version][route tag][fields...], with fields written by the route's
+	schema. When that would exceed Telegram's 64-byte limit the bytes go to
+	the ephemeral store and the button carries "~!" plus a short key.
+
+	Overflowed buttons can only be read back from the same store, so with
+	more than one worker EPHEMERAL_STORE must point at a shared store
+	(sqlite:///...); the default in-process memory store only works for a
+	single worker. A missing payload raises CallbackExpired, which handlers
+	turn into a message asking the user to run the command again.
+	"""
+
+	def __init__(self, store=None, max_length: int = MAX_CALLBACK_BYTES, version: int = CODEC_VERSION):
+		self._store = store
+		self.max_length = max_length
+		self.version = version
+		self._by_name = {}
+		self._by_tag = {}
+		self._warned = False
+
+	@property
+	def store(self):
+		if self._store is None:
+			from Bot.cache import get_store
+			self._store = get_store()
+		return self._store
+
+	def register(self, name: str, tag: int, *fields) -> None:
+		"""Declare a route's fields; tags are part of the wire format and must never be reused."""
+		if name in self._by_name or tag in self._by_tag:
+			raise ValueError(f"Callback route already registered: {name} ({tag})")
+		self._by_name[name] = (tag, fields)
+		self._by_tag[tag] = (name, fields)
+
+	def pack(self, name: str, *values) -> bytes:
+		tag, fields = self._by_name[name]
+		if len(values) != len(fields):
+			raise ValueError(f"{name} takes {len(fields)} values, got {len(values)}")
+		buffer = bytearray((self.version,))
+		write_varint(buffer, tag)
+		for field, value in zip(fields, values):
+			field.write(buffer, value)
+		return bytes(buffer)
+
+	def unpack(self, data: bytes):
+		if not data or data[0] != self.version:
+			raise ValueError("Unsupported callback version")
+		tag, offset = read_varint(data, 1)
+		if tag not in self._by_tag:
+			raise ValueError(f"Unknown callback route tag: {tag}")
+		name, fields = self._by_tag[tag]
+		values = []
+		for field in fields:
+			value, offset = field.read(data, offset)
+			values.append(value)
+		if offset != len(data):
+			raise ValueError("Trailing bytes in callback data")
+		return name, tuple(values)
+
+	def encode(self, name: str, *values) -> str:
+		"""callback_data for a route; long payloads are moved to the ephemeral store."""
+		packed = self.pack(name, *values)
+		text = CALLBACK_PREFIX + base64.urlsafe_b64encode(packed).rstrip(b"=").decode("ascii")
+		if len(text) <= self.max_length:
+			return text
+		store = self.store
+		from Bot.cache import MemoryStore
+		if not self._warned and isinstance(store, MemoryStore):
+			self._warned = True
+			logger.warning(
+				"Callback data overflowed into the in-process memory store; set EPHEMERAL_STORE to a shared "
+				"store (sqlite:///...) when running more than one worker, or these buttons will expire on the others"
+			)
+		while True:
+			key = secrets.token_urlsafe(9)
+			if store.add(f"callback:{key}", packed, OVERFLOW_TTL):
+				return CALLBACK_PREFIX + OVERFLOW_MARKER + key
+
+	def decode(self, data: str):
+		"""(route name, values) for packed callback_data; raises CallbackExpired or ValueError."""
+		if not data or not data.startswith(CALLBACK_PREFIX):
+			raise ValueError("Not a packed callback")
+		body = data[len(CALLBACK_PREFIX):]
+		if body.startswith(OVERFLOW_MARKER):
+			packed = self.store.get(f"callback:{body[len(OVERFLOW_MARKER):]}")
+			if packed is None:
+				raise CallbackExpired("This button has expired, please run the command again")
+		else:
+			try:
+				packed = base64.urlsafe_b64decode(body + "=" * (-len(body) % 4))
+			except (ValueError, TypeError) as e:
+				raise ValueError(f"Invalid callback encoding: {str(e)}")
+		return self.unpack(packed)
+
+	def match(self, data: str, name: str):
+		"""Values if data is a packed callback for name, else None; CallbackExpired is raised for the caller to report."""
+		if not data or not data.startswith(CALLBACK_PREFIX):
+			return None
+		try:
+			decoded_name, values = self.decode(data)
+		except CallbackExpired:
+			raise
+		except ValueError as e:
+			logger.error(f"Unreadable callback data {data}: {str(e)}")
+			return None
+		return values if decoded_name == name else None
+
+callback_codec = CallbackCodec()
+callback_codec.register("abjad_text", 1, Str())
+callback_codec.register("nutket", 2, UInt(), Enum(NUTKET_LANGUAGES))
+callback_codec.register("numerology", 3, Enum(NUMEROLOGY_ALPHABETS), Enum(NUMEROLOGY_METHODS), Str())
+callback_codec.register("convertnumbers", 4, Str(), Enum(NUMBER_FORMATS))
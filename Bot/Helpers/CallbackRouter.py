@@ -0,0 +1,179 @@
+import bisect
+import logging
+import threading
+import time
+from .CallbackCodec import CALLBACK_PREFIX, CallbackExpired
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds; the last bucket catches everything slower
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+
+class LatencyHistogram:
+	"""Fixed-bucket latency histogram for one route."""
+	__slots__ = ("bounds", "counts", "count", "total", "max")
+
+	def __init__(self, bounds: tuple = LATENCY_BUCKETS):
+		self.bounds = bounds
+		self.counts = [0] * len(bounds)
+		self.count = 0
+		self.total = 0.0
+		self.max = 0.0
+
+	def observe(self, seconds: float) -> None:
+		self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+		self.count += 1
+		self.total += seconds
+		if seconds > self.max:
+			self.max = seconds
+
+	def quantile(self, q: float) -> float:
+		"""Upper bound of the bucket holding the q-th observation"""
+		if not self.count:
+			return 0.0
+		rank = q * self.count
+		seen = 0
+		for bound, count in zip(self.bounds, self.counts):
+			seen += count
+			if seen >= rank:
+				return self.max if bound == float("inf") else bound
+		return self.max
+
+	def snapshot(self) -> dict:
+		return {
+			"count": self.count,
+			"mean": self.total / self.count if self.count else 0.0,
+			"p50": self.quantile(0.5),
+			"p95": self.quantile(0.95),
+			"max": self.max,
+			"buckets": {("+Inf" if bound == float("inf") else str(bound)): count for bound, count in zip(self.bounds, self.counts)}
+		}
+
+class _Route:
+	__slots__ = ("name", "prefix", "handler", "exact", "histogram")
+
+	def __init__(self, name: str, prefix: str, handler, exact: bool):
+		self.name = name
+		self.prefix = prefix
+		self.handler = handler
+		self.exact = exact
+		self.histogram = LatencyHistogram()
+
+class CallbackRouter:
+	"""
+	Prefix trie over callback_data.
+
+	Routes are registered with a prefix; resolving walks the data one
+	character at a time and picks the longest registered prefix, so the
+	cost depends on the prefix length rather than the number of routes.
+	Exact routes only match when the whole callback_data equals the prefix.
+	Handlers are awaited with the remainder of the data after the prefix,
+	and each call's latency is recorded per route.
+
+	With a codec, callback_data packed by CallbackCodec is decoded and sent
+	to the route registered with packed(name), which gets the value tuple.
+	An expired overflow payload raises CallbackExpired from dispatch().
+	"""
+
+	def __init__(self, codec=None):
+		self.codec = codec
+		self._root = {}
+		self._routes = {}
+		self._packed = {}
+		self._lock = threading.Lock()
+
+	def route(self, prefix: str, exact: bool = False, name: str = None):
+		"""Decorator registering handler(payload, *args) for a callback prefix."""
+		def decorator(handler):
+			self.add(prefix, handler, exact, name)
+			return handler
+		return decorator
+
+	def packed(self, name: str):
+		"""Decorator registering handler(values, *args) for a codec route name."""
+		def decorator(handler):
+			if name in self._packed:
+				raise ValueError(f"Packed callback route already registered: {name}")
+			route = _Route("~" + name, name, handler, True)
+			self._packed[name] = route
+			self._routes[route.name] = route
+			return handler
+		return decorator
+
+	def add(self, prefix: str, handler, exact: bool = False, name: str = None) -> None:
+		if not prefix:
+			raise ValueError("Callback route prefix must not be empty")
+		route = _Route(name or prefix.rstrip("_|") or prefix, prefix, handler, exact)
+		node = self._root
+		for char in prefix:
+			node = node.setdefault(char, {})
+		key = "exact" if exact else "prefix"
+		if key in node.get(None, {}):
+			raise ValueError(f"Callback route already registered: {prefix}")
+		# The None key holds the routes ending at this node, keyed by match kind
+		node.setdefault(None, {})[key] = route
+		self._routes[route.name] = route
+
+	def matches(self, data: str) -> bool:
+		"""Cheap check used as the handler pattern; packed data is not decoded here."""
+		data = data or ""
+		if self.codec is not None and data.startswith(CALLBACK_PREFIX):
+			return True
+		return self.resolve(data)[0] is not None
+
+	def resolve(self, data: str):
+		"""Return (route, payload) for the longest matching prefix, or (None, data)."""
+		if self.codec is not None and data.startswith(CALLBACK_PREFIX):
+			try:
+				name, values = self.codec.decode(data)
+			except CallbackExpired:
+				# Left to the caller, so the user is told instead of the button doing nothing
+				raise
+			except ValueError as e:
+				logger.error(f"Unreadable callback data {data}: {str(e)}")
+				return None, data
+			return self._packed.get(name), values
+		node = self._root
+		match = None
+		for index, char in enumerate(data):
+			ends = node.get(None)
+			if ends and "prefix" in ends:
+				match = (ends["prefix"], index)
+			node = node.get(char)
+			if node is None:
+				break
+		else:
+			ends = node.get(None)
+			if ends:
+				route = ends.get("exact") or ends.get("prefix")
+				return route, ""
+		if match is None:
+			return None, data
+		route, index = match
+		return route, data[index:]
+
+	def prefixes(self) -> list:
+		return [route.prefix for route in self._routes.values()]
+
+	async def dispatch(self, data: str, *args, **kwargs):
+		"""Run the handler matching data; returns (matched, result)."""
+		route, payload = self.resolve(data or "")
+		if route is None:
+			return False, None
+		started = time.perf_counter()
+		try:
+			return True, await route.handler(payload, *args, **kwargs)
+		finally:
+			elapsed = time.perf_counter() - started
+			with self._lock:
+				route.histogram.observe(elapsed)
+
+	def stats(self) -> dict:
+		"""Latency summary per route name, slowest p95 first."""
+		with self._lock:
+			snapshots = {name: route.histogram.snapshot() for name, route in self._routes.items()}
+		return dict(sorted(snapshots.items(), key=lambda item: item[1]["p95"], reverse=True))
+
+	def histograms(self) -> dict:
+		"""Latency histogram per route name, for the metrics endpoint."""
+		return {name: route.histogram for name, route in self._routes.items()}
@@ -7,6 +7,7 @@ import json
 from Bot.config import Config
 from Bot.database import Database
 from Bot.Helpers.i18n import I18n
+from Bot.Helpers.CommandAliases import LOCALES_DIR, get_command_aliases
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
 	Application, ExtBot, ConversationHandler, CommandHandler, MessageHandler,
@@ -29,57 +30,10 @@ class CommandAliasManager:
 	"""
 
 	def __init__(self):
-		self.config = Config()
-		self.translations_dir = Path(__file__).parent.parent / 'Locales'
-		self.command_aliases = {}
-		self.reverse_aliases = {}  # Maps aliases back to original commands
-		self.load_all_aliases()
-
-	def load_all_aliases(self):
-		"""Load all command aliases from all language files."""
-		try:
-			if not self.translations_dir.exists():
-				logger.warning(f"Translations directory not found: {self.translations_dir}")
-				os.makedirs(self.translations_dir, exist_ok=True)
-				return
-
-			# Process each language file
-			for lang_file in self.translations_dir.glob('*.json'):
-				language = lang_file.stem
-				self.load_language_aliases(language)
-
-		except Exception as e:
-			logger.error(f"Error loading all command aliases: {str(e)}")
-
-	def load_language_aliases(self, language):
-		"""
-		Load command aliases for a specific language.
-
-		Args:
-			language: The language code to load aliases for
-		"""
-		try:
-			lang_file = self.translations_dir / f'{language}.json'
-			if not lang_file.exists():
-				logger.warning(f"Language file not found: {lang_file}")
-				return
-
-			with open(lang_file, 'r', encoding='utf-8') as f:
-				lang_data = json.load(f)
-
-			if 'COMMAND_ALIASES' in lang_data:
-				# Store language-specific aliases
-				self.command_aliases[language] = lang_data['COMMAND_ALIASES']
-
-				# Update reverse mapping
-				for cmd, aliases in lang_data['COMMAND_ALIASES'].items():
-					for alias in aliases:
-						if alias.startswith('/'):
-							alias = alias[1:]  # Remove leading slash if present
-						self.reverse_aliases[alias] = cmd
-
-		except Exception as e:
-			logger.error(f"Error loading aliases for language {language}: {str(e)}")
+		self.translations_dir = LOCALES_DIR
+		self.aliases = get_command_aliases()
+		self.command_aliases = self.aliases.languages
+		self.reverse_aliases = self.aliases.reverse  # Maps aliases back to original commands
 
 	def get_original_command(self, alias):
 		"""
@@ -91,9 +45,7 @@ class CommandAliasManager:
 		Returns:
 			str: The original command name, or the alias itself if not found
 		"""
-		if alias.startswith('/'):
-			alias = alias[1:]  # Remove leading slash if present
-		return self.reverse_aliases.get(alias, alias)
+		return self.aliases.original(alias)
 
 	def get_preferred_alias(self, command, language):
 		"""
@@ -106,10 +58,7 @@ class CommandAliasManager:
 		Returns:
 			str: The preferred alias for the command in the specified language
 		"""
-		if language in self.command_aliases and command in self.command_aliases[language]:
-			aliases = self.command_aliases[language][command]
-			return aliases[0] if aliases else command
-		return command
+		return self.aliases.preferred(command, language)
 
 	def register_command_handlers(self, app, command_handlers):
 		"""
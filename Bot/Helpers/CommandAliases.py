@@ -0,0 +1,101 @@
+import json
+import logging
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).parent.parent.parent
+LOCALES_DIR = ROOT / "Locales"
+MANIFEST_PATH = ROOT / "Config" / "command_aliases.json"
+ALIASES_KEY = '"COMMAND_ALIASES"'
+
+def extract_aliases(text: str) -> dict:
+	"""
+	COMMAND_ALIASES from a locale file's text, without parsing the rest of
+	the file (which is large, and may contain errors in unrelated entries).
+	"""
+	position = text.find(ALIASES_KEY)
+	if position < 0:
+		return {}
+	start = text.index("{", position + len(ALIASES_KEY))
+	aliases, _ = json.JSONDecoder().raw_decode(text, start)
+	return {
+		command: [alias[1:] if alias.startswith("/") else alias for alias in names]
+		for command, names in aliases.items()
+	}
+
+def read_locales(locales_dir: Path = LOCALES_DIR) -> dict:
+	"""{language: {command: [aliases]}} straight from the locale files."""
+	languages = {}
+	for lang_file in sorted(locales_dir.glob("*.json")):
+		try:
+			languages[lang_file.stem] = extract_aliases(lang_file.read_text(encoding="utf-8"))
+		except Exception as e:
+			logger.error(f"Error reading command aliases from {lang_file}: {str(e)}")
+	return languages
+
+def build_manifest(locales_dir: Path = LOCALES_DIR) -> dict:
+	return {"languages": read_locales(locales_dir)}
+
+def _manifest_is_current() -> bool:
+	if not MANIFEST_PATH.exists():
+		return False
+	built = MANIFEST_PATH.stat().st_mtime
+	return all(lang_file.stat().st_mtime <= built for lang_file in LOCALES_DIR.glob("*.json"))
+
+class CommandAliases:
+	"""
+	Command aliases per language, loaded once per process.
+
+	Read from the manifest Tools/build_alias_manifest.py writes to
+	Config/command_aliases.json; when it is missing or older than a locale
+	file, the aliases are extracted from the locale files instead.
+	"""
+
+	def __init__(self, languages: dict):
+		self.languages = languages
+		self.by_command = {}
+		self.reverse = {}
+		for language, commands in languages.items():
+			for command, aliases in commands.items():
+				names = self.by_command.setdefault(command, [command])
+				for alias in aliases:
+					if alias not in names:
+						names.append(alias)
+					self.reverse.setdefault(alias, command)
+
+	@classmethod
+	def load(cls) -> "CommandAliases":
+		if _manifest_is_current():
+			try:
+				with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+					return cls(json.load(f)["languages"])
+			except Exception as e:
+				logger.error(f"Failed to read {MANIFEST_PATH}: {str(e)}")
+		else:
+			logger.info(f"{MANIFEST_PATH.name} is missing or stale; reading aliases from the locale files")
+		return cls(read_locales())
+
+	def aliases(self, command: str) -> list:
+		"""The command itself followed by every translated alias"""
+		return self.by_command.get(command, [command])
+
+	def original(self, alias: str) -> str:
+		alias = alias[1:] if alias.startswith("/") else alias
+		return self.reverse.get(alias, alias)
+
+	def preferred(self, command: str, language: str) -> str:
+		aliases = self.languages.get(language, {}).get(command)
+		return aliases[0] if aliases else command
+
+_instance = None
+_lock = threading.Lock()
+
+def get_command_aliases() -> CommandAliases:
+	global _instance
+	if _instance is None:
+		with _lock:
+			if _instance is None:
+				_instance = CommandAliases.load()
+	return _instance
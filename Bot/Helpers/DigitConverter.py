@@ -0,0 +1,98 @@
+from typing import Iterable, List, Union
+
+WESTERN_DIGITS = "0123456789"
+EASTERN_ARABIC_DIGITS = "٠١٢٣٤٥٦٧٨٩"
+PERSIAN_DIGITS = "۰۱۲۳۴۵۶۷۸۹"
+
+# Compiled once at import; str.translate walks the text in C instead of a dict lookup per character
+INDIAN_DIGITS = str.maketrans(WESTERN_DIGITS, EASTERN_ARABIC_DIGITS)
+PERSIAN_DIGITS_TABLE = str.maketrans(WESTERN_DIGITS, PERSIAN_DIGITS)
+ARABIC_DIGITS = str.maketrans(EASTERN_ARABIC_DIGITS + PERSIAN_DIGITS, WESTERN_DIGITS * 2)
+INVERT_DIGITS = str.maketrans(
+	WESTERN_DIGITS + EASTERN_ARABIC_DIGITS,
+	EASTERN_ARABIC_DIGITS + WESTERN_DIGITS
+)
+
+DIGIT_TABLES = {
+	"arabic": ARABIC_DIGITS,
+	"indian": INDIAN_DIGITS,
+	"persian": PERSIAN_DIGITS_TABLE,
+	"invert": INVERT_DIGITS
+}
+
+# Hebrew numerals are additive letters rather than positional digits
+HEBREW_UNITS = ("", "א", "ב", "ג", "ד", "ה", "ו", "ז", "ח", "ט")
+HEBREW_TENS = ("", "י", "כ", "ל", "מ", "נ", "ס", "ע", "פ", "צ")
+HEBREW_HUNDREDS = ("", "ק", "ר", "ש", "ת", "תק", "תר", "תש", "תת", "תתק")
+HEBREW_SPECIAL = {15: "טו", 16: "טז"}
+GERESH = "׳"
+GERSHAYIM = "״"
+
+FORMATS = tuple(DIGIT_TABLES) + ("hebrew",)
+
+class DigitConverter:
+	def to_indian(self, text: str) -> str:
+		"""Western digits to Eastern Arabic digits"""
+		return text.translate(INDIAN_DIGITS)
+
+	def to_persian(self, text: str) -> str:
+		"""Western digits to Persian digits"""
+		return text.translate(PERSIAN_DIGITS_TABLE)
+
+	def to_arabic(self, text: str) -> str:
+		"""Eastern Arabic and Persian digits to Western digits"""
+		return text.translate(ARABIC_DIGITS)
+
+	def invert(self, text: str) -> str:
+		"""Swap Western and Eastern Arabic digits"""
+		return text.translate(INVERT_DIGITS)
+
+	def to_hebrew(self, number: Union[int, str]) -> str:
+		"""Hebrew numeral for 1-999999, with geresh/gershayim marks"""
+		number = int(str(number).translate(ARABIC_DIGITS))
+		if number <= 0 or number >= 1000000:
+			raise ValueError("Hebrew numerals cover 1-999999")
+		thousands, rest = divmod(number, 1000)
+		letters = self._hebrew_below_thousand(rest)
+		if len(letters) == 1:
+			letters += GERESH
+		elif letters:
+			letters = letters[:-1] + GERSHAYIM + letters[-1]
+		if thousands:
+			letters = self._hebrew_below_thousand(thousands) + GERESH + letters
+		return letters
+
+	@staticmethod
+	def _hebrew_below_thousand(number: int) -> str:
+		hundreds, rest = divmod(number, 100)
+		if rest in HEBREW_SPECIAL:
+			return HEBREW_HUNDREDS[hundreds] + HEBREW_SPECIAL[rest]
+		tens, units = divmod(rest, 10)
+		return HEBREW_HUNDREDS[hundreds] + HEBREW_TENS[tens] + HEBREW_UNITS[units]
+
+	def convert(self, value: Union[int, str], output_format: str) -> str:
+		"""Convert one value to the given format"""
+		if output_format == "hebrew":
+			return self.to_hebrew(value)
+		table = DIGIT_TABLES.get(output_format)
+		if table is None:
+			raise ValueError(f"Unknown format: {output_format}. Use: {', '.join(FORMATS)}")
+		return str(value).translate(table)
+
+	def convert_many(self, values: Iterable[Union[int, str]], output_format: str) -> List[str]:
+		"""Convert many values with a single translate pass"""
+		values = [str(value) for value in values]
+		if output_format == "hebrew":
+			return [self.to_hebrew(value) for value in values]
+		if not values:
+			return []
+		table = DIGIT_TABLES.get(output_format)
+		if table is None:
+			raise ValueError(f"Unknown format: {output_format}. Use: {', '.join(FORMATS)}")
+		joined = "\0".join(values)
+		if joined.count("\0") != len(values) - 1:
+			return [value.translate(table) for value in values]
+		# A NUL separator is left alone by every table, so one pass covers the whole batch
+		return joined.translate(table).split("\0")
+
+digit_converter = DigitConverter()
@@ -1,5 +1,44 @@
 import unicodedata
 
+ELEMENTS = ('fire', 'air', 'water', 'earth')
+# Characters outside the precompiled set that are remembered (spaces, digits, punctuation...);
+# user input can contain any character, so past this many they are computed on each sight
+EXTRA_CHARS = 1024
+
+GUIDE_ALIASES = {
+	'0': 'TURKCE',
+	'1': 'ARABI',
+	'2': 'BUNI',
+	'3': 'HUSEYNI',
+	'4': 'HEBREW',
+	'5': 'ENGLISH'
+}
+
+ELEMENT_ALIASES = {
+	'ateş': 'fire',
+	'hava': 'air',
+	'su': 'water',
+	'toprak': 'earth',
+	'0': 'fire',
+	'1': 'air',
+	'2': 'water',
+	'3': 'earth',
+	'fire': 'fire',
+	'air': 'air',
+	'water': 'water',
+	'earth': 'earth'
+}
+
+ARABIC_CHARS = frozenset(['ا', 'ب', 'ج', 'س', 'ص', 'ر', 'خ', 'ه', 'ز', 'ح', 'ط', 'ي', 'ی', 'ل', 'ة', 'ث', 'د', 'ك', 'ع', 'ف', 'ق', 'ش', 'ض', 'و', 'م', 'ن', 'ت', 'ذ', 'ظ', 'غ'])
+HEBREW_CHARS = frozenset(['א', 'ב', 'ג', 'ד', 'ה', 'ו', 'ז', 'ח', 'ט', 'י', 'כ', 'ל', 'מ', 'נ', 'ס', 'ע', 'פ', 'צ', 'ק', 'ר', 'ש', 'ת', 'ם', 'ן', 'ף', 'ץ', 'ך'])
+LATIN_CHARS = frozenset(['A', 'B', 'C', 'Ç', 'D', 'E', 'F', 'G', 'Ğ', 'H', 'J', 'K', 'L', 'M', 'N', 'O', 'Ö', 'P', 'R', 'S', 'Ş', 'T', 'U', 'Ü', 'V', 'Y', 'Z', 'Q', 'W', 'X'])
+ARABIC_EXPANSIONS = {
+	'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ء': 'ا', 'ى': 'ا',
+	'ؤ': 'و' + 'ا',
+	'ۀ': 'ه' + 'ي',
+	'ئ': 'ي' + 'ا'
+}
+
 class ElementClassifier:
 	# Element mappings for each guide and element type
 	ELEMENT_MAPPINGS = {
@@ -58,109 +97,151 @@ class ElementClassifier:
 		self.valid_guides = ['TURKCE', 'ARABI', 'BUNI', 'HUSEYNI', 'HEBREW', 'ENGLISH', 'LATIN']
 		self.valid_elements = ['fire', 'air', 'water', 'earth']
 
-	def _normalize_char(self, char: str, guide: str) -> str:
+	@staticmethod
+	def _normalize_char(char: str, guide: str) -> str:
 		"""Normalize special characters based on guide."""
-		arabic_chars = ['ا', 'ب', 'ج', 'س', 'ص', 'ر', 'خ', 'ه', 'ز', 'ح', 'ط', 'ي', 'ی', 'ل', 'ة', 'ث', 'د', 'ك', 'ع', 'ف', 'ق', 'ش', 'ض', 'و', 'م', 'ن', 'ت', 'ذ', 'ظ', 'غ']
-		hebrew_chars = ['א', 'ב', 'ג', 'ד', 'ה', 'ו', 'ז', 'ח', 'ט', 'י', 'כ', 'ל', 'מ', 'נ', 'ס', 'ע', 'פ', 'צ', 'ק', 'ר', 'ש', 'ת', 'ם', 'ן', 'ף', 'ץ', 'ך']
-		latin_chars = ['A', 'B', 'C', 'Ç', 'D', 'E', 'F', 'G', 'Ğ', 'H', 'J', 'K', 'L', 'M', 'N', 'O', 'Ö', 'P', 'R', 'S', 'Ş', 'T', 'U', 'Ü', 'V', 'Y', 'Z', 'Q', 'W', 'X']
-
-		if char in arabic_chars:
+		if char in ARABIC_CHARS:
 			return char
-		elif char in ['أ', 'إ', 'آ', 'ء', 'ى']:
-			return 'ا'
-		elif char == 'ؤ':
-			return 'و' + 'ا'
-		elif char == 'ۀ':
-			return 'ه' + 'ي'
-		elif char == 'ئ':
-			return 'ي' + 'ا'
-		elif char in hebrew_chars:
+		elif char in ARABIC_EXPANSIONS:
+			return ARABIC_EXPANSIONS[char]
+		elif char in HEBREW_CHARS:
 			return char
-		elif char.upper() in latin_chars:
+		elif char.upper() in LATIN_CHARS:
 			return char.upper()
 		elif char in ['İ', 'i']:
 			return 'İ' if guide in ['TURKCE', '0'] else 'I'
 		elif char in ['I', 'ı']:
-			return 'I' if guide in ['TURKCE', '0', 'ENGLISH', 'LATIN', '5'] else 'I'
+			return 'I'
 		return char
 
+	@classmethod
+	def _compile(cls):
+		"""Build the codepoint table: char -> per-guide tuple of (normalized char, element index) pairs."""
+		cls.GUIDES = tuple(cls.ELEMENT_MAPPINGS)
+		element_of = {
+			guide: {
+				char: ELEMENTS.index(element)
+				for element, chars in elements.items()
+				for char in chars
+			}
+			for guide, elements in cls.ELEMENT_MAPPINGS.items()
+		}
+		cls._element_of = element_of
+		cls._table = {}
+		candidates = set(ARABIC_CHARS) | set(ARABIC_EXPANSIONS) | set(HEBREW_CHARS) | {'İ', 'i', 'I', 'ı'}
+		for char in LATIN_CHARS:
+			candidates.update(char, char.lower())
+		for char in candidates:
+			cls._table[char] = cls._table_entry(char)
+		cls._table_limit = len(cls._table) + EXTRA_CHARS
+
+	@classmethod
+	def _table_entry(cls, char: str) -> tuple:
+		entry = []
+		for guide in cls.GUIDES:
+			normalized = cls._normalize_char(char, guide)
+			elements = cls._element_of[guide]
+			entry.append(tuple((c, elements[c]) for c in normalized if c in elements))
+		return tuple(entry)
+
+	def _lookup(self, char: str) -> tuple:
+		entry = self._table.get(char)
+		if entry is None:
+			entry = self._table_entry(char)
+			if len(self._table) < self._table_limit:
+				self._table[char] = entry
+		return entry
+
 	def _mb_str_split(self, text: str) -> list:
 		"""Split UTF-8 string into individual characters."""
 		return [char for char in unicodedata.normalize('NFC', text)]
 
-	def classify_elements(self, text: str, element_type: str, shadda: int = 1, guide: str = '0') -> dict:
+	def _resolve_guide(self, guide) -> str:
+		guide = str(guide).upper() if isinstance(guide, (str, int)) else 'DEFAULT'
+		guide = GUIDE_ALIASES.get(guide, guide)
+		return guide if guide in self.valid_guides else 'DEFAULT'
+
+	def _resolve_shadda(self, text: str, shadda: int) -> list:
+		"""Split text into characters, replacing shadda with the preceding letter when doubling."""
+		chars = self._mb_str_split(text)
+		if shadda == 2 and self.shadda_char in chars:
+			resolved = list(chars)
+			for t, selectable in enumerate(chars):
+				if selectable == self.shadda_char:
+					c = 1
+					while t - c >= 0 and not chars[t - c].strip():
+						c += 1
+					if t - c >= 0:
+						resolved[t] = chars[t - c]
+			return resolved
+		return chars
+
+	def classify_all(self, text: str, shadda: int = 1, guides=None) -> dict:
 		"""
-		Classify letters in text into elements (fire, air, water, earth) based on guide and element type.
+		Classify letters in text into all four elements for every guide in one pass.
 
 		Args:
 			text (str): Input text to process.
-			output_type (str/int): 'list'/'liste'/1 for list of letters, 'amount'/'adet'/0 for count.
-			element_type (str/int): 'fire'/'ateş'/0, 'air'/'hava'/1, 'water'/'su'/2, 'earth'/'toprak'/3.
 			shadda (int): 1 (ignore shadda), 2 (double previous letter).
-			guide (str/int): Language/method ('TURKCE'/0, 'ARABI'/1, 'BUNI'/2, 'HUSEYNI'/3, 'HEBREW'/4, 'ENGLISH', 'LATIN', or default).
+			guides (list): Guides to report (names or numeric aliases); all guides when omitted.
 
 		Returns:
-			str: List of matching letters, count, or 'Hata?' on error.
+			dict: {guide: {element: {"adet": int, "liste": str}}}, or 'Hata?' on error.
 		"""
 		try:
-			# Normalize inputs
-			guide = str(guide).upper() if isinstance(guide, (str, int)) else 'DEFAULT'
-			guide = {
-				'0': 'TURKCE',
-				'1': 'ARABI',
-				'2': 'BUNI',
-				'3': 'HUSEYNI',
-				'4': 'HEBREW',
-				'5': 'ENGLISH'
-			}.get(guide, guide)
-			if guide not in self.valid_guides:
-				guide = 'DEFAULT'
-
-			element_type = str(element_type).lower()
-			element_type = {
-				'ateş': 'fire',
-				'hava': 'air',
-				'su': 'water',
-				'toprak': 'earth',
-				'0': 'fire',
-				'1': 'air',
-				'2': 'water',
-				'3': 'earth',
-				'fire': 'fire',
-				'air': 'air',
-				'water': 'water',
-				'earth': 'earth'
-			}.get(element_type, element_type)
-			if element_type not in self.valid_elements:
-				return 'Hata?'
-
 			shadda = int(shadda)
 			if shadda not in [1, 2]:
 				return 'Hata?'
+			if guides is None:
+				selected = self.GUIDES
+			else:
+				selected = tuple(dict.fromkeys(self._resolve_guide(guide) for guide in guides))
+			positions = [self.GUIDES.index(guide) for guide in selected]
 
-			# Split text into characters
-			chars = self._mb_str_split(text)
-			selected = ''
-			t = 0
+			letters = [[[] for _ in ELEMENTS] for _ in selected]
+			for char in self._resolve_shadda(text, shadda):
+				entry = self._lookup(char)
+				for slot, position in enumerate(positions):
+					for letter, element in entry[position]:
+						letters[slot][element].append(letter)
 
-			# Filter and normalize characters
-			for selectable in chars:
-				if selectable == self.shadda_char and shadda == 2:
-					c = 1
-					while t - c >= 0 and not chars[t - c].strip():
-						c += 1
-					if t - c >= 0:
-						selectable = chars[t - c]
-				selected += self._normalize_char(selectable, guide)
-				t += 1
-
-			# Classify elements
-			liste = ''
-			adet = 0
-			for char in self._mb_str_split(selected):
-				if char in self.ELEMENT_MAPPINGS[guide][element_type]:
-					liste += char + ' '
-					adet += 1
-			return {"adet": adet, "liste": liste.strip()}
+			return {
+				guide: {
+					element: {"adet": len(found[index]), "liste": ' '.join(found[index])}
+					for index, element in enumerate(ELEMENTS)
+				}
+				for guide, found in zip(selected, letters)
+			}
 		except Exception:
-			return 'Hata?'
\ No newline at end of file
+			return 'Hata?'
+
+	def classify_elements(self, text: str, element_type: str, shadda: int = 1, guide: str = '0') -> dict:
+		"""
+		Classify letters in text into elements (fire, air, water, earth) based on guide and element type.
+
+		Args:
+			text (str): Input text to process.
+			element_type (str/int): 'fire'/'ateş'/0, 'air'/'hava'/1, 'water'/'su'/2, 'earth'/'toprak'/3.
+			shadda (int): 1 (ignore shadda), 2 (double previous letter).
+			guide (str/int): Language/method ('TURKCE'/0, 'ARABI'/1, 'BUNI'/2, 'HUSEYNI'/3, 'HEBREW'/4, 'ENGLISH', 'LATIN', or default).
+
+		Returns:
+			dict: {"adet": count, "liste": matching letters}, or 'Hata?' on error.
+		"""
+		element_type = ELEMENT_ALIASES.get(str(element_type).lower(), str(element_type).lower())
+		if element_type not in self.valid_elements:
+			return 'Hata?'
+		guide = self._resolve_guide(guide)
+		result = self.classify_all(text, shadda, [guide])
+		if isinstance(result, str):
+			return result
+		return result[guide][element_type]
+
+	def classify(self, text: str, guide: str = '0', element_type: str = 'fire', shadda: int = 1):
+		"""Return (liste, adet, element) for the inline unsur query, or an error string."""
+		result = self.classify_elements(text, element_type, shadda, guide)
+		if isinstance(result, str):
+			return f"Error: {result}"
+		return result["liste"], result["adet"], ELEMENT_ALIASES.get(str(element_type).lower(), element_type)
+
+ElementClassifier._compile()
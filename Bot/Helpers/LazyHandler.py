@@ -0,0 +1,43 @@
+import importlib
+import threading
+
+_lock = threading.Lock()
+# module -> one-element holders of the resolved callbacks, so a reloaded module is picked up again
+_holders = {}
+
+def lazy_callback(module: str, attribute: str, instance_of: str = None):
+	"""
+	Handler callback that imports its command module on the first update it
+	handles instead of at registration.
+
+	With instance_of, the named class is instantiated once and attribute is
+	looked up on the instance (for the ShopCommands classes).
+	"""
+	resolved = [None]
+	with _lock:
+		_holders.setdefault(module, []).append(resolved)
+
+	def resolve():
+		with _lock:
+			if resolved[0] is None:
+				target = importlib.import_module(module)
+				if instance_of is not None:
+					target = getattr(target, instance_of)()
+				resolved[0] = getattr(target, attribute)
+			return resolved[0]
+
+	async def callback(update, context):
+		return await (resolved[0] or resolve())(update, context)
+
+	callback.__name__ = attribute
+	callback.__qualname__ = f"{module}.{instance_of + '.' if instance_of else ''}{attribute}"
+	callback.resolve = resolve
+	return callback
+
+def forget(module: str) -> int:
+	"""Make the lazy callbacks of a reloaded module look it up again; returns how many there are."""
+	with _lock:
+		holders = _holders.get(module, ())
+		for resolved in holders:
+			resolved[0] = None
+		return len(holders)
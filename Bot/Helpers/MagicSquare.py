@@ -1,36 +1,70 @@
-import math
+import numpy as np
+from functools import lru_cache
 from .NumberConverter import NumberConverter
+from .DigitConverter import INDIAN_DIGITS
+
+INT64_MAX = np.iinfo(np.int64).max
+
+# Horizontal, vertical, four corners, left/cross/right joints, top/bottom joints
+BOX_STYLES = (
+	("─", "│", "┌", "┐", "└", "┘", "├", "┼", "┤", "┬", "┴"),
+	("┄", "┆", "┌", "┐", "└", "┘", "├", "┼", "┤", "┬", "┴"),
+	("┅", "┇", "┏", "┓", "┗", "┛", "┣", "╋", "┫", "┳", "┻"),
+	("─", "│", "╭", "╮", "╰", "╯", "├", "┼", "┤", "┬", "┴"),
+	("━", "┃", "┏", "┓", "┗", "┛", "┣", "╋", "┫", "┳", "┻"),
+	("═", "║", "╔", "╗", "╚", "╝", "╠", "╬", "╣", "╦", "╩"),
+)
+
+@lru_cache(maxsize=256)
+def _box_frame(n, width, border_style):
+	"""Top, middle and bottom separators plus the blank filler row for one square layout."""
+	horizontal, vertical, top_left, top_right, bottom_left, bottom_right, \
+		middle_left, cross, middle_right, top_joint, bottom_joint = BOX_STYLES[border_style]
+	segments = [horizontal * width] * n
+	top = top_left + top_joint.join(segments) + top_right
+	middle = middle_left + cross.join(segments) + middle_right
+	bottom = bottom_left + bottom_joint.join(segments) + bottom_right
+	blank = vertical + (" " * width + vertical) * n
+	return top, middle, bottom, blank
 
 class MagicSquareGenerator:
 	def __init__(self):
 		self.number_converter = NumberConverter()
 
 	def generate_magic_square(self, n, row_sum=None, rotation=0, mirror=False, output_format="arabic"):
+		result = self.build_magic_square(n, row_sum, rotation, mirror)
+		if isinstance(result, str):
+			return result
+		magic_square, size = result
+		# Squares stay integer ndarrays up to here; only the box text leaves the engine
+		return {"box": self.box_the_square(magic_square, 4, 1, 1, output_format), "size": size}
+
+	def build_magic_square(self, n, row_sum=None, rotation=0, mirror=False):
+		"""Return (square, size) as an int64 ndarray, or an error string."""
 		if n < 3:
 			return "Error: Size must be at least 3"
-		magic_constant = (n * (n * n + 1)) / 2
-		if row_sum is None:
-			row_sum = magic_constant
-		if row_sum < magic_constant:
-			return f"Error: Row sum cannot be less than the magic constant ({magic_constant})"
-		magic_square = self.create_magic_square(n)
-		if row_sum > magic_constant:
-			if n % 2 == 1:
-				magic_square = self.incremented_magic_square(magic_square, row_sum)
-			elif n % 4 == 0:
-				magic_square = self.increment_matrix(magic_square, row_sum)
-		if rotation > 0:
-			magic_square = self.rotate_matrix(magic_square, rotation // 90)
-		if mirror:
-			magic_square = self.mirror_flip(magic_square)
-		#if output_format == "indian":
-		#	magic_square = [
-		#		[self.number_converter.indian(str(int(cell))) for cell in row]
-		#		for row in magic_square
-		#	]
-		if not self.check_magic_square(magic_square, row_sum):
-			return self.generate_magic_square((n + 1), row_sum, rotation, mirror, output_format)
-		return {"box": self.box_the_square(magic_square, 4, 1, 1, output_format), "size": n}
+		if row_sum is not None and int(row_sum) > INT64_MAX:
+			return "Error: Row sum is too large"
+		while True:
+			magic_constant = n * (n * n + 1) // 2
+			if row_sum is None:
+				row_sum = magic_constant
+			row_sum = int(row_sum)
+			if row_sum < magic_constant:
+				return f"Error: Row sum cannot be less than the magic constant ({magic_constant})"
+			magic_square = self.create_magic_square(n)
+			if row_sum > magic_constant:
+				if n % 2 == 1:
+					magic_square = self.incremented_magic_square(magic_square, row_sum)
+				elif n % 4 == 0:
+					magic_square = self.increment_matrix(magic_square, row_sum)
+			if rotation > 0:
+				magic_square = self.rotate_matrix(magic_square, rotation // 90)
+			if mirror:
+				magic_square = self.mirror_flip(magic_square)
+			if self.check_magic_square(magic_square, row_sum):
+				return magic_square, n
+			n += 1
 
 	def create_magic_square(self, n):
 		if n % 2 == 1:
@@ -41,190 +75,99 @@ class MagicSquareGenerator:
 			return self.strachey_singly_even_method(n)
 
 	def siamese_method(self, n):
-		magic_square = [[0] * n for _ in range(n)]
-		row, col = 0, n // 2
-		for num in range(1, n * n + 1):
-			magic_square[row][col] = int(num)
-			next_row = (row - 1 + n) % n
-			next_col = (col + 1) % n
-			if magic_square[next_row][next_col] != 0:
-				row = (row + 1) % n
-			else:
-				row, col = next_row, next_col
-		return magic_square
+		# Closed form of the up-right walk starting at the top middle cell
+		i, j = np.indices((n, n), dtype=np.int64)
+		return n * ((i + j + 1 + n // 2) % n) + (i + 2 * j + 1) % n + 1
 
 	def strachey_method(self, n):
-		magic_square = [[0] * n for _ in range(n)]
-		count = 1
-		for i in range(n):
-			for j in range(n):
-				if i % 4 == j % 4 or (i + j) % 4 == 3:
-					magic_square[i][j] = int(n * n - count + 1)
-				else:
-					magic_square[i][j] = int(count)
-				count += 1
-		return magic_square
+		i, j = np.indices((n, n), dtype=np.int64)
+		count = i * n + j + 1
+		diagonal = (i % 4 == j % 4) | ((i + j) % 4 == 3)
+		return np.where(diagonal, n * n - count + 1, count)
 
 	def strachey_singly_even_method(self, n):
-		magic_square = [[0] * n for _ in range(n)]
 		k = n // 2
 		mini_magic = self.siamese_method(k)
-		for i in range(k):
-			for j in range(k):
-				magic_square[i][j] = int(mini_magic[i][j])
-				magic_square[i + k][j + k] = int(mini_magic[i][j] + k * k)
-				magic_square[i][j + k] = int(mini_magic[i][j] + 2 * k * k)
-				magic_square[i + k][j] = int(mini_magic[i][j] + 3 * k * k)
+		magic_square = np.block([
+			[mini_magic, mini_magic + 2 * k * k],
+			[mini_magic + 3 * k * k, mini_magic + k * k]
+		])
 		swap_col = list(range((k - 1) // 2)) + list(range(n - (k - 1) // 2 + 1, n))
-		for i in range(k):
-			for col in swap_col:
-				magic_square[i][col], magic_square[i + k][col] = (
-					magic_square[i + k][col], magic_square[i][col]
-				)
+		if swap_col:
+			top = magic_square[:k, swap_col].copy()
+			magic_square[:k, swap_col] = magic_square[k:, swap_col]
+			magic_square[k:, swap_col] = top
 		half_k = k // 2
-		magic_square[half_k][0], magic_square[half_k + k][0] = (
-			magic_square[half_k + k][0], magic_square[half_k][0]
-		)
-		magic_square[half_k + k][half_k], magic_square[half_k][half_k] = (
-			magic_square[half_k][half_k], magic_square[half_k + k][half_k]
-		)
+		for col in (0, half_k):
+			magic_square[[half_k, half_k + k], col] = magic_square[[half_k + k, half_k], col]
 		return magic_square
 
 	def incremented_magic_square(self, magic_square, row_sum):
 		n = len(magic_square)
-		magic_constant = (n * (n * n + 1)) / 2
-		incremention = (row_sum - magic_constant) / n
-		for r in range(n):
-			for c in range(n):
-				magic_square[r][c] += self.incremention_for_cell(
-					n, row_sum, incremention, magic_square[r][c]
-				)
-		return magic_square
-
-	def incremention_for_cell(self, n, row_sum, incremention, cell_value):
-		magic_constant = (n * (n * n + 1)) / 2
+		magic_constant = n * (n * n + 1) // 2
+		floor_step, remainder = divmod(row_sum - magic_constant, n)
+		ceil_step = floor_step + (1 if remainder else 0)
 		threshold = n * n - n * (row_sum % n)
-		return math.ceil(incremention) if cell_value > threshold else math.floor(incremention)
+		return magic_square + np.where(magic_square > threshold, ceil_step, floor_step)
 
 	def increment_matrix(self, magic_square, row_sum):
 		n = len(magic_square)
-		magic_constant = (n * (n * n + 1)) / 2
+		magic_constant = n * (n * n + 1) // 2
 		z = (row_sum - magic_constant) % n
-		incremention = (row_sum - magic_constant - z) / n
-		for k in range(int(z)):
-			for i in range(n):
-				row = (k + i) % n
-				col = i
-				magic_square[row][col] += 1
-		for r in range(n):
-			for c in range(n):
-				magic_square[r][c] += incremention
-		return magic_square
+		incremention = (row_sum - magic_constant - z) // n
+		magic_square = magic_square.copy()
+		cols = np.arange(n)
+		for k in range(z):
+			magic_square[(k + cols) % n, cols] += 1
+		return magic_square + incremention
 
 	def mirror_flip(self, magic_square):
-		n = len(magic_square)
-		mirror_flipped = [[0] * n for _ in range(n)]
-		for a in range(n):
-			for b in range(n):
-				m = n - 1 - a
-				n_idx = n - 1 - b
-				mirror_flipped[a][b] = magic_square[m][n_idx]
-		return mirror_flipped
+		return np.flip(magic_square)
 
 	def rotate_matrix(self, matrix, repeat):
-		n = len(matrix)
-		rotated = [[matrix[i][j] for j in range(n)] for i in range(n)]
-		for _ in range(repeat % 4):	# Normalize rotations
-			temp = [[0] * n for _ in range(n)]
-			for i in range(n):
-				for j in range(n):
-					temp[i][j] = rotated[i][j]
-			for i in range(n):
-				for j in range(n):
-					rotated[j][n - 1 - i] = temp[i][j]
-		return rotated
+		# Clockwise quarter turns, returned as a view
+		return np.rot90(matrix, -(repeat % 4))
 
 	def box_the_square(self, magic_square, border_style=0, cell_height=1, cell_width=0, number_format="arabic"):
-		box = [
-			["─", "│", "┌", "┐", "└", "┘", "├", "┼", "┤", "┬", "┴"],
-			["┄", "┆", "┌", "┐", "└", "┘", "├", "┼", "┤", "┬", "┴"],
-			["┅", "┇", "┏", "┓", "┗", "┛", "┣", "╋", "┫", "┳", "┻"],
-			["─", "│", "╭", "╮", "╰", "╯", "├", "┼", "┤", "┬", "┴"],
-			["━", "┃", "┏", "┓", "┗", "┛", "┣", "╋", "┫", "┳", "┻"],
-			["═", "║", "╔", "╗", "╚", "╝", "╠", "╬", "╣", "╦", "╩"],
-		]
-		border_style = max(0, min(border_style, len(box) - 1))
-		n = len(magic_square)
-		longest_length = 0
-		for row in magic_square:
-			for cell in row:
-				value = str(int(cell))
-				if number_format == "indian":
-					value = self.number_converter.indian(value)
-				length = len(value.replace("\u200e", "").replace("\u200f", ""))
-				longest_length = max(longest_length, length)
-		cell_width = max(cell_width, longest_length)
-		border_length = cell_width
-		length_for_num = cell_width + 2 if number_format == "indian" else cell_width
+		return "\n".join(self.iter_box_lines(magic_square, border_style, cell_height, cell_width, number_format))
+
+	def iter_box_lines(self, magic_square, border_style=0, cell_height=1, cell_width=0, number_format="arabic"):
+		"""Yield the boxed square line by line without building the whole text."""
+		rows = np.asarray(magic_square).tolist()
+		n = len(rows)
+		border_style = max(0, min(border_style, len(BOX_STYLES) - 1))
+		cells = [str(int(cell)) for row in rows for cell in row]
+		if number_format == "indian":
+			# One translate pass for every cell instead of a dict lookup per character
+			cells = ",".join(cells).translate(INDIAN_DIGITS).split(",")
+			marks = ("\u200e\u200f", "\u200e")
+		else:
+			marks = ("", "")
+		width = max(cell_width, max((len(cell) for cell in cells), default=0))
+		top, middle, bottom, blank = _box_frame(n, width, border_style)
+		vertical = BOX_STYLES[border_style][1]
 		cell_height = max(1, cell_height)
-		boxed = []
+		blank_above = [blank] * ((cell_height - 1) // 2)
+		blank_below = [blank] * (cell_height - 1 - (cell_height - 1) // 2)
 
+		yield top
 		for r in range(n):
-			if r == 0:
-				line = (box[border_style][2] +
-						''.join(box[border_style][0] * border_length + box[border_style][9] for _ in range(n - 1)) +
-						box[border_style][0] * border_length + box[border_style][3])
-				boxed.append(line)
-
-			for e in range((cell_height - 1) // 2):
-				line = box[border_style][1] + ''.join(" " * border_length + box[border_style][1] for _ in range(n))
-				boxed.append(line)
-
-			line = box[border_style][1]
-			for c in range(n):
-				cell_value = magic_square[r][c]
-				display_value = (f"\u200e\u200f{self.number_converter.arab_to_indian(cell_value)}\u200e"
-								if number_format == "indian" and not isinstance(cell_value, str)
-								else str(int(cell_value)))
-				value_length = len(display_value.replace("\u200e", "").replace("\u200f", ""))
-				padding = border_length - value_length
+			yield from blank_above
+			padded = []
+			for cell in cells[r * n:(r + 1) * n]:
+				padding = width - len(cell)
 				left_pad = padding // 2
-				right_pad = padding - left_pad
-				line += " " * left_pad + display_value + " " * right_pad + box[border_style][1]
-			boxed.append(line)
-
-			for e in range(cell_height - 1 - (cell_height - 1) // 2):
-				line = box[border_style][1] + ''.join(" " * border_length + box[border_style][1] for _ in range(n))
-				boxed.append(line)
-
-			if r < n - 1:
-				line = (box[border_style][6] +
-						''.join(box[border_style][0] * border_length + box[border_style][7] for _ in range(n - 1)) +
-						box[border_style][0] * border_length + box[border_style][8])
-				boxed.append(line)
-			else:
-				line = (box[border_style][4] +
-						''.join(box[border_style][0] * border_length + box[border_style][10] for _ in range(n - 1)) +
-						box[border_style][0] * border_length + box[border_style][5])
-				boxed.append(line)
-
-		return "\n".join(boxed)
+				padded.append(" " * left_pad + marks[0] + cell + marks[1] + " " * (padding - left_pad))
+			yield vertical + vertical.join(padded) + vertical
+			yield from blank_below
+			yield middle if r < n - 1 else bottom
 
 	def check_magic_square(self, magic_square, expected_sum):
-		n = len(magic_square)
+		magic_square = np.asarray(magic_square)
 		expected_sum = int(expected_sum)	# Ensure expected_sum is integer
-		for i in range(n):
-			row_sum = sum(int(float(cell)) if str(cell).replace('.', '').isdigit() else 0 for cell in magic_square[i])
-			if row_sum != expected_sum:
-				return False
-		for j in range(n):
-			col_sum = sum(int(float(magic_square[i][j])) if str(magic_square[i][j]).replace('.', '').isdigit() else 0 for i in range(n))
-			if col_sum != expected_sum:
-				return False
-		diag_sum1 = sum(int(float(magic_square[i][i])) if str(magic_square[i][i]).replace('.', '').isdigit() else 0 for i in range(n))
-		if diag_sum1 != expected_sum:
-			return False
-		diag_sum2 = sum(int(float(magic_square[i][n - 1 - i])) if str(magic_square[i][n - 1 - i]).replace('.', '').isdigit() else 0 for i in range(n))
-		if diag_sum2 != expected_sum:
-			return False
-		return True
\ No newline at end of file
+		return bool(
+			(magic_square.sum(axis=1) == expected_sum).all()
+			and (magic_square.sum(axis=0) == expected_sum).all()
+			and np.trace(magic_square) == expected_sum
+			and np.trace(np.fliplr(magic_square)) == expected_sum
+		)
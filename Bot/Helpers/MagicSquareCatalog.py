@@ -0,0 +1,112 @@
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+import numpy as np
+from .MagicSquare import MagicSquareGenerator
+
+_generator = MagicSquareGenerator()
+
+@lru_cache(maxsize=128)
+def _transform_index(size, turns, mirror):
+	"""Flat index permutation that applies quarter turns and a mirror to a size x size square."""
+	index = np.arange(size * size).reshape(size, size)
+	if turns:
+		index = _generator.rotate_matrix(index, turns)
+	if mirror:
+		index = _generator.mirror_flip(index)
+	index = np.ascontiguousarray(index).ravel()
+	index.setflags(write=False)
+	return index
+
+class MagicSquareCatalog:
+	"""
+	Bounded cache of generated magic squares.
+
+	Base squares are stored once per (n, row_sum); rotated and mirrored
+	variants are read through an index permutation, and rendered boxes
+	are kept per (output_format, style) on top of that.
+	"""
+
+	def __init__(self, max_squares: int = 256, max_boxes: int = 512, max_box_length: int = 65536):
+		self.generator = _generator
+		self.max_squares = max_squares
+		self.max_boxes = max_boxes
+		self.max_box_length = max_box_length
+		self._squares = OrderedDict()
+		self._boxes = OrderedDict()
+		self._lock = threading.Lock()
+		self._counters = {"square_hits": 0, "square_misses": 0, "box_hits": 0, "box_misses": 0}
+
+	def get_square(self, n, row_sum=None, rotation=0, mirror=False):
+		"""Return (square, size) for the requested variant, or an error string."""
+		key = (n, row_sum)
+		with self._lock:
+			base = self._squares.get(key)
+			if base is not None:
+				self._squares.move_to_end(key)
+				self._counters["square_hits"] += 1
+		if base is None:
+			base = self.generator.build_magic_square(n, row_sum)
+			if not isinstance(base, str):
+				base[0].setflags(write=False)
+			with self._lock:
+				self._counters["square_misses"] += 1
+				self._squares[key] = base
+				while len(self._squares) > self.max_squares:
+					self._squares.popitem(last=False)
+		if isinstance(base, str):
+			return base
+		square, size = base
+		turns = self._quarter_turns(rotation)
+		if turns or mirror:
+			square = square.ravel()[_transform_index(size, turns, bool(mirror))].reshape(size, size)
+		return square, size
+
+	def generate_magic_square(self, n, row_sum=None, rotation=0, mirror=False, output_format="arabic", border_style=4):
+		"""Cached equivalent of MagicSquareGenerator.generate_magic_square."""
+		key = (n, row_sum, self._quarter_turns(rotation), bool(mirror), output_format, border_style)
+		with self._lock:
+			cached = self._boxes.get(key)
+			if cached is not None:
+				self._boxes.move_to_end(key)
+				self._counters["box_hits"] += 1
+				return dict(cached)
+		result = self.get_square(n, row_sum, rotation, mirror)
+		if isinstance(result, str):
+			return result
+		square, size = result
+		rendered = {"box": self.generator.box_the_square(square, border_style, 1, 1, output_format), "size": size}
+		with self._lock:
+			self._counters["box_misses"] += 1
+			if len(rendered["box"]) <= self.max_box_length:
+				self._boxes[key] = rendered
+				while len(self._boxes) > self.max_boxes:
+					self._boxes.popitem(last=False)
+		return dict(rendered)
+
+	@staticmethod
+	def _quarter_turns(rotation):
+		# Same normalisation as generate_magic_square: only positive rotations apply
+		return (rotation // 90) % 4 if rotation > 0 else 0
+
+	def stats(self) -> dict:
+		"""Hit/miss counters, hit rates and current sizes."""
+		with self._lock:
+			counters = dict(self._counters)
+			squares, boxes = len(self._squares), len(self._boxes)
+		square_lookups = counters["square_hits"] + counters["square_misses"]
+		box_lookups = counters["box_hits"] + counters["box_misses"]
+		return {
+			**counters,
+			"square_hit_rate": counters["square_hits"] / square_lookups if square_lookups else 0.0,
+			"box_hit_rate": counters["box_hits"] / box_lookups if box_lookups else 0.0,
+			"squares": squares,
+			"boxes": boxes
+		}
+
+	def clear(self):
+		with self._lock:
+			self._squares.clear()
+			self._boxes.clear()
+
+magic_square_catalog = MagicSquareCatalog()
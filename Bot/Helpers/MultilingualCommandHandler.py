@@ -3,13 +3,14 @@ import json
 import os
 from pathlib import Path
 from telegram.ext import CommandHandler, Application
+from Bot.Helpers.CommandAliases import get_command_aliases
 
 logger = logging.getLogger(__name__)
 
 class MultilingualCommandHandler:
 	"""
 	A utility class to handle multilingual command registration.
-	This class reads command aliases from language files and registers
+	This class reads command aliases from the alias manifest and registers
 	all translated versions of commands to their respective handlers.
 	"""
 
@@ -18,38 +19,8 @@ class MultilingualCommandHandler:
 		self.load_command_aliases()
 
 	def load_command_aliases(self):
-		"""Load command aliases from all language files."""
-		try:
-			# Path to language files directory
-			lang_dir = Path(__file__).parent.parent / 'Locales'
-
-			if not lang_dir.exists():
-				logger.warning(f"Language directory not found: {lang_dir}")
-				return
-
-			# Process each language file
-			for lang_file in lang_dir.glob('*.json'):
-				try:
-					with open(lang_file, 'r', encoding='utf-8') as f:
-						lang_data = json.load(f)
-
-					if 'COMMAND_ALIASES' in lang_data:
-						# For each command, add all its aliases to our mapping
-						for cmd, aliases in lang_data['COMMAND_ALIASES'].items():
-							if cmd not in self.command_aliases:
-								self.command_aliases[cmd] = set()
-
-							# Add all aliases for this command
-							for alias in aliases:
-								if alias.startswith('/'):
-									alias = alias[1:]  # Remove leading slash if present
-								self.command_aliases[cmd].add(alias)
-
-				except Exception as e:
-					logger.error(f"Error processing language file {lang_file}: {str(e)}")
-
-		except Exception as e:
-			logger.error(f"Error loading command aliases: {str(e)}")
+		"""Load command aliases from the shared alias manifest."""
+		self.command_aliases = {cmd: set(aliases) for cmd, aliases in get_command_aliases().by_command.items()}
 
 	def register_command_handlers(self, app: Application, command_map: dict):
 		"""
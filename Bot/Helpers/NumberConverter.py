@@ -1,26 +1,29 @@
+from .DigitConverter import digit_converter
+
 class NumberConverter:
 	def indian(self, metin):
-		number_map = {
-			'0': '٠', '1': '١', '2': '٢', '3': '٣', '4': '٤',
-			'5': '٥', '6': '٦', '7': '٧', '8': '٨', '9': '٩', ' ': ' '
-		}
-		return ''.join(number_map.get(char, char) for char in metin)
+		return digit_converter.to_indian(metin)
 
 	def arabic(self, metin):
-		number_map = {
-			'٠': '0', '١': '1', '٢': '2', '٣': '3', '٤': '4',
-			'٥': '5', '٦': '6', '٧': '7', '٨': '8', '٩': '9', ' ': ' '
-		}
-		return ''.join(number_map.get(char, char) for char in metin)
+		return digit_converter.to_arabic(metin)
 
 	def invert(self, metin):
-		number_map = {
-			'0': '٠', '1': '١', '2': '٢', '3': '٣', '4': '٤',
-			'5': '٥', '6': '٦', '7': '٧', '8': '٨', '9': '٩',
-			'٠': '0', '١': '1', '٢': '2', '٣': '3', '٤': '4',
-			'٥': '5', '٦': '6', '٧': '7', '٨': '8', '٩': '9', ' ': ' '
-		}
-		return ''.join(number_map.get(char, char) for char in metin)
+		return digit_converter.invert(metin)
+
+	def persian(self, metin):
+		return digit_converter.to_persian(metin)
+
+	def hebrew(self, value):
+		return digit_converter.to_hebrew(value)
+
+	def convert(self, value, output_format):
+		try:
+			return digit_converter.convert(value, output_format)
+		except ValueError as e:
+			return f"Error: {str(e)}"
+
+	def convert_many(self, values, output_format):
+		return digit_converter.convert_many(values, output_format)
 
 	def arab_to_indian(self, value):
 		return self.indian(str(value))
\ No newline at end of file
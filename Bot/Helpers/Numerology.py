@@ -1,9 +1,17 @@
+import numpy as np
+
+METHODS = ('normal', 'inverse', 'base36', 'base36_inverse', 'base100', 'base100_inverse')
+CASE_FOLDED_ALPHABETS = ('turkish', 'english', 'latin')
+
 class UnifiedNumerology:
 	def __init__(self):
 		self.alphabets = {}
 		self.mappings = {}
+		self.tables = {}
+		self.codepoint_tables = {}
 		self.init_alphabets()
 		self.generate_all_mappings()
+		self.compile_tables()
 
 	def init_alphabets(self):
 		# Arabic - Abjadi Order (Traditional)
@@ -119,6 +127,53 @@ class UnifiedNumerology:
 		mapping[' '] = 0
 		return mapping
 
+	def compile_tables(self):
+		"""Build char -> values-for-every-method tables so one walk over the text yields all methods"""
+		for alphabet_name, methods in self.mappings.items():
+			table = {
+				char: tuple(methods[method][char] for method in METHODS)
+				for char in methods['normal']
+			}
+			self.tables[alphabet_name] = table
+			# Same table indexed by codepoint for the batch evaluator; row 0 stays zero for misses
+			codepoints = np.zeros((max(map(ord, table)) + 1, len(METHODS)), dtype=np.int64)
+			for char, values in table.items():
+				codepoints[ord(char)] = values
+			codepoints[0] = 0
+			self.codepoint_tables[alphabet_name] = codepoints
+
+	def evaluate(self, text, alphabet='turkish'):
+		"""All six method values for text in a single pass"""
+		alphabet_key = self.get_alphabet_key(alphabet)
+		table = self.tables.get(alphabet_key)
+		if table is None:
+			return {'error': 'Unsupported alphabet or method'}
+		if alphabet_key in CASE_FOLDED_ALPHABETS:
+			# str.upper is idempotent per character, so one upper() covers the per-character retry
+			text = text.upper()
+		rows = [table[char] for char in text if char in table]
+		if not rows:
+			return dict.fromkeys(METHODS, 0)
+		return dict(zip(METHODS, map(sum, zip(*rows))))
+
+	def evaluate_many(self, texts, alphabet='turkish'):
+		"""evaluate() for many texts at once, summed with numpy over one codepoint array"""
+		alphabet_key = self.get_alphabet_key(alphabet)
+		codepoints = self.codepoint_tables.get(alphabet_key)
+		if codepoints is None:
+			return {'error': 'Unsupported alphabet or method'}
+		texts = list(texts)
+		if alphabet_key in CASE_FOLDED_ALPHABETS:
+			texts = [text.upper() for text in texts]
+		lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+		chars = np.frombuffer(''.join(texts).encode('utf-32-le'), dtype=np.uint32)
+		chars = np.where(chars < len(codepoints), chars, 0)
+		totals = np.zeros((len(chars) + 1, len(METHODS)), dtype=np.int64)
+		np.cumsum(codepoints[chars], axis=0, out=totals[1:])
+		ends = np.cumsum(lengths)
+		sums = totals[ends] - totals[ends - lengths]
+		return [dict(zip(METHODS, row)) for row in sums.tolist()]
+
 	def numerolog(self, text, alphabet='turkish', method='normal', detail=False):
 		alphabet_key = self.get_alphabet_key(alphabet)
 		if alphabet_key not in self.mappings or method not in self.mappings[alphabet_key]:
@@ -165,17 +220,25 @@ class UnifiedNumerology:
 
 		return detail_text if detail else result
 
-	def calculate_all(self, text, alphabet='turkish'):
-		results = {}
-		alphabet_key = self.get_alphabet_key(alphabet)
-
-		results['normal'] = self.numerolog(text, alphabet_key, 'normal')
-		results['inverse'] = self.numerolog(text, alphabet_key, 'inverse')
-		results['base36'] = self.numerolog(text, alphabet_key, 'base36')
-		results['base36_inverse'] = self.numerolog(text, alphabet_key, 'base36_inverse')
-		results['base100'] = self.numerolog(text, alphabet_key, 'base100')
-		results['base100_inverse'] = self.numerolog(text, alphabet_key, 'base100_inverse')
+	def calculate(self, text, alphabet='turkish', method='normal'):
+		values = self.evaluate(text, alphabet)
+		if 'error' in values or method not in values:
+			return "Error: Unsupported alphabet or method"
+		return values[method]
 
+	def calculate_all(self, text, alphabet='turkish'):
+		results = self.evaluate(text, alphabet)
+		if 'error' in results:
+			return results
+		return self.derive_results(results)
+
+	def calculate_all_many(self, texts, alphabet='turkish'):
+		results = self.evaluate_many(texts, alphabet)
+		if isinstance(results, dict):
+			return results
+		return [self.derive_results(values) for values in results]
+
+	def derive_results(self, results):
 		results['base3'] = results['normal'] * 3
 		results['base6'] = results['normal'] * 6
 		results['base9'] = results['normal'] * 9
@@ -202,7 +265,7 @@ class UnifiedNumerology:
 		return list(self.alphabets.keys())
 
 	def get_available_methods(self):
-		return ['normal', 'inverse', 'base36', 'base36_inverse', 'base100', 'base100_inverse']
+		return list(METHODS)
 
 	def get_alphabet(self, alphabet):
 		alphabet_key = self.get_alphabet_key(alphabet)
@@ -3,7 +3,6 @@ from pathlib import Path
 from typing import Dict, List, Optional
 import mysql.connector
 from .i18n import I18n
-from Bot.config import Config
 from Bot.database import Database
 from .Numerology import UnifiedNumerology
 import logging
@@ -31,7 +30,6 @@ class Transliteration:
 
 	def load_transliteration_map(self):
 		"""Load transliteration_map.json from Config directory."""
-		config = Config()
 		map_path = Path("Config") / "transliteration_map.json"
 		try:
 			with open(map_path, "r", encoding="utf-8") as f:
@@ -2,18 +2,17 @@ import logging
 import time
 import os
 import json
-import imaplib
-import email
-from email.header import decode_header
 from flask import Flask, request, render_template, redirect, url_for, session, flash, jsonify
-from datetime import datetime
+from datetime import datetime, timedelta
+from .papara_mailbox import get_mailbox_worker, PAYMENT_LIFETIME, SYNC_TIMEOUT
 
 logger = logging.getLogger(__name__)
 
 class PaparaPaymentHandler:
-	def __init__(self, db_connection):
+	def __init__(self, db_connection, mailbox_options: dict = None):
 		self.db = db_connection
 		self.payments = {}
+		self.mailbox_options = mailbox_options or {}
 
 	def generate_unique_description(self, user_id):
 		"""Generate a unique payment description for tracking purposes."""
@@ -39,6 +38,7 @@ class PaparaPaymentHandler:
 			self.db.conn.commit()
 
 			# Cache payment info
+			self._prune_payments()
 			self.payments[description] = {
 				'id': payment_id,
 				'user_id': user_id,
@@ -61,6 +61,12 @@ class PaparaPaymentHandler:
 				'error': str(e)
 			}
 
+	def _prune_payments(self):
+		"""Forget cached requests older than the payment lifetime; the database still has them."""
+		cutoff = datetime.now() - timedelta(seconds=PAYMENT_LIFETIME)
+		for description in [key for key, payment in self.payments.items() if payment['created_at'] < cutoff]:
+			del self.payments[description]
+
 	def check_payment_status(self, description):
 		"""Check if a payment has been received for the given description."""
 		try:
@@ -86,8 +92,6 @@ class PaparaPaymentHandler:
 	def _check_email_for_payment(self, description):
 		"""Check email inbox for payment confirmation from Papara."""
 		try:
-			# Get email credentials from database or config
-			query = "SELECT * FROM users WHERE user_id = %s"
 			user_id = self.payments.get(description, {}).get('user_id')
 
 			if not user_id:
@@ -108,49 +112,11 @@ class PaparaPaymentHandler:
 				logger.error(f"Missing email credentials for user {user_id}")
 				return False
 
-			email_user = user['email']
-			email_pass = user['email_password']
-
-			# Connect to email server
-			mail = imaplib.IMAP4_SSL("imap.gmail.com")	# Adjust for other email providers
-			mail.login(email_user, email_pass)
-			mail.select('inbox')
-
-			# Search for emails from Papara
-			status, messages = mail.search(None, 'FROM', '"Papara <bilgi@papara.com>"')
-			email_ids = messages[0].split()
-
-			# Check most recent emails first (last 10)
-			for email_id in reversed(email_ids[-10:] if len(email_ids) > 10 else email_ids):
-				status, msg_data = mail.fetch(email_id, '(RFC822)')
-				msg = email.message_from_bytes(msg_data[0][1])
-
-				# Check subject
-				subject = decode_header(msg["Subject"])[0][0]
-				if isinstance(subject, bytes):
-					subject = subject.decode()
-
-				# Look for payment confirmation emails
-				if "Hesabına" in subject or "hesabında" in subject.lower():
-					# Extract email body
-					if msg.is_multipart():
-						for part in msg.walk():
-							if part.get_content_type() == 'text/plain':
-								body = part.get_payload(decode=True).decode()
-								if description in body:
-									mail.close()
-									mail.logout()
-									return True
-					else:
-						body = msg.get_payload(decode=True).decode()
-						if description in body:
-							mail.close()
-							mail.logout()
-							return True
-
-			mail.close()
-			mail.logout()
-			return False
+			# The mailbox worker keeps its own IMAP session; this is only an index lookup
+			worker = get_mailbox_worker(user['email'], user['email_password'], **self.mailbox_options)
+			if not worker.synced.wait(SYNC_TIMEOUT):
+				logger.warning(f"Papara mailbox {user['email']} has not finished its first sync; payment {description} looks unpaid for now")
+			return worker.has_payment(description)
 		except Exception as e:
 			logger.error(f"Error checking email for payment: {str(e)}")
 			return False
@@ -226,14 +192,9 @@ class PaparaPaymentHandler:
 				)
 				self.db.conn.commit()
 
-				# Update product quantity
+				# Update product quantity (through Database so the product cache is invalidated)
 				if product['quantity'] is not None:
-					new_quantity = max(0, product['quantity'] - 1)
-					self.db.cursor.execute(
-						"UPDATE products SET quantity = %s WHERE id = %s",
-						(new_quantity, product_id)
-					)
-					self.db.conn.commit()
+					self.db.decrement_product_quantity(product_id, 1)
 
 			elif product_type == 'downloadable':
 				# Create download record
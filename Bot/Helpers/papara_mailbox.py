@@ -0,0 +1,233 @@
+import email
+import imaplib
+import logging
+import re
+import socket
+import threading
+import time
+from email.header import decode_header, make_header
+
+logger = logging.getLogger(__name__)
+
+PAPARA_SENDER = "bilgi@papara.com"
+# Matches PaparaPaymentHandler.generate_unique_description
+DESCRIPTION_PATTERN = re.compile(r"payment_\d+_\d+")
+IDLE_TIMEOUT = 25 * 60	# RFC 2177: end IDLE before the server's 30 minute cutoff
+POLL_INTERVAL = 60
+RECONNECT_DELAY = 30
+# Payment requests are only honoured this long, so older notifications are neither fetched nor kept
+PAYMENT_LIFETIME = 7 * 24 * 3600
+# check_payment_status waits at most this long for a new worker's first sync
+SYNC_TIMEOUT = 10
+FETCH_BATCH = 50
+MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+UID_PATTERN = re.compile(rb"\bUID (\d+)")
+
+def is_payment_notification(subject: str) -> bool:
+	"""Papara's "money arrived in your account" mails"""
+	return "Hesabına" in subject or "hesabında" in subject.lower()
+
+def message_text(msg) -> str:
+	parts = msg.walk() if msg.is_multipart() else (msg,)
+	texts = []
+	for part in parts:
+		if part.get_content_type() == "text/plain":
+			payload = part.get_payload(decode=True) or b""
+			texts.append(payload.decode(part.get_content_charset() or "utf-8", errors="replace"))
+	return "\n".join(texts)
+
+def imap_date(timestamp: float) -> str:
+	"""dd-Mon-yyyy for SEARCH SINCE; month names are fixed by RFC 3501, not the locale."""
+	day = time.gmtime(timestamp)
+	return f"{day.tm_mday:02d}-{MONTHS[day.tm_mon - 1]}-{day.tm_year}"
+
+class PaparaMailboxWorker:
+	"""
+	Keeps one IMAP session open and indexes Papara payment notifications.
+
+	New mail is noticed with IDLE when the server supports it, otherwise
+	by polling NOOP. The first sync only looks at mail from the last
+	payment_lifetime; after that only messages with a UID above the last one
+	seen are fetched, in batches, and every payment description found in
+	their body is indexed, so has_payment() is a dictionary lookup. Entries
+	older than payment_lifetime are dropped on each sync.
+	"""
+
+	def __init__(self, username: str, password: str, host: str = "imap.gmail.com", port: int = 993,
+				 use_ssl: bool = True, sender: str = PAPARA_SENDER, mailbox: str = "INBOX",
+				 idle_timeout: int = IDLE_TIMEOUT, poll_interval: int = POLL_INTERVAL,
+				 payment_lifetime: int = PAYMENT_LIFETIME):
+		self.username = username
+		self.password = password
+		self.host = host
+		self.port = port
+		self.use_ssl = use_ssl
+		self.sender = sender
+		self.mailbox = mailbox
+		self.idle_timeout = idle_timeout
+		self.poll_interval = poll_interval
+		self.payment_lifetime = payment_lifetime
+		self.payments = {}
+		self.last_uid = 0
+		self.synced = threading.Event()
+		self.last_error = None
+		self._lock = threading.Lock()
+		self._stop = threading.Event()
+		self._thread = None
+		self._mail = None
+
+	def start(self) -> None:
+		with self._lock:
+			if self._thread is not None and self._thread.is_alive():
+				return
+			self._stop.clear()
+			self._thread = threading.Thread(target=self._run, name=f"papara-imap-{self.username}", daemon=True)
+			self._thread.start()
+
+	def stop(self) -> None:
+		self._stop.set()
+		mail = self._mail
+		if mail is not None:
+			try:
+				# Unblocks a pending IDLE read; mail.shutdown() would wait for that read to release the file
+				mail.socket().shutdown(socket.SHUT_RDWR)
+			except Exception:
+				pass
+		if self._thread is not None:
+			self._thread.join(5)
+
+	def has_payment(self, description: str) -> bool:
+		return description in self.payments
+
+	def get_payment(self, description: str) -> dict:
+		return self.payments.get(description)
+
+	def _run(self) -> None:
+		while not self._stop.is_set():
+			try:
+				self._connect()
+				self._sync()
+				self.synced.set()
+				while not self._stop.is_set():
+					self._wait_for_mail()
+					self._sync()
+			except Exception as e:
+				if self._stop.is_set():
+					break
+				self.last_error = str(e)
+				logger.error(f"Papara mailbox {self.username}: {str(e)}; reconnecting in {RECONNECT_DELAY}s")
+				self._stop.wait(RECONNECT_DELAY)
+			finally:
+				self._disconnect()
+
+	def _connect(self) -> None:
+		if self.use_ssl:
+			mail = imaplib.IMAP4_SSL(self.host, self.port)
+		else:
+			mail = imaplib.IMAP4(self.host, self.port)
+		mail.login(self.username, self.password)
+		mail.select(self.mailbox, readonly=True)
+		self._mail = mail
+
+	def _disconnect(self) -> None:
+		mail, self._mail = self._mail, None
+		if mail is None:
+			return
+		try:
+			mail.logout()
+		except Exception:
+			pass
+
+	def _sync(self) -> None:
+		"""Fetch and index Papara messages newer than last_uid."""
+		mail = self._mail
+		criteria = ["FROM", f'"{self.sender}"']
+		if not self.last_uid:
+			# The mailbox may hold years of Papara mail; none of it can match a live payment request
+			criteria += ["SINCE", imap_date(time.time() - self.payment_lifetime)]
+		status, data = mail.uid("SEARCH", None, f"UID {self.last_uid + 1}:*", *criteria)
+		if status != "OK":
+			raise imaplib.IMAP4.error(f"UID SEARCH failed: {data}")
+		uids = [int(uid) for uid in (data[0] or b"").split()]
+		# "n:*" always returns the highest UID, even when it is below n
+		uids = sorted(uid for uid in uids if uid > self.last_uid)
+		for start in range(0, len(uids), FETCH_BATCH):
+			batch = uids[start:start + FETCH_BATCH]
+			status, response = mail.uid("FETCH", ",".join(map(str, batch)), "(UID INTERNALDATE BODY.PEEK[])")
+			if status != "OK":
+				raise imaplib.IMAP4.error(f"UID FETCH {batch[0]}:{batch[-1]} failed: {response}")
+			for item in response:
+				if not isinstance(item, tuple):
+					continue
+				match = UID_PATTERN.search(item[0])
+				if match and item[1]:
+					self._index_message(int(match.group(1)), email.message_from_bytes(item[1]), self._received_at(item[0]))
+			self.last_uid = batch[-1]
+		self._prune()
+
+	@staticmethod
+	def _received_at(header: bytes) -> float:
+		internal = imaplib.Internaldate2tuple(header)
+		return time.mktime(internal) if internal else time.time()
+
+	def _index_message(self, uid: int, msg, received_at: float = None) -> None:
+		subject = str(make_header(decode_header(msg.get("Subject", ""))))
+		if not is_payment_notification(subject):
+			return
+		received_at = received_at or time.time()
+		for description in set(DESCRIPTION_PATTERN.findall(message_text(msg))):
+			self.payments[description] = {"uid": uid, "subject": subject, "received_at": received_at}
+
+	def _prune(self) -> None:
+		cutoff = time.time() - self.payment_lifetime
+		if any(entry["received_at"] < cutoff for entry in self.payments.values()):
+			# Swapped in whole, so lookups from request threads never see a dict being resized
+			self.payments = {description: entry for description, entry in self.payments.items() if entry["received_at"] >= cutoff}
+
+	def _wait_for_mail(self) -> None:
+		mail = self._mail
+		if "IDLE" not in mail.capabilities:
+			self._stop.wait(self.poll_interval)
+			mail.noop()
+			return
+		tag = mail._new_tag()
+		mail.send(tag + b" IDLE\r\n")
+		line = mail.readline()
+		if not line.startswith(b"+"):
+			raise imaplib.IMAP4.error(f"IDLE rejected: {line!r}")
+		mail.socket().settimeout(self.idle_timeout)
+		try:
+			while True:
+				line = mail.readline()
+				if not line:
+					raise imaplib.IMAP4.abort("Connection closed during IDLE")
+				if line.startswith(b"*") and b"EXISTS" in line:
+					break
+		except TimeoutError:
+			# A socket file is unusable after a timeout, so the quiet period ends with a fresh session
+			self._disconnect()
+			self._connect()
+			return
+		mail.socket().settimeout(None)
+		mail.send(b"DONE\r\n")
+		while True:
+			line = mail.readline()
+			if not line:
+				raise imaplib.IMAP4.abort("Connection closed after IDLE")
+			if line.startswith(tag):
+				break
+
+_workers = {}
+_workers_lock = threading.Lock()
+
+def get_mailbox_worker(username: str, password: str, **kwargs) -> PaparaMailboxWorker:
+	"""Shared, started worker per mailbox."""
+	key = (kwargs.get("host", "imap.gmail.com"), username)
+	with _workers_lock:
+		worker = _workers.get(key)
+		if worker is None or worker.password != password:
+			if worker is not None:
+				worker.stop()
+			worker = _workers[key] = PaparaMailboxWorker(username, password, **kwargs)
+	worker.start()
+	return worker
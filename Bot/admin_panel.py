@@ -2,8 +2,6 @@ import logging
 import os
 import re
 import bcrypt
-import yaml
-import requests
 import asyncio
 import urllib
 import importlib
@@ -11,14 +9,21 @@ import sys
 import json
 import base64
 import uuid
-from flask import Flask, request, render_template, redirect, url_for, session, flash, jsonify, Blueprint
+import hmac
+from flask import Flask, Response, g, request, render_template, redirect, url_for, session, flash, jsonify, Blueprint
 from asgiref.wsgi import WsgiToAsgi
-from Bot.config import Config
+from Bot.config import config, config_store, get_config, MYSQL_FIELDS
+from Bot import metrics, query_stats
 from Bot.database import Database
+from Bot.github_traffic import get_refresher as get_github_refresher
+from Bot.inline_usage_store import inline_usage_store
+from Bot.product_cache import product_cache
+from Bot.persistence import MySQLPersistence
+from Bot.update_queue import UpdateQueue
 from Bot.Helpers.i18n import I18n
 from .seed_admin import seed_admin
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
 	Application, CommandHandler, MessageHandler, CallbackQueryHandler, PreCheckoutQueryHandler,
@@ -27,11 +32,12 @@ from telegram.ext import (
 from telegram.constants import ParseMode
 from telegram.error import BadRequest
 from Bot.Helpers.MultilingualCommandRegistrar import MultilingualCommandRegistrar
+from Bot.Helpers.LazyHandler import lazy_callback, forget as forget_lazy_callbacks
+from Bot.Helpers.CommandAliases import get_command_aliases
 
 # Initialize Flask app
 flask_app = Flask(__name__, template_folder="/code/Templates/", static_folder="/code/Assets", static_url_path="/Assets")
 dashboard = Blueprint('dashboard', __name__)
-config = Config()
 flask_app.secret_key = config.flask_secret_key
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -39,16 +45,46 @@ logger = logging.getLogger(__name__)
 # Define available languages
 AVAILABLE_LANGUAGES = ["en", "tr", "ar", "he", "la"]
 
-# Initialize Telegram application
-telegram_app = Application.builder().token(config.telegram_token).build()
+@flask_app.before_request
+def begin_query_accounting():
+	g.query_scope = query_stats.begin(f"request:{request.url_rule.rule if request.url_rule else 'unmatched'}")
+
+@flask_app.teardown_request
+def end_query_accounting(exception=None):
+	token = g.pop("query_scope", None)
+	if token is not None:
+		query_stats.end(token)
+
+# Initialize Telegram application; conversation and user state is shared between workers through MySQL
+persistence = MySQLPersistence()
+telegram_builder = Application.builder().token(config.telegram_token).persistence(persistence)
+if metrics.enabled:
+	telegram_builder = telegram_builder.request(metrics.telegram_request())
+telegram_app = telegram_builder.build()
+
+def on_config_change(old, new):
+	flask_app.secret_key = new.flask_secret_key
+	if new.differs(old, "telegram_token", "webhook_url"):
+		logger.warning("Telegram token or webhook URL changed; restart the bot to apply it")
+
+# Reload the configuration when the admin panel or another worker changes it
+config_store.subscribe(on_config_change)
+config_store.start()
 
 # Flag to ensure initialization happens only once
 _initialized = False
+_initialize_lock = None
 
 async def initialize_telegram_app():
-	"""Initialize the Telegram application asynchronously."""
-	global _initialized
-	if not _initialized:
+	"""Initialize the Telegram application once; only ever awaited on the update queue's loop."""
+	global _initialized, _initialize_lock
+	if _initialized:
+		return
+	if _initialize_lock is None:
+		_initialize_lock = asyncio.Lock()
+	async with _initialize_lock:
+		if _initialized:
+			return
 		try:
 			logger.info("Starting Telegram application initialization")
 			await telegram_app.initialize()
@@ -57,8 +93,6 @@ async def initialize_telegram_app():
 		except Exception as e:
 			logger.error(f"Failed to initialize Telegram application: {str(e)}")
 			raise
-	else:
-		logger.info("Telegram application already initialized")
 
 async def set_webhook_on_startup():
 	"""Set the Telegram webhook after initialization."""
@@ -73,28 +107,15 @@ async def set_webhook_on_startup():
 		logger.error(f"Failed to set webhook: {str(e)}")
 
 async def setup_telegram_app():
-	"""Schedule or run Telegram initialization and webhook setup."""
+	"""Initialization and webhook setup; the update queue runs it on its loop before taking updates."""
 	try:
-		logger.info("Scheduling Telegram initialization and webhook setup")
+		logger.info("Running Telegram initialization and webhook setup")
 		await initialize_telegram_app()
 		await set_webhook_on_startup()
 	except Exception as e:
 		logger.error(f"Initialization or webhook setup error: {str(e)}")
 		raise
 
-# Schedule initialization and webhook setup
-try:
-	loop = asyncio.get_event_loop()
-	if loop.is_running():
-		logger.info("Event loop is running, scheduling Telegram initialization as a task")
-		asyncio.create_task(setup_telegram_app())
-	else:
-		logger.info("Event loop is not running, running Telegram initialization directly")
-		asyncio.run(setup_telegram_app())
-except Exception as e:
-	logger.error(f"Failed to schedule Telegram initialization: {str(e)}")
-	raise
-
 # Register handlers
 def register_handlers():
 	from .Commands.UserCommands.abjad import get_abjad_conversation_handler, abjad_start
@@ -102,26 +123,8 @@ def register_handlers():
 	from .Commands.UserCommands.huddam import get_huddam_conversation_handler, huddam_start
 	from .Commands.UserCommands.unsur import get_unsur_conversation_handler, unsur_start
 	from .Commands.UserCommands.transliterate import get_transliterate_conversation_handler, transliterate_start
-	from .Commands.UserCommands import numerology as user_numerology
-	from .Commands.UserCommands import convert_numbers as user_convert_numbers
-	from .Commands.UserCommands import magic_square as user_magic_square
-	from .Commands.UserCommands import nutket as user_nutket
-	from .Commands.SystemCommands.payment import (
-		payment_handle, handle_pre_checkout, handle_successful_payment
-	)
-	from .Commands.SystemCommands import (
-		start, help, language, cancel, settings, credits, callback_query
-	)
-	from .Commands.InlineCommands import (
-		abjad, bastet, huddam, unsur, nutket, transliterate, numerology,
-		magic_square, convert_numbers
-	)
-	from .Commands.ShopCommands.buy import BuyCommand
+	from .Commands.SystemCommands import callback_query
 	from .Commands.ShopCommands.sell import setup_sell_handler, start_sell
-	from .Commands.ShopCommands.address import AddressCommand
-	from .Commands.ShopCommands.password import PasswordCommand
-	from .Commands.ShopCommands.orders import OrdersCommand
-	from .Commands.ShopCommands.papara import PaparaCommand
 	from .Commands.InlineShopCommands.shop import ShopInlineCommand
 	from .Commands.InlineShopCommands.product import ProductInlineCommand
 	from .Commands.InlineShopCommands.update import UpdateInlineCommand
@@ -141,29 +144,30 @@ def register_handlers():
 		command_registrar = MultilingualCommandRegistrar()
 
 		# Komut işleyicilerini bir sözlükte topla
+		# Modules of plain commands are imported when the command is first used
 		command_handlers = {
-			"start": start.start_handle,
-			"help": help.help_handle,
-			"language": language.language_handle,
-			"settings": settings.settings_handle,
-			"credits": credits.credits_handle,
-			"payment": payment_handle,
-			"numerology": user_numerology.numerology_handle,
-			"convertnumbers": user_convert_numbers.convert_numbers_handle,
-			"magicsquare": user_magic_square.magic_square_handle,
-			"nutket": user_nutket.nutket_handle,
-			"cancel": cancel.cancel_handle,
+			"start": lazy_callback("Bot.Commands.SystemCommands.start", "start_handle"),
+			"help": lazy_callback("Bot.Commands.SystemCommands.help", "help_handle"),
+			"language": lazy_callback("Bot.Commands.SystemCommands.language", "language_handle"),
+			"settings": lazy_callback("Bot.Commands.SystemCommands.settings", "settings_handle"),
+			"credits": lazy_callback("Bot.Commands.SystemCommands.credits", "credits_handle"),
+			"payment": lazy_callback("Bot.Commands.SystemCommands.payment", "payment_handle"),
+			"numerology": lazy_callback("Bot.Commands.UserCommands.numerology", "numerology_handle"),
+			"convertnumbers": lazy_callback("Bot.Commands.UserCommands.convert_numbers", "convert_numbers_handle"),
+			"magicsquare": lazy_callback("Bot.Commands.UserCommands.magic_square", "magic_square_handle"),
+			"nutket": lazy_callback("Bot.Commands.UserCommands.nutket", "nutket_handle"),
+			"cancel": lazy_callback("Bot.Commands.SystemCommands.cancel", "cancel_handle"),
 			"abjad": abjad_start,  # ConversationHandler için entry point
 			"bastet": bastet_start,
 			"huddam": huddam_start,
 			"unsur": unsur_start,
 			"transliterate": transliterate_start,
-			"buy": BuyCommand().buy_command,
+			"buy": lazy_callback("Bot.Commands.ShopCommands.buy", "buy_command", instance_of="BuyCommand"),
 			"sell": start_sell,
-			"address": AddressCommand().address_command,
-			"password": PasswordCommand().password_command,
-			"orders": OrdersCommand().orders_command,
-			"papara": PaparaCommand().papara_command,
+			"address": lazy_callback("Bot.Commands.ShopCommands.address", "address_command", instance_of="AddressCommand"),
+			"password": lazy_callback("Bot.Commands.ShopCommands.password", "password_command", instance_of="PasswordCommand"),
+			"orders": lazy_callback("Bot.Commands.ShopCommands.orders", "orders_command", instance_of="OrdersCommand"),
+			"papara": lazy_callback("Bot.Commands.ShopCommands.papara", "papara_command", instance_of="PaparaCommand"),
 		}
 
 		# MultilingualCommandRegistrar ile komutları kaydet
@@ -178,21 +182,18 @@ def register_handlers():
 
 		# Diğer handler'ları ekle
 		setup_sell_handler(telegram_app)
-		telegram_app.add_handler(PreCheckoutQueryHandler(handle_pre_checkout))
-		telegram_app.add_handler(MessageHandler(filters.SUCCESSFUL_PAYMENT, handle_successful_payment))
+		telegram_app.add_handler(PreCheckoutQueryHandler(lazy_callback("Bot.Commands.SystemCommands.payment", "handle_pre_checkout")))
+		telegram_app.add_handler(MessageHandler(filters.SUCCESSFUL_PAYMENT, lazy_callback("Bot.Commands.SystemCommands.payment", "handle_successful_payment")))
 		telegram_app.add_handler(CallbackQueryHandler(callback_query.set_language_handle, pattern=r"lang\|.+"))
 		telegram_app.add_handler(CallbackQueryHandler(callback_query.handle_callback_query))
 
 		# Inline query handler'ları
-		telegram_app.add_handler(InlineQueryHandler(abjad, pattern=r"^/abjad"))
-		telegram_app.add_handler(InlineQueryHandler(bastet, pattern=r"^/bastet"))
-		telegram_app.add_handler(InlineQueryHandler(huddam, pattern=r"^/huddam"))
-		telegram_app.add_handler(InlineQueryHandler(unsur, pattern=r"^/unsur"))
-		telegram_app.add_handler(InlineQueryHandler(nutket, pattern=r"^/nutket"))
-		telegram_app.add_handler(InlineQueryHandler(transliterate, pattern=r"^/transliterate"))
-		telegram_app.add_handler(InlineQueryHandler(numerology, pattern=r"^/numerology"))
-		telegram_app.add_handler(InlineQueryHandler(magic_square, pattern=r"^/magicsquare"))
-		telegram_app.add_handler(InlineQueryHandler(convert_numbers, pattern=r"^/convertnumbers"))
+		for command, module in (
+			("abjad", "abjad"), ("bastet", "bastet"), ("huddam", "huddam"), ("unsur", "unsur"), ("nutket", "nutket"),
+			("transliterate", "transliterate"), ("numerology", "numerology"), ("magicsquare", "magic_square"),
+			("convertnumbers", "convert_numbers")
+		):
+			telegram_app.add_handler(InlineQueryHandler(lazy_callback(f"Bot.Commands.InlineCommands.{module}", "handle"), pattern=rf"^/{command}"))
 
 		# Inline shop komut handler'ları
 		try:
@@ -214,6 +215,7 @@ def register_handlers():
 			logger.error(f"Failed to register UpdateInlineCommand handlers: {str(e)}")
 			raise
 
+		metrics.instrument_application(telegram_app)
 		logger.info("All handlers registered successfully")
 	except Exception as e:
 		logger.error(f"Critical error in register_handlers: {str(e)}")
@@ -228,8 +230,18 @@ except Exception as e:
 	logger.error(f"Error in register_handlers: {str(e)}")
 	raise
 
+def nest_mysql_settings(config_data: dict) -> dict:
+	"""Move the form's mysql_* values under the "mysql" key Config reads them from."""
+	config_data = dict(config_data)
+	mysql = dict(get_config().data().get("mysql") or {})
+	for field in MYSQL_FIELDS:
+		if field in config_data:
+			mysql[field[len("mysql_"):]] = config_data.pop(field)
+	config_data["mysql"] = mysql
+	return config_data
+
 def get_fields():
-	config = Config()
+	config = get_config()
 	return [
 		{"key": "telegram_token", "label": "Telegram Token", "value": config.telegram_token or "", "use_env": config._config.get("telegram_token_use_env", False)},
 		{"key": "bot_username", "label": "Bot Username", "value": config.bot_username or "", "use_env": config._config.get("bot_username_use_env", False)},
@@ -259,7 +271,7 @@ def index(lang="en"):
 	if "username" not in session:
 		return redirect(url_for("login", lang=lang))
 
-	config = Config()
+	config = get_config()
 	i18n = I18n()
 	if lang not in AVAILABLE_LANGUAGES:
 		lang = "en"
@@ -284,7 +296,8 @@ def index(lang="en"):
 	# Handle Users tab pagination and search
 	users_page = int(request.args.get("users_page", 1))
 	users_search = request.args.get("users_search", "")
-	users, users_total_pages = db.get_users_paginated(users_page, 50, users_search)
+	users_after_id = request.args.get("users_after_id", type=int)
+	users, users_total_pages = db.get_users_paginated(users_page, 50, users_search, users_after_id)
 	for user in users:
 		badges = []
 		if user['is_admin']:
@@ -302,7 +315,8 @@ def index(lang="en"):
 	# Handle Groups tab pagination and search
 	groups_page = int(request.args.get("groups_page", 1))
 	groups_search = request.args.get("groups_search", "")
-	groups, groups_total_pages = db.get_groups_paginated(groups_page, 50, groups_search)
+	groups_after_id = request.args.get("groups_after_id", type=int)
+	groups, groups_total_pages = db.get_groups_paginated(groups_page, 50, groups_search, groups_after_id)
 
 	# Handle Products tab pagination and search
 	products_page = int(request.args.get("products_page", 1))
@@ -433,7 +447,7 @@ def user_dashboard(lang="en"):
 		return redirect(url_for("login", lang=lang))
 
 
-	config = Config()
+	config = get_config()
 	if lang not in AVAILABLE_LANGUAGES:
 		lang = "en"
 
@@ -665,7 +679,7 @@ def install(lang="en"):
 		lang = "en"
 
 	i18n = I18n()
-	config = Config()
+	config = get_config()
 
 	if request.method == "POST":
 		# Update configuration
@@ -692,7 +706,7 @@ def install(lang="en"):
 			flash(i18n.t("INSTALL_MISSING_FIELDS", lang), "error")
 			return render_template("install.html", lang=lang, i18n=i18n)
 
-		# Update config.yaml
+		# Update config.yml
 		config_data = {
 			"telegram_token": telegram_token,
 			"bot_username": bot_username,
@@ -713,12 +727,8 @@ def install(lang="en"):
 		}
 
 		try:
-			config_path = os.path.join(os.path.dirname(__file__), "config.yaml")
-			with open(config_path, "w") as f:
-				yaml.dump(config_data, f)
-
-			# Reload configuration
-			config = Config()
+			# Written to Config/config.yml; every worker picks the new snapshot up
+			config.save_config(nest_mysql_settings(config_data))
 
 			# Initialize database
 			db = Database()
@@ -769,6 +779,75 @@ def file_tree(lang="en"):
 		logger.error(f"Error building file tree: {str(e)}")
 		return jsonify({"error": f"Failed to build file tree: {str(e)}"}), 500
 
+@flask_app.route("/<lang>/command_usage_series", methods=["GET"])
+def command_usage_series(lang="en"):
+	if "username" not in session:
+		return jsonify({"error": "Unauthorized access"}), 401
+
+	granularity = request.args.get("granularity", "day")
+	if granularity not in ("hour", "day"):
+		return jsonify({"error": "Invalid granularity"}), 400
+	days = request.args.get("days", 30, type=int)
+	try:
+		db = Database()
+		since = datetime.now() - timedelta(days=days)
+		rows = db.get_command_usage_series(granularity, since)
+		buckets = sorted({row['bucket_start'] for row in rows})
+		positions = {bucket: index for index, bucket in enumerate(buckets)}
+		series = {}
+		for row in rows:
+			counts = series.setdefault(row['command'], [0] * len(buckets))
+			counts[positions[row['bucket_start']]] = row['count']
+		return jsonify({
+			"granularity": granularity,
+			"buckets": [bucket.isoformat() for bucket in buckets],
+			"series": series
+		})
+	except Exception as e:
+		logger.error(f"Error loading command usage series: {str(e)}")
+		return jsonify({"error": f"Failed to load command usage series: {str(e)}"}), 500
+
+@flask_app.route("/<lang>/callback_latency", methods=["GET"])
+def callback_latency(lang="en"):
+	if "username" not in session:
+		return jsonify({"error": "Unauthorized access"}), 401
+
+	from .Commands.SystemCommands.callback_query import callback_router
+	return jsonify({"routes": callback_router.stats()})
+
+@flask_app.route("/<lang>/update_queue", methods=["GET"])
+def update_queue_stats(lang="en"):
+	if "username" not in session:
+		return jsonify({"error": "Unauthorized access"}), 401
+
+	return jsonify(update_queue.stats())
+
+@flask_app.route("/<lang>/query_stats", methods=["GET"])
+def query_stats_page(lang="en"):
+	if "username" not in session:
+		return jsonify({"error": "Unauthorized access"}), 401
+
+	sort = request.args.get("sort", "time")
+	if sort not in ("time", "count", "statements"):
+		return jsonify({"error": "Invalid sort"}), 400
+	limit = request.args.get("limit", 20, type=int)
+	stats = query_stats.query_stats
+	return jsonify({
+		"window_seconds": stats.window,
+		"slow_query_ms": stats.slow_ms,
+		"slow_queries": stats.slow_queries,
+		"methods": stats.top("methods", sort, limit),
+		"statements": stats.top("statements", sort, limit),
+		"scopes": stats.top("scopes", sort, limit)
+	})
+
+@flask_app.route("/<lang>/inline_usages", methods=["GET"])
+def inline_usage_stats(lang="en"):
+	if "username" not in session:
+		return jsonify({"error": "Unauthorized access"}), 401
+
+	return jsonify(inline_usage_store.stats())
+
 @flask_app.route("/<lang>/save_config", methods=["POST"])
 def save_config_route(lang="en"):
 	if "username" not in session:
@@ -799,9 +878,7 @@ def save_config_route(lang="en"):
 
 		config_data["ai_settings"] = ai_settings
 
-		config_path = os.path.join(os.path.dirname(__file__), "config.yaml")
-		with open(config_path, "w") as f:
-			yaml.dump(config_data, f)
+		get_config().save_config(nest_mysql_settings(config_data))
 
 		flash(i18n.t("CONFIG_SAVED", lang), "success")
 	except Exception as e:
@@ -828,23 +905,14 @@ def add_model(lang="en"):
 			flash(i18n.t("MODEL_MISSING_FIELDS", lang), "error")
 			return redirect(url_for("index", lang=lang))
 
-		config = Config()
-
-		if not hasattr(config, "_config"):
-			config._config = {}
-
-		if "models" not in config._config:
-			config._config["models"] = {}
-
-		config._config["models"][model_name] = {
+		config = get_config()
+		models = config.data().get("models") or {}
+		models[model_name] = {
 			"name": model_name,
 			"url": model_url,
 			"access_token_env": access_token_env
 		}
-
-		config_path = os.path.join(os.path.dirname(__file__), "config.yaml")
-		with open(config_path, "w") as f:
-			yaml.dump(config._config, f)
+		config.save_config({"models": models})
 
 		flash(i18n.t("MODEL_ADDED", lang), "success")
 	except Exception as e:
@@ -869,18 +937,16 @@ def delete_model(lang="en"):
 			flash(i18n.t("MODEL_NAME_REQUIRED", lang), "error")
 			return redirect(url_for("index", lang=lang))
 
-		config = Config()
+		config = get_config()
+		models = config.data().get("models")
 
-		if not hasattr(config, "_config") or "models" not in config._config:
+		if not models:
 			flash(i18n.t("NO_MODELS_FOUND", lang), "error")
 			return redirect(url_for("index", lang=lang))
 
-		if model_name in config._config["models"]:
-			del config._config["models"][model_name]
-
-			config_path = os.path.join(os.path.dirname(__file__), "config.yaml")
-			with open(config_path, "w") as f:
-				yaml.dump(config._config, f)
+		if model_name in models:
+			del models[model_name]
+			config.save_config({"models": models})
 
 			flash(i18n.t("MODEL_DELETED", lang), "success")
 		else:
@@ -900,7 +966,8 @@ def get_users(lang="en"):
 	db = Database()
 	page = int(request.args.get("page", 1))
 	search = request.args.get("search", "")
-	users, total_pages = db.get_users_paginated(page, 50, search)
+	after_id = request.args.get("after_id", type=int)
+	users, total_pages = db.get_users_paginated(page, 50, search, after_id)
 	for user in users:
 		badges = []
 		if user['is_admin']:
@@ -934,7 +1001,8 @@ def get_groups(lang="en"):
 	db = Database()
 	page = int(request.args.get("page", 1))
 	search = request.args.get("search", "")
-	groups, total_pages = db.get_groups_paginated(page, 50, search)
+	after_id = request.args.get("after_id", type=int)
+	groups, total_pages = db.get_groups_paginated(page, 50, search, after_id)
 	return render_template(
 		"groups_partial.html",
 		lang=lang,
@@ -1032,7 +1100,7 @@ def promote_credits(lang="en"):
 def toggle_blacklist(lang="en"):
 	if "username" not in session:
 		return redirect(url_for("login", lang=lang))
-	config = Config()
+	config = get_config()
 	i18n = I18n()
 	if lang not in AVAILABLE_LANGUAGES:
 		lang = "en"
@@ -1056,7 +1124,7 @@ def toggle_blacklist(lang="en"):
 def toggle_beta_tester(lang="en"):
 	if "username" not in session:
 		return redirect(url_for("login", lang=lang))
-	config = Config()
+	config = get_config()
 	i18n = I18n()
 	if lang not in AVAILABLE_LANGUAGES:
 		lang = "en"
@@ -1121,77 +1189,17 @@ def github_traffic(lang="en"):
 	if lang not in AVAILABLE_LANGUAGES:
 		lang = "en"
 
-	config = Config()
+	config = get_config()
 
 	if not config.github_token or not config.github_username or not config.github_repo:
 		return jsonify({"error": "GitHub configuration incomplete"})
 
-	time_range = request.args.get("time_range", "30d")
 	per_page = int(request.args.get("per_page", 25))
 	page = int(request.args.get("page", 1))
 
-	days = {
-		"1d": 1,
-		"7d": 7,
-		"30d": 30,
-		"90d": 90,
-		"180d": 180,
-		"365d": 365,
-		"all": 0
-	}.get(time_range, 30)
-
 	try:
-		headers = {
-			"Authorization": f"token {config.github_token}",
-			"Accept": "application/vnd.github.v3+json"
-		}
-
-		# Get repository info
-		repo_url = f"https://api.github.com/repos/{config.github_username}/{config.github_repo}"
-		repo_response = requests.get(repo_url, headers=headers)
-		repo_data = repo_response.json()
-
-		# Get traffic data
-		traffic_url = f"{repo_url}/traffic/views"
-		traffic_response = requests.get(traffic_url, headers=headers)
-		traffic_data = traffic_response.json()
-
-		# Get clones data
-		clones_url = f"{repo_url}/traffic/clones"
-		clones_response = requests.get(clones_url, headers=headers)
-		clones_data = clones_response.json()
-
-		# Get referrers data
-		referrers_url = f"{repo_url}/traffic/popular/referrers"
-		referrers_response = requests.get(referrers_url, headers=headers)
-		referrers_data = referrers_response.json()
-
-		# Get popular content
-		content_url = f"{repo_url}/traffic/popular/paths"
-		content_response = requests.get(content_url, headers=headers)
-		content_data = content_response.json()
-
-		# Get commits
-		commits_url = f"{repo_url}/commits"
-		commits_params = {"per_page": per_page, "page": page}
-		commits_response = requests.get(commits_url, headers=headers, params=commits_params)
-		commits_data = commits_response.json()
-
-		# Get total commits count for pagination
-		commits_count_response = requests.get(f"{repo_url}/contributors", headers=headers)
-		commits_count_data = commits_count_response.json()
-		total_commits = sum(contributor.get("contributions", 0) for contributor in commits_count_data if isinstance(contributor, dict))
-
-		return jsonify({
-			"repo": repo_data,
-			"traffic": traffic_data,
-			"clones": clones_data,
-			"referrers": referrers_data,
-			"popular_content": content_data,
-			"commits": commits_data,
-			"total_commits": total_commits,
-			"total_pages": (total_commits + per_page - 1) // per_page
-		})
+		refresher = get_github_refresher(config.github_token, config.github_username, config.github_repo, config.github_api_url)
+		return jsonify(refresher.snapshot(per_page, page))
 	except Exception as e:
 		return jsonify({"error": str(e)})
 
@@ -1270,9 +1278,12 @@ def reload_file(lang="en"):
 					importlib.reload(module)
 				else:
 					module = importlib.import_module(module_name)
-				# Reinitialize Telegram handlers if the module affects bot logic
-				if module_name.startswith("Bot.") or module_name.startswith("Commands."):
-					register_handlers()
+				# Handlers are registered once (and persistent conversations loaded) at startup, so they
+				# are not registered again; lazy callbacks of the module pick up the reloaded code
+				if forget_lazy_callbacks(module_name):
+					logger.info(f"Handlers of {module_name} will use the reloaded module")
+				elif module_name.startswith("Bot."):
+					logger.warning(f"Reloaded {module_name}; handlers already holding its functions keep them until a restart")
 				logger.info(f"Reloaded Python module: {module_name}")
 				return jsonify({"message": i18n.t("FILE_RELOADED", lang)})
 			except ImportError as e:
@@ -1436,18 +1447,92 @@ def save_file(lang="en"):
 		logger.error(f"Failed to save file {file_path}: {str(e)}")
 		return jsonify({"error": f"Failed to save file: {str(e)}"}), 500
 
+def update_scope(update) -> str:
+	"""Query accounting label of an update: its kind, plus the command for commands and inline queries."""
+	kind = metrics.update_kind(update)
+	text = None
+	if update.message is not None:
+		text = update.message.text
+	elif update.inline_query is not None:
+		text = update.inline_query.query
+	if text and text.startswith("/"):
+		aliases = get_command_aliases()
+		command = aliases.original(text.split()[0].split("@")[0])
+		# Unknown words would make a label per typo
+		if command in aliases.by_command:
+			return f"update:{kind} /{command}"
+	return f"update:{kind}"
+
+async def process_telegram_update(update_data):
+	"""Run one queued webhook update through the Telegram application."""
+	await initialize_telegram_app()
+	update = Update.de_json(update_data, telegram_app.bot)
+	metrics.updates.inc(metrics.update_kind(update))
+	with query_stats.scope(update_scope(update)):
+		keys = await persistence.sync(telegram_app, update)
+		try:
+			await telegram_app.process_update(update)
+			await telegram_app.update_persistence()
+		finally:
+			persistence.release(keys)
+
+# The queue's loop owns the Telegram application: it is initialized (after handler registration, so
+# persistent conversations are loaded) and the webhook set there when the queue starts
+update_queue = UpdateQueue(process_telegram_update, workers=config.update_workers, maxsize=config.update_queue_size,
+						   on_start=setup_telegram_app, on_stop=persistence.flush)
+
+def register_stats_metrics():
+	"""Expose the stats the queue, stores and caches already keep; read only when /metrics is scraped."""
+	from .Commands.SystemCommands.callback_query import callback_router
+	metrics.registry.gauge_callback("bot_update_queue_depth", "Updates waiting in the update queue", update_queue.depth)
+	metrics.registry.counter_callback(
+		"bot_update_queue_updates_total", "Webhook updates by queue outcome",
+		lambda: {(outcome,): count for outcome, count in update_queue.counters.items()}, ("outcome",)
+	)
+	metrics.registry.histogram_callback("bot_update_queue_wait_seconds", "Time updates waited in the queue", lambda: update_queue.wait_histogram)
+	metrics.registry.histogram_callback("bot_update_seconds", "Time spent processing one update", lambda: update_queue.process_histogram)
+	metrics.registry.histogram_callback(
+		"bot_callback_route_seconds", "Callback query handling time by route",
+		lambda: {(name,): histogram for name, histogram in callback_router.histograms().items()}, ("route",)
+	)
+	metrics.registry.counter_callback(
+		"bot_cache_requests_total", "Cache lookups, by cache and result",
+		lambda: {("product", "hit"): product_cache.stats()["hits"], ("product", "miss"): product_cache.stats()["misses"]},
+		("cache", "result")
+	)
+	metrics.registry.gauge_callback("bot_inline_usages_pending", "Inline usages waiting for their chat", lambda: len(inline_usage_store))
+	metrics.registry.counter_callback(
+		"bot_persistence_operations_total", "Persistence pulls and writes",
+		lambda: {(operation,): count for operation, count in persistence.stats.items()}, ("operation",)
+	)
+
+if metrics.enabled:
+	register_stats_metrics()
+
+@flask_app.route("/metrics", methods=["GET"])
+def metrics_endpoint():
+	if not metrics.enabled:
+		return "Metrics are disabled", 404
+	token = config.metrics_token
+	if token and not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+		return "Unauthorized", 401
+	return Response(metrics.registry.render(), content_type=metrics.CONTENT_TYPE)
+
 @flask_app.route("/bot<path:path>", methods=["POST"])
-async def telegram_webhook(path):
+def telegram_webhook(path):
 	if not path.startswith(config.telegram_token):
 		return "Invalid token", 403
 
 	try:
 		update_data = request.get_json()
-		update = Update.de_json(update_data, telegram_app.bot)
-		await telegram_app.process_update(update)
+		if not isinstance(update_data, dict):
+			return "Invalid update", 400
+		# Acknowledge at once; a full queue makes Telegram redeliver later instead
+		if update_queue.submit(update_data) == "full":
+			return "Busy", 503, {"Retry-After": "5"}
 		return "OK", 200
 	except Exception as e:
-		logger.error(f"Error processing update: {str(e)}")
+		logger.error(f"Error queueing update: {str(e)}")
 		return "Error", 500
 
 # User dashboard routes for payment and order management
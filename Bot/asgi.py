@@ -0,0 +1,10 @@
+"""
+ASGI entry point: the Telegram webhook is served natively, everything else
+by the Flask admin panel.
+
+	uvicorn Bot.asgi:app --host 0.0.0.0 --port $PORT
+"""
+from Bot.admin_panel import app as panel_app, config, update_queue
+from Bot.webhook import WebhookFront
+
+app = WebhookFront(config.telegram_token, update_queue, panel_app)
@@ -1,55 +1,261 @@
-from .database import Database
-import hashlib
-import time
-import json
 import logging
+import marshal
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_TTL = 3600
+# First byte of every stored blob, so the encoding can change without misreading old rows
+FORMAT_MARSHAL = b"\x01"
+
+def encode_value(value) -> bytes:
+	"""Compact binary form of plain dict/list/str/number values"""
+	return FORMAT_MARSHAL + marshal.dumps(value)
+
+def decode_value(blob: bytes):
+	if not blob or blob[:1] != FORMAT_MARSHAL:
+		raise ValueError("Unknown ephemeral value format")
+	return marshal.loads(blob[1:])
+
+class MemoryStore:
+	"""
+	In-process TTL store for short-lived UI state.
+
+	Entries expire after their ttl and the oldest entries are evicted
+	once max_entries is reached. Only suitable for a single worker.
+	"""
+
+	def __init__(self, max_entries: int = 10000, default_ttl: int = DEFAULT_TTL):
+		self.max_entries = max_entries
+		self.default_ttl = default_ttl
+		self._entries = OrderedDict()
+		self._lock = threading.Lock()
+
+	def get(self, key: str):
+		with self._lock:
+			entry = self._entries.get(key)
+			if entry is None:
+				return None
+			expires_at, value = entry
+			if expires_at <= time.monotonic():
+				del self._entries[key]
+				return None
+			return value
+
+	def set(self, key: str, value, ttl: int = None) -> None:
+		expires_at = time.monotonic() + (ttl or self.default_ttl)
+		with self._lock:
+			self._entries[key] = (expires_at, value)
+			self._entries.move_to_end(key)
+			while len(self._entries) > self.max_entries:
+				self._entries.popitem(last=False)
+
+	def add(self, key: str, value, ttl: int = None) -> bool:
+		"""Set key only if it is absent or expired"""
+		with self._lock:
+			entry = self._entries.get(key)
+			if entry is not None and entry[0] > time.monotonic():
+				return False
+		self.set(key, value, ttl)
+		return True
+
+	def delete(self, key: str) -> None:
+		with self._lock:
+			self._entries.pop(key, None)
+
+	def purge(self) -> int:
+		"""Drop expired entries; returns how many were removed"""
+		now = time.monotonic()
+		with self._lock:
+			expired = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+			for key in expired:
+				del self._entries[key]
+		return len(expired)
+
+	def __len__(self):
+		return len(self._entries)
+
+class SQLiteStore:
+	"""
+	TTL store in a local SQLite file, shared by every worker on the host.
+
+	Values are stored as marshal blobs. Expired rows are purged every
+	purge_every writes, which also trims the table to max_entries.
+	"""
+
+	def __init__(self, path: str, max_entries: int = 100000, default_ttl: int = DEFAULT_TTL,
+				 purge_every: int = 500):
+		self.path = path
+		self.max_entries = max_entries
+		self.default_ttl = default_ttl
+		self.purge_every = purge_every
+		self._writes = 0
+		self._local = threading.local()
+		directory = os.path.dirname(os.path.abspath(path))
+		os.makedirs(directory, exist_ok=True)
+		conn = self._connection()
+		conn.execute("""CREATE TABLE IF NOT EXISTS ephemeral (
+			key TEXT PRIMARY KEY,
+			value BLOB NOT NULL,
+			expires_at REAL NOT NULL
+		)""")
+		conn.execute("CREATE INDEX IF NOT EXISTS idx_ephemeral_expires ON ephemeral (expires_at)")
+
+	def _connection(self) -> sqlite3.Connection:
+		conn = getattr(self._local, "conn", None)
+		if conn is None:
+			# Autocommit; WAL lets readers in other workers proceed during writes
+			conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+			conn.execute("PRAGMA journal_mode=WAL")
+			conn.execute("PRAGMA synchronous=NORMAL")
+			self._local.conn = conn
+		return conn
+
+	def get(self, key: str):
+		row = self._connection().execute(
+			"SELECT value FROM ephemeral WHERE key = ? AND expires_at > ?", (key, time.time())
+		).fetchone()
+		if row is None:
+			return None
+		try:
+			return decode_value(row[0])
+		except (ValueError, EOFError, TypeError) as e:
+			logger.error(f"Discarding unreadable ephemeral value {key}: {str(e)}")
+			self.delete(key)
+			return None
+
+	def set(self, key: str, value, ttl: int = None) -> None:
+		self._connection().execute(
+			"INSERT OR REPLACE INTO ephemeral (key, value, expires_at) VALUES (?, ?, ?)",
+			(key, encode_value(value), time.time() + (ttl or self.default_ttl))
+		)
+		self._after_write()
+
+	def add(self, key: str, value, ttl: int = None) -> bool:
+		"""Set key only if it is absent or expired"""
+		now = time.time()
+		cursor = self._connection().execute(
+			"""INSERT INTO ephemeral (key, value, expires_at) VALUES (?, ?, ?)
+			ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at
+			WHERE ephemeral.expires_at <= ?""",
+			(key, encode_value(value), now + (ttl or self.default_ttl), now)
+		)
+		self._after_write()
+		return cursor.rowcount > 0
+
+	def delete(self, key: str) -> None:
+		self._connection().execute("DELETE FROM ephemeral WHERE key = ?", (key,))
+
+	def _after_write(self) -> None:
+		self._writes += 1
+		if self._writes % self.purge_every == 0:
+			try:
+				self.purge()
+			except sqlite3.Error as e:
+				logger.error(f"Ephemeral store purge failed: {str(e)}")
+
+	def purge(self) -> int:
+		"""Drop expired rows and trim to max_entries; returns rows removed"""
+		conn = self._connection()
+		removed = conn.execute("DELETE FROM ephemeral WHERE expires_at <= ?", (time.time(),)).rowcount
+		removed += conn.execute(
+			"""DELETE FROM ephemeral WHERE key IN (
+				SELECT key FROM ephemeral ORDER BY expires_at DESC LIMIT -1 OFFSET ?
+			)""",
+			(self.max_entries,)
+		).rowcount
+		return removed
+
+	def __len__(self):
+		return self._connection().execute("SELECT COUNT(*) FROM ephemeral").fetchone()[0]
+
+_store = None
+_store_lock = threading.Lock()
+
+def create_store(url: str = None):
+	"""
+	Build a store from a URL: "memory" (default) or "sqlite:///path/to/file.db".
+	"""
+	url = (url or "memory").strip()
+	if url == "memory":
+		return MemoryStore()
+	if url.startswith("sqlite:///"):
+		# sqlite:///relative.db or sqlite:////absolute/path.db
+		return SQLiteStore(url[len("sqlite:///"):] or "ephemeral.db")
+	raise ValueError(f"Unknown ephemeral store: {url}")
+
+def get_store():
+	"""Process-wide ephemeral store, configured by ephemeral_store / EPHEMERAL_STORE."""
+	global _store
+	if _store is None:
+		with _store_lock:
+			if _store is None:
+				from .config import config_store
+				url = config_store.current().ephemeral_store
+				try:
+					_store = create_store(url)
+				except (ValueError, OSError, sqlite3.Error) as e:
+					logger.error(f"Falling back to in-memory ephemeral store ({url}): {str(e)}")
+					_store = MemoryStore()
+				config_store.subscribe(_on_config_change)
+	return _store
+
+def _on_config_change(old, new) -> None:
+	"""Rebuild the store on next use when ephemeral_store changes."""
+	global _store
+	if new.differs(old, "ephemeral_store"):
+		with _store_lock:
+			_store = None
+
+def set_store(store) -> None:
+	"""Replace the process-wide store (e.g. for scripts that want a specific backend)."""
+	global _store
+	_store = store
+
 class Cache:
-	def __init__(self):
-		self.db = Database()
+	"""Transliteration suggestions kept briefly for their inline buttons."""
+
+	PREFIX = "translit:"
+
+	def __init__(self, store=None, ttl: int = DEFAULT_TTL):
+		self.store = store if store is not None else get_store()
+		self.ttl = ttl
 
 	def store_alternatives(self, user_id: int, source_lang: str, target_lang: str, text: str, alternatives: list) -> str:
 		"""Store alternatives and return a cache ID."""
-		cache_id = hashlib.md5(f"{user_id}:{text}:{time.time()}".encode()).hexdigest()[:8]
-		query = """
-		INSERT INTO `transliteration_cache` (cache_id, user_id, source_lang, target_lang, source_name, alternatives, created_at)
-		VALUES (%s, %s, %s, %s, %s, %s, %s)
-		"""
+		entry = {
+			'user_id': user_id,
+			'source_lang': source_lang,
+			'target_lang': target_lang,
+			'source_name': text,
+			'alternatives': alternatives,
+			'created_at': time.time()
+		}
 		try:
-			self.db.execute_query(query, (
-				cache_id,
-				user_id,
-				source_lang,
-				target_lang,
-				text,
-				json.dumps(alternatives),
-				time.time()
-			), fetch=False)
-			return cache_id
+			# Hex ids keep the "_"-separated callback data parseable
+			while True:
+				cache_id = secrets.token_hex(4)
+				if self.store.add(self.PREFIX + cache_id, entry, self.ttl):
+					return cache_id
 		except Exception as e:
-			logger.error(f"Error storing alternatives for cache_id {cache_id}: {str(e)}")
+			logger.error(f"Error storing alternatives for user {user_id}: {str(e)}")
 			raise
 
 	def get_alternatives(self, cache_id: str) -> dict:
 		"""Retrieve alternatives by cache ID."""
-		query = "SELECT * FROM `transliteration_cache` WHERE cache_id = %s"
 		try:
-			result = self.db.execute_query(query, (cache_id,))
-			if result:
-				result[0]['alternatives'] = json.loads(result[0]['alternatives'])
-				return result[0]
+			entry = self.store.get(self.PREFIX + cache_id)
+			# Imported here like the config in get_store(), so the stores load without a config
+			from . import metrics
+			metrics.cache_requests.inc("transliteration", "hit" if entry else "miss")
+			if entry:
+				return {'cache_id': cache_id, **entry}
 			return {}
 		except Exception as e:
 			logger.error(f"Error retrieving alternatives for cache_id {cache_id}: {str(e)}")
 			return {}
-
-	def __del__(self):
-		"""Clean up database connection."""
-		try:
-			if hasattr(self, 'db'):
-				self.db.__del__()
-			logger.debug("Cache database connection closed")
-		except Exception as e:
-			logger.error(f"Error closing cache database connection: {str(e)}")
\ No newline at end of file
@@ -1,28 +1,50 @@
 import os
+import copy
 import logging
+import threading
 import yaml
 from pathlib import Path
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+CONFIG_FILE = Path('Config/config.yml')
+MODELS_FILE = Path('Config/models.yml')
+# Seconds between checks of the files' modification times
+WATCH_INTERVAL = float(os.getenv('CONFIG_WATCH_INTERVAL', 2))
+MYSQL_FIELDS = ('mysql_host', 'mysql_port', 'mysql_user', 'mysql_password', 'mysql_database')
+
 class Config:
-	def __init__(self):
+	"""
+	One read-only snapshot of the configuration. Use get_config() (or the
+	module-level config) instead of building one per call; changes go
+	through save_config(), which swaps in a new snapshot.
+	"""
+
+	def __init__(self, data: dict = None):
 		self.available_languages = ['en', 'tr', 'ar', 'he', 'la']
 		self._config = {
 			'mysql': {},
 			'ai_settings': {},
 			'github_pages_url': 'https://metatronslove.github.io/github-repo-traffic-viewer/'
 		}
-		self._load_yaml_config()
+		if data is None:
+			self._load_yaml_config()
+		else:
+			self._config.update(copy.deepcopy(data))
 		self._load_attributes()
 		self.models = self.load_models()
+		self._frozen = True
+
+	def __setattr__(self, name, value):
+		if getattr(self, '_frozen', False):
+			raise AttributeError("Config snapshots are read-only; use save_config()")
+		super().__setattr__(name, value)
 
 	def _load_yaml_config(self):
-		config_file = Path('Config/config.yml')
-		if config_file.exists():
+		if CONFIG_FILE.exists():
 			try:
-				with open(config_file, 'r') as f:
+				with open(CONFIG_FILE, 'r') as f:
 					yaml_config = yaml.safe_load(f) or {}
 				self._config.update(yaml_config)
 			except Exception as e:
@@ -37,17 +59,29 @@ class Config:
 		self.webhook_url = self._config.get('webhook_url') or os.getenv('WEBHOOK_URL')
 		self.mysql_host = self._config.get('mysql', {}).get('host') or os.getenv('MYSQL_HOST', 'mysql-numberfansbot-numberfansbot.j.aivencloud.com')
 		self.mysql_user = self._config.get('mysql', {}).get('user') or os.getenv('MYSQL_USER', 'avnadmin')
-		self.mysql_port = self._config.get('mysql', {}).get('user') or os.getenv('MYSQL_PORT', 28236)
+		self.mysql_port = self._config.get('mysql', {}).get('port') or os.getenv('MYSQL_PORT', 28236)
 		self.mysql_password = self._config.get('mysql', {}).get('password') or os.getenv('MYSQL_PASSWORD', 'your_password_here')	# Replace with actual password
 		self.mysql_database = self._config.get('mysql', {}).get('database') or os.getenv('MYSQL_DATABASE', 'numberfansbot')	# Replace with actual database name
 		self.github_username = self._config.get('github_username') or os.getenv('GITHUB_USERNAME')
 		self.github_token = self._config.get('github_token') or os.getenv('GITHUB_TOKEN')
 		self.github_repo = self._config.get('github_repo') or os.getenv('GITHUB_REPO')
 		self.github_pages_url = self._config.get('github_pages_url') or os.getenv('GITHUB_PAGES_URL')
+		self.github_api_url = self._config.get('github_api_url') or os.getenv('GITHUB_API_URL', 'https://api.github.com')
 		self.payment_provider_token = self._config.get('payment_provider_token') or os.getenv('PAYMENT_PROVIDER_TOKEN')
 		self.currency_exchange_token = self._config.get('currency_exchange_token') or os.getenv('CURRENCY_EXCHANGE_TOKEN')
 		self.huggingface_access_token = self._config.get('huggingface_access_token') or os.getenv('HUGGINGFACE_ACCESS_TOKEN')
 		self.flask_secret_key = self._config.get('flask_secret_key') or os.getenv('FLASK_SECRET_KEY')
+		# "memory" for a single worker, "sqlite:///path.db" to share short-lived UI state between workers
+		self.ephemeral_store = self._config.get('ephemeral_store') or os.getenv('EPHEMERAL_STORE', 'memory')
+		# Webhook updates are acknowledged at once and processed by this many workers
+		self.update_workers = int(self._config.get('update_workers') or os.getenv('UPDATE_WORKERS', 16))
+		self.update_queue_size = int(self._config.get('update_queue_size') or os.getenv('UPDATE_QUEUE_SIZE', 1000))
+		# /metrics is served only when enabled; a token makes it require "Authorization: Bearer <token>"
+		self.metrics_enabled = str(self._config.get('metrics_enabled') or os.getenv('METRICS_ENABLED', '')).lower() in ('1', 'true', 'yes', 'on')
+		self.metrics_token = self._config.get('metrics_token') or os.getenv('METRICS_TOKEN')
+		# Queries at least this slow are logged (0 turns the log off); top offenders cover this many seconds
+		self.slow_query_ms = float(self._config.get('slow_query_ms') or os.getenv('SLOW_QUERY_MS', 200))
+		self.query_stats_window = int(self._config.get('query_stats_window') or os.getenv('QUERY_STATS_WINDOW', 900))
 
 		# AI settings
 		self.ai_model_url = self._config.get('ai_settings', {}).get('model_url') or os.getenv('AI_MODEL_URL')
@@ -66,10 +100,9 @@ class Config:
 
 	def load_models(self):
 		"""Load models from Config/models.yml"""
-		models_file = Path("Config/models.yml")
-		if models_file.exists():
+		if MODELS_FILE.exists():
 			try:
-				with open(models_file, "r") as f:
+				with open(MODELS_FILE, "r") as f:
 					models_data = yaml.safe_load(f) or {"models": []}
 				return {m["name"]: type("Model", (), m) for m in models_data["models"]}
 			except Exception as e:
@@ -77,15 +110,127 @@ class Config:
 				return {}
 		return {}
 
+	def data(self) -> dict:
+		"""A copy of the values read from config.yml, to edit and pass to save_config()"""
+		return copy.deepcopy(self._config)
+
+	def differs(self, other: "Config", *names) -> bool:
+		return any(getattr(self, name) != getattr(other, name) for name in names)
+
 	def save_config(self, config_data):
 		"""Save configuration to config.yml"""
-		try:
-			self._config.update(config_data)
-			with open('Config/config.yml', 'w') as f:
-				yaml.dump(self._config, f)
-			self._load_attributes()	# Reload attributes after saving
-		except Exception as e:
-			logger.error(f"Failed to save config.yml: {str(e)}")
-			raise
-
-config = Config()
\ No newline at end of file
+		config_store.save(config_data)
+
+class ConfigStore:
+	"""
+	Holds the process-wide Config snapshot.
+
+	A watcher thread compares the modification times of config.yml and
+	models.yml every WATCH_INTERVAL seconds and swaps in a new snapshot when
+	they change (so a save in one worker reaches the others); save() writes
+	and swaps at once. Subscribers are called with (old, new) after every
+	swap, on the thread that made it. A file that fails to load or validate
+	leaves the previous snapshot in place.
+	"""
+
+	def __init__(self, interval: float = WATCH_INTERVAL):
+		self.interval = interval
+		self._subscribers = []
+		self._save_lock = threading.Lock()
+		self._stop = threading.Event()
+		self._watcher = None
+		self._mtimes = self._read_mtimes()
+		self._current = Config()
+		self.reloads = 0
+
+	@staticmethod
+	def _read_mtimes() -> tuple:
+		return tuple(path.stat().st_mtime_ns if path.exists() else None for path in (CONFIG_FILE, MODELS_FILE))
+
+	def current(self) -> Config:
+		return self._current
+
+	def subscribe(self, callback):
+		"""Call callback(old, new) whenever the snapshot is replaced (subscribing twice has no effect)"""
+		if callback not in self._subscribers:
+			self._subscribers.append(callback)
+		return callback
+
+	def _swap(self, new: Config) -> None:
+		old, self._current = self._current, new
+		self.reloads += 1
+		for callback in list(self._subscribers):
+			try:
+				callback(old, new)
+			except Exception as e:
+				logger.error(f"Config subscriber {getattr(callback, '__qualname__', callback)} failed: {str(e)}")
+
+	def check(self) -> bool:
+		"""Reload if either file changed since the last load; True when a new snapshot was swapped in."""
+		mtimes = self._read_mtimes()
+		if mtimes == self._mtimes:
+			return False
+		with self._save_lock:
+			self._mtimes = mtimes
+			try:
+				# Read here rather than by Config() so a malformed file is an error, not an empty config
+				with open(CONFIG_FILE, 'r') as f:
+					data = yaml.safe_load(f) or {}
+				new = Config(data)
+			except Exception as e:
+				logger.error(f"Keeping the previous configuration, reload failed: {str(e)}")
+				return False
+			self._swap(new)
+		logger.info("Configuration reloaded")
+		return True
+
+	def save(self, config_data: dict) -> None:
+		"""Merge config_data into config.yml and swap in the new snapshot."""
+		with self._save_lock:
+			data = self._current.data()
+			data.update(config_data)
+			# Validate before anything is written
+			new = Config(data)
+			temporary = CONFIG_FILE.with_name(CONFIG_FILE.name + '.tmp')
+			try:
+				CONFIG_FILE.parent.mkdir(parents=True, exist_ok=True)
+				with open(temporary, 'w') as f:
+					yaml.dump(data, f)
+				os.replace(temporary, CONFIG_FILE)
+			except Exception as e:
+				logger.error(f"Failed to save config.yml: {str(e)}")
+				raise
+			self._mtimes = self._read_mtimes()
+			self._swap(new)
+
+	def start(self) -> None:
+		"""Start the watcher thread (once per process)"""
+		if self._watcher is None:
+			self._watcher = threading.Thread(target=self._watch, name="config-watcher", daemon=True)
+			self._watcher.start()
+
+	def stop(self) -> None:
+		self._stop.set()
+
+	def _watch(self) -> None:
+		while not self._stop.wait(self.interval):
+			try:
+				self.check()
+			except Exception as e:
+				logger.error(f"Config watcher error: {str(e)}")
+
+class _ConfigProxy:
+	"""Module-level config: every attribute read goes to the current snapshot."""
+
+	def __getattr__(self, name):
+		return getattr(config_store.current(), name)
+
+	def __setattr__(self, name, value):
+		raise AttributeError("Config snapshots are read-only; use save_config()")
+
+def get_config() -> Config:
+	"""The current snapshot; keep it for the duration of one handler or request"""
+	return config_store.current()
+
+config_store = ConfigStore()
+config = _ConfigProxy()
@@ -1,27 +1,73 @@
 import mysql.connector
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
-from .config import Config
+from . import metrics, query_stats
+from .config import config, config_store, MYSQL_FIELDS
+from .product_cache import product_cache
+from .product_search import product_search_index
 import bcrypt
 import logging
 import json
 import hashlib
+import threading
+import time
 import uuid
+from collections import OrderedDict
 
 logger = logging.getLogger(__name__)
-config = Config()
+
+# Secondary indexes added to existing installs (CREATE TABLE IF NOT EXISTS never alters a table)
+SCHEMA_INDEXES = [
+	("users", "idx_username", "ALTER TABLE `users` ADD INDEX idx_username (username)"),
+	("groups", "idx_group_name", "ALTER TABLE `groups` ADD INDEX idx_group_name (group_name)"),
+	("groups", "idx_group_name_ft", "ALTER TABLE `groups` ADD FULLTEXT INDEX idx_group_name_ft (group_name)"),
+	("inline_usage", "idx_chat_timestamp", "ALTER TABLE `inline_usage` ADD INDEX idx_chat_timestamp (chat_id, timestamp)")
+]
+
+# Keeps the newest row per chat; assignments run left to right, so timestamp is compared before it moves.
+# Columns are qualified because backfill_chat_last_inline inserts from a join whose tables share these names.
+CHAT_LAST_INLINE_UPSERT = """
+ON DUPLICATE KEY UPDATE
+	chat_last_inline.user_id = IF(VALUES(timestamp) >= chat_last_inline.timestamp, VALUES(user_id), chat_last_inline.user_id),
+	chat_last_inline.query = IF(VALUES(timestamp) >= chat_last_inline.timestamp, VALUES(query), chat_last_inline.query),
+	chat_last_inline.timestamp = GREATEST(chat_last_inline.timestamp, VALUES(timestamp))
+"""
+
+COUNT_CACHE_TTL = 60
+# Each distinct admin search is its own entry, so the cache is bounded (least recently used go first)
+COUNT_CACHE_SIZE = 256
+# Above this many rows an unfiltered COUNT(*) is replaced by the table statistics estimate
+EXACT_COUNT_LIMIT = 100000
+FULLTEXT_MIN_TOKEN = 3
+FULLTEXT_OPERATORS = str.maketrans({char: " " for char in '+-<>()~*"@'})
+# InnoDB's default stopwords (of at least FULLTEXT_MIN_TOKEN letters); a required stopword matches nothing
+FULLTEXT_STOPWORDS = frozenset((
+	"about", "are", "com", "for", "from", "how", "that", "the", "this", "was",
+	"what", "when", "where", "who", "will", "with", "und", "www"
+))
 
 class Database:
+	# CREATE TABLE IF NOT EXISTS runs once per process, not on every connection
+	_schema_checked = False
+	_indexes_checked = False
+	# Names of the SCHEMA_INDEXES present, so queries needing one can fall back without it
+	_indexes_present = set()
+	# command_usage_totals is seeded once per process if an upgraded install left it empty
+	_totals_seeded = False
+	_count_cache = OrderedDict()
+	_count_lock = threading.Lock()
+
 	def __init__(self):
-		self.conn = mysql.connector.connect(
+		self.conn = query_stats.AccountingConnection(mysql.connector.connect(
 			host=config.mysql_host,
 			port=config.mysql_port,
 			user=config.mysql_user,
 			password=config.mysql_password,
 			database=config.mysql_database
-		)
+		))
 		self.cursor = self.conn.cursor(dictionary=True)
-		self.ensure_schema()
+		if not Database._schema_checked:
+			self.ensure_schema()
 
 	def connect(self):
 		"""Establish a new database connection."""
@@ -29,13 +75,13 @@ class Database:
 			if self.conn and self.conn.is_connected():
 				self.cursor.close()
 				self.conn.close()
-			self.conn = mysql.connector.connect(
+			self.conn = query_stats.AccountingConnection(mysql.connector.connect(
 				host=config.mysql_host,
 				port=config.mysql_port,
 				user=config.mysql_user,
 				password=config.mysql_password,
 				database=config.mysql_database
-			)
+			))
 			self.cursor = self.conn.cursor(dictionary=True)
 			logger.info("Database connection established")
 		except mysql.connector.Error as e:
@@ -91,16 +137,6 @@ class Database:
 				created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
 				INDEX idx_transliteration (source_name, source_lang, target_lang, transliterated_name)
 			) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;""",
-			"""CREATE TABLE IF NOT EXISTS `transliteration_cache` (
-				cache_id VARCHAR(8) PRIMARY KEY,
-				user_id BIGINT NOT NULL,
-				source_lang VARCHAR(10) NOT NULL,
-				target_lang VARCHAR(10) NOT NULL,
-				source_name TEXT NOT NULL,
-				alternatives JSON NOT NULL,
-				created_at DOUBLE NOT NULL,
-				INDEX idx_created_at (created_at)
-			);""",
 			"""CREATE TABLE IF NOT EXISTS `command_usage` (
 				id BIGINT AUTO_INCREMENT PRIMARY KEY,
 				user_id BIGINT NOT NULL,
@@ -111,13 +147,44 @@ class Database:
 				count INT DEFAULT 1,
 				UNIQUE INDEX idx_user_command (user_id, command)
 			);""",
+			"""CREATE TABLE IF NOT EXISTS `command_usage_totals` (
+				command VARCHAR(255) PRIMARY KEY,
+				total_count BIGINT NOT NULL DEFAULT 0,
+				last_used DATETIME,
+				last_user_id BIGINT,
+				chat_id BIGINT
+			);""",
+			"""CREATE TABLE IF NOT EXISTS `command_usage_buckets` (
+				granularity ENUM('hour', 'day') NOT NULL,
+				bucket_start DATETIME NOT NULL,
+				command VARCHAR(255) NOT NULL,
+				count INT NOT NULL DEFAULT 0,
+				PRIMARY KEY (granularity, bucket_start, command)
+			);""",
 			"""CREATE TABLE IF NOT EXISTS `inline_usage` (
 				id INT AUTO_INCREMENT PRIMARY KEY,
 				user_id BIGINT,
 				chat_id BIGINT,
 				query TEXT,
+				timestamp DATETIME,
+				INDEX idx_chat_timestamp (chat_id, timestamp)
+			);""",
+			"""CREATE TABLE IF NOT EXISTS `chat_last_inline` (
+				chat_id BIGINT PRIMARY KEY,
+				user_id BIGINT,
+				query TEXT,
 				timestamp DATETIME
 			);""",
+			"""CREATE TABLE IF NOT EXISTS `addresses` (
+				user_id BIGINT NOT NULL,
+				address_id VARCHAR(36) NOT NULL,
+				name VARCHAR(255),
+				address TEXT,
+				city VARCHAR(255),
+				is_default BOOLEAN NOT NULL DEFAULT FALSE,
+				created_at DATETIME(6) DEFAULT CURRENT_TIMESTAMP(6),
+				PRIMARY KEY (user_id, address_id)
+			);""",
 			"""CREATE TABLE IF NOT EXISTS `user_settings` (
 				id BIGINT AUTO_INCREMENT PRIMARY KEY,
 				user_id BIGINT NOT NULL,
@@ -184,10 +251,14 @@ class Database:
 				details JSON,
 				timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
 			);""",
-			"""CREATE EVENT IF NOT EXISTS `clean_transliteration_cache`
-			ON SCHEDULE EVERY 1 HOUR
-			DO
-			DELETE FROM `transliteration_cache` WHERE created_at < UNIX_TIMESTAMP() - 3600;"""
+			"""CREATE TABLE IF NOT EXISTS `bot_persistence` (
+				kind VARCHAR(64) NOT NULL,
+				record_key VARCHAR(191) NOT NULL,
+				data LONGBLOB NOT NULL,
+				version BIGINT NOT NULL,
+				updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+				PRIMARY KEY (kind, record_key)
+			);"""
 		]
 		for query in queries:
 			try:
@@ -201,62 +272,235 @@ class Database:
 				if cursor:
 					cursor.close()
 				raise
+		if not Database._indexes_checked:
+			self.ensure_indexes()
+		Database._schema_checked = True
 
-	def get_users_paginated(self, page: int, per_page: int, search: str = "") -> tuple:
+	def ensure_indexes(self):
+		"""Add secondary indexes missing from tables created by older versions."""
+		cursor = self.conn.cursor(dictionary=True)
 		try:
-			offset = (page - 1) * per_page
-			if search == "":
-				users, total = self.get_users()
-			else:
-				query = """
-				SELECT user_id, username, is_admin, is_beta_tester, is_blacklisted, is_teskilat, credits, balance, created_at, last_interaction, chat_id
-				FROM `users`
-				WHERE username LIKE %s
-				ORDER BY user_id
-				LIMIT %s OFFSET %s
-				"""
-				self.cursor.execute(query, (f"%{search}%", per_page, offset))
-				users = self.cursor.fetchall()
-				count_query = "SELECT COUNT(*) as total FROM `users` WHERE username LIKE %s"
-				self.cursor.execute(count_query, (f"%{search}%",))
-				total = self.cursor.fetchone()['total']
+			for table, index_name, ddl in SCHEMA_INDEXES:
+				cursor.execute(
+					"SELECT 1 FROM information_schema.STATISTICS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s LIMIT 1",
+					(table, index_name)
+				)
+				if cursor.fetchall():
+					Database._indexes_present.add(index_name)
+					continue
+				try:
+					cursor.execute(ddl)
+					self.conn.commit()
+					Database._indexes_present.add(index_name)
+					logger.info(f"Added index {index_name} on {table}")
+				except mysql.connector.Error as e:
+					logger.error(f"Could not add index {index_name} on {table}: {str(e)}")
+			Database._indexes_checked = True
+		finally:
+			cursor.close()
+
+	def _cached_count(self, table: str, where: str = "", params: tuple = ()) -> int:
+		"""Row count for a table and filter, cached for COUNT_CACHE_TTL seconds."""
+		key = (table, where, params)
+		now = time.monotonic()
+		with Database._count_lock:
+			cached = Database._count_cache.get(key)
+			if cached and cached[0] > now:
+				Database._count_cache.move_to_end(key)
+				metrics.cache_requests.inc("db_count", "hit")
+				return cached[1]
+		metrics.cache_requests.inc("db_count", "miss")
+		total = None
+		if not where:
+			self.cursor.execute(
+				"SELECT TABLE_ROWS as total FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+				(table,)
+			)
+			row = self.cursor.fetchone()
+			if row and row['total'] and row['total'] > EXACT_COUNT_LIMIT:
+				total = row['total']
+		if total is None:
+			self.cursor.execute(f"SELECT COUNT(*) as total FROM `{table}` {where}", params)
+			total = self.cursor.fetchone()['total']
+		with Database._count_lock:
+			cache = Database._count_cache
+			cache[key] = (now + COUNT_CACHE_TTL, total)
+			cache.move_to_end(key)
+			for stale in [stale for stale, (expires, _) in cache.items() if expires <= now]:
+				del cache[stale]
+			while len(cache) > COUNT_CACHE_SIZE:
+				cache.popitem(last=False)
+		return total
+
+	def invalidate_counts(self, table: str = None):
+		"""Drop cached totals for one table, or for all tables."""
+		with Database._count_lock:
+			for key in list(Database._count_cache):
+				if table is None or key[0] == table:
+					Database._count_cache.pop(key, None)
+
+	@staticmethod
+	def _like_prefix(search: str) -> str:
+		"""Escape LIKE wildcards so the search only ever anchors at the start of the column."""
+		return search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+	def _user_search_clause(self, search: str) -> tuple:
+		search = search.strip().lstrip("@")
+		if not search:
+			return "", ()
+		if search.lstrip("-").isdigit():
+			return "WHERE (user_id = %s OR username LIKE %s)", (int(search), self._like_prefix(search))
+		return "WHERE username LIKE %s", (self._like_prefix(search),)
+
+	def _group_search_clause(self, search: str) -> tuple:
+		search = search.strip()
+		if not search:
+			return "", ()
+		if search.lstrip("-").isdigit():
+			return "WHERE (group_id = %s OR group_name LIKE %s)", (int(search), self._like_prefix(search))
+		terms = [
+			term for term in search.translate(FULLTEXT_OPERATORS).split()
+			if len(term) >= FULLTEXT_MIN_TOKEN and term.lower() not in FULLTEXT_STOPWORDS
+		]
+		if terms and "idx_group_name_ft" in Database._indexes_present:
+			# Every word must match as a word prefix; served by the FULLTEXT index
+			return "WHERE MATCH(group_name) AGAINST (%s IN BOOLEAN MODE)", (" ".join(f"+{term}*" for term in terms),)
+		return "WHERE group_name LIKE %s", (self._like_prefix(search),)
+
+	def _seek_anchor(self, table: str, key: str, where: str, params: tuple, offset: int):
+		"""Key of the last row before offset, walked on the primary key index only."""
+		if offset <= 0:
+			return None
+		self.cursor.execute(
+			f"SELECT {key} FROM `{table}` {where} ORDER BY {key} LIMIT 1 OFFSET %s",
+			params + (offset - 1,)
+		)
+		row = self.cursor.fetchone()
+		return row[key] if row else False
+
+	def _keyset_page(self, table: str, key: str, columns: str, where: str, params: tuple,
+					 page: int, per_page: int, after_id: int = None) -> list:
+		if after_id is None:
+			after_id = self._seek_anchor(table, key, where, params, (page - 1) * per_page)
+			if after_id is False:
+				return []
+		if after_id is not None:
+			where = f"{where} AND {key} > %s" if where else f"WHERE {key} > %s"
+			params = params + (after_id,)
+		self.cursor.execute(
+			f"SELECT {columns} FROM `{table}` {where} ORDER BY {key} LIMIT %s",
+			params + (per_page,)
+		)
+		return self.cursor.fetchall()
+
+	def get_users_paginated(self, page: int, per_page: int, search: str = "", after_id: int = None) -> tuple:
+		"""Page through users ordered by user_id; after_id seeks straight past the previous page"""
+		try:
+			where, params = self._user_search_clause(search)
+			users = self._keyset_page(
+				"users", "user_id",
+				"user_id, username, is_admin, is_beta_tester, is_blacklisted, is_teskilat, credits, balance, created_at, last_interaction, chat_id",
+				where, params, page, per_page, after_id
+			)
+			total = self._cached_count("users", where, params)
 			total_pages = (total + per_page - 1) // per_page
 			return users, total_pages
 		finally:
 			self.cursor.close()
 			self.cursor = self.conn.cursor(dictionary=True)
 
-	def get_groups_paginated(self, page: int, per_page: int, search: str = "") -> tuple:
+	def get_groups_paginated(self, page: int, per_page: int, search: str = "", after_id: int = None) -> tuple:
+		"""Page through groups ordered by group_id, with the last inline usage of each group on the page"""
 		try:
-			offset = (page - 1) * per_page
-			if search == "":
-				groups, total = self.get_groups()
-			else:
-				query = """
-				SELECT g.*, u.username as last_inline_username, iu.query as last_inline_query, iu.timestamp as last_inline_timestamp
-				FROM `groups` g
-				LEFT JOIN (
-					SELECT chat_id, MAX(timestamp) as max_timestamp
-					FROM `inline_usage`
-					GROUP BY chat_id
-				) latest ON g.group_id = latest.chat_id
-				LEFT JOIN `inline_usage` iu ON latest.chat_id = iu.chat_id AND latest.max_timestamp = iu.timestamp
-				LEFT JOIN `users` u ON iu.user_id = u.user_id
-				WHERE g.group_name LIKE %s
-				ORDER BY g.group_id
-				LIMIT %s OFFSET %s
-				"""
-				self.cursor.execute(query, (f"%{search}%", per_page, offset))
-				groups = self.cursor.fetchall()
-				count_query = "SELECT COUNT(*) as total FROM `groups` WHERE group_name LIKE %s"
-				self.cursor.execute(count_query, (f"%{search}%",))
-				total = self.cursor.fetchone()['total']
+			where, params = self._group_search_clause(search)
+			groups = self._keyset_page("groups", "group_id", "*", where, params, page, per_page, after_id)
+			self._attach_last_inline(groups)
+			total = self._cached_count("groups", where, params)
 			total_pages = (total + per_page - 1) // per_page
 			return groups, total_pages
 		finally:
 			self.cursor.close()
 			self.cursor = self.conn.cursor(dictionary=True)
 
+	def _attach_last_inline(self, groups: list):
+		"""Fill last_inline_* for the given groups from chat_last_inline."""
+		for group in groups:
+			group.update(last_inline_username=None, last_inline_query=None, last_inline_timestamp=None)
+		if not groups:
+			return
+		by_id = {group['group_id']: group for group in groups}
+		placeholders = ", ".join(["%s"] * len(by_id))
+		query = f"""
+		SELECT cli.chat_id, u.username as last_inline_username, cli.query as last_inline_query, cli.timestamp as last_inline_timestamp
+		FROM `chat_last_inline` cli
+		LEFT JOIN `users` u ON cli.user_id = u.user_id
+		WHERE cli.chat_id IN ({placeholders})
+		"""
+		self.cursor.execute(query, tuple(by_id))
+		for row in self.cursor.fetchall():
+			by_id[row.pop('chat_id')].update(row)
+
+	def log_inline_usage(self, user_id: int, chat_id: int, query: str):
+		"""Append to inline_usage and keep chat_last_inline current in the same transaction"""
+		try:
+			now = datetime.now()
+			self.cursor.execute(
+				"INSERT INTO `inline_usage` (user_id, chat_id, query, timestamp) VALUES (%s, %s, %s, %s)",
+				(user_id, chat_id, query, now)
+			)
+			self.cursor.execute(
+				"INSERT INTO `chat_last_inline` (chat_id, user_id, query, timestamp) VALUES (%s, %s, %s, %s)" + CHAT_LAST_INLINE_UPSERT,
+				(chat_id, user_id, query, now)
+			)
+			self.conn.commit()
+		except mysql.connector.Error as e:
+			self.conn.rollback()
+			logger.error(f"Error logging inline usage: {str(e)}")
+		finally:
+			self.cursor.close()
+			self.cursor = self.conn.cursor(dictionary=True)
+
+	def log_inline_usages(self, rows: list) -> int:
+		"""Batch-append (user_id, chat_id, query, timestamp) rows to inline_usage; chat_last_inline is not touched"""
+		if not rows:
+			return 0
+		try:
+			self.cursor.executemany(
+				"INSERT INTO `inline_usage` (user_id, chat_id, query, timestamp) VALUES (%s, %s, %s, %s)",
+				rows
+			)
+			self.conn.commit()
+			return len(rows)
+		except mysql.connector.Error as e:
+			self.conn.rollback()
+			logger.error(f"Error logging inline usages: {str(e)}")
+			return 0
+		finally:
+			self.cursor.close()
+			self.cursor = self.conn.cursor(dictionary=True)
+
+	def backfill_chat_last_inline(self) -> int:
+		"""Rebuild chat_last_inline from the inline_usage log; returns affected rows"""
+		try:
+			query = """
+			INSERT INTO `chat_last_inline` (chat_id, user_id, query, timestamp)
+			SELECT iu.chat_id, iu.user_id, iu.query, iu.timestamp
+			FROM (
+				SELECT chat_id, MAX(timestamp) as max_timestamp
+				FROM `inline_usage`
+				WHERE chat_id IS NOT NULL
+				GROUP BY chat_id
+			) latest
+			JOIN `inline_usage` iu ON latest.chat_id = iu.chat_id AND latest.max_timestamp = iu.timestamp
+			ORDER BY iu.id
+			""" + CHAT_LAST_INLINE_UPSERT
+			self.cursor.execute(query)
+			self.conn.commit()
+			return self.cursor.rowcount
+		finally:
+			self.cursor.close()
+			self.cursor = self.conn.cursor(dictionary=True)
+
 	def set_teskilat(self, user_id: int, status: bool = True) -> bool:
 		try:
 			query = "UPDATE `users` SET is_teskilat = %s WHERE user_id = %s"
@@ -479,6 +723,7 @@ class Database:
 			"""
 			self.cursor.execute(query, (user_id, chat_id, username, first_name, last_name, language_code, is_beta_tester, user_credits, 0.0, datetime.now(), datetime.now()))
 			self.conn.commit()
+			self.invalidate_counts("users")
 		finally:
 			self.cursor.close()
 			self.cursor = self.conn.cursor(dictionary=True)
@@ -516,21 +761,107 @@ class Database:
 		VALUES (%s, %s, %s, %s, %s, %s)
 		ON DUPLICATE KEY UPDATE count = count + 1, last_used = %s, last_user_id = %s
 		"""
+		totals_query = """
+		INSERT INTO command_usage_totals (command, total_count, last_used, last_user_id, chat_id)
+		VALUES (%s, 1, %s, %s, %s)
+		ON DUPLICATE KEY UPDATE total_count = total_count + 1, last_used = VALUES(last_used),
+			last_user_id = VALUES(last_user_id), chat_id = VALUES(chat_id)
+		"""
+		buckets_query = """
+		INSERT INTO command_usage_buckets (granularity, bucket_start, command, count)
+		VALUES ('hour', %s, %s, 1), ('day', %s, %s, 1)
+		ON DUPLICATE KEY UPDATE count = count + 1
+		"""
 		try:
 			now = datetime.now()
+			hour = now.replace(minute=0, second=0, microsecond=0)
+			day = hour.replace(hour=0)
+			# Raw row, rollup and chart buckets move together or not at all
 			self.cursor.execute(query, (user_id, chat_id, now, user_id, command, 1, now, user_id))
+			self.cursor.execute(totals_query, (command, now, user_id, chat_id))
+			self.cursor.execute(buckets_query, (hour, command, day, command))
 			self.conn.commit()
 		except mysql.connector.Error as err:
+			self.conn.rollback()
 			logging.error(f"Error incrementing command usage: {err}")
 		finally:
 			self.cursor.close()
 			self.cursor = self.conn.cursor(dictionary=True)
 
 	def get_command_usage(self):
+		rows = self._fetch_command_usage()
+		if not rows and not Database._totals_seeded:
+			Database._totals_seeded = True
+			try:
+				if self.rebuild_command_usage_totals():
+					rows = self._fetch_command_usage()
+			except mysql.connector.Error as e:
+				logger.error(f"Error seeding command usage totals: {str(e)}")
+		return rows
+
+	def _fetch_command_usage(self) -> list:
+		try:
+			query = """
+			SELECT t.command, t.total_count, t.last_used, t.last_user_id, t.chat_id,
+				u.username as last_username, g.group_name
+			FROM `command_usage_totals` t
+			LEFT JOIN `users` u ON t.last_user_id = u.user_id
+			LEFT JOIN `groups` g ON t.chat_id = g.group_id
+			ORDER BY t.total_count DESC
+			"""
+			self.cursor.execute(query)
+			return [
+				{
+					'command': row['command'],
+					'count': row['total_count'],
+					'chat_id': row['chat_id'],
+					'last_user_id': row['last_user_id'],
+					'last_used': row['last_used'],
+					'last_username': row['last_username'],
+					'group_name': row['group_name']
+				}
+				for row in self.cursor.fetchall()
+			]
+		finally:
+			self.cursor.close()
+			self.cursor = self.conn.cursor(dictionary=True)
+
+	def get_command_usage_series(self, granularity: str = "day", since: datetime = None, command: str = None) -> list:
+		"""Bucketed usage counts for charts, oldest bucket first"""
+		if granularity not in ("hour", "day"):
+			raise ValueError("granularity must be 'hour' or 'day'")
+		try:
+			conditions = ["granularity = %s"]
+			params = [granularity]
+			if since:
+				conditions.append("bucket_start >= %s")
+				params.append(since)
+			if command:
+				conditions.append("command = %s")
+				params.append(command)
+			query = f"""
+			SELECT bucket_start, command, count
+			FROM `command_usage_buckets`
+			WHERE {' AND '.join(conditions)}
+			ORDER BY bucket_start, command
+			"""
+			self.cursor.execute(query, tuple(params))
+			return self.cursor.fetchall()
+		finally:
+			self.cursor.close()
+			self.cursor = self.conn.cursor(dictionary=True)
+
+	def rebuild_command_usage_totals(self) -> int:
+		"""Seed command_usage_totals from the per-user command_usage rows; returns affected rows"""
 		try:
 			query = """
-			SELECT cu.command, SUM(cu.count) as total_count, latest.last_used, latest.last_user_id, latest.chat_id
-			FROM `command_usage` cu
+			INSERT INTO `command_usage_totals` (command, total_count, last_used, last_user_id, chat_id)
+			SELECT cu.command, cu.total_count, latest.last_used, latest.last_user_id, latest.chat_id
+			FROM (
+				SELECT command, SUM(count) as total_count
+				FROM `command_usage`
+				GROUP BY command
+			) cu
 			LEFT JOIN (
 				SELECT
 					command,
@@ -540,20 +871,52 @@ class Database:
 					ROW_NUMBER() OVER (PARTITION BY command ORDER BY last_used DESC) as rn
 				FROM `command_usage`
 			) latest ON cu.command = latest.command AND latest.rn = 1
-			GROUP BY cu.command, latest.last_user_id, latest.last_used, latest.chat_id
-			ORDER BY total_count DESC
+			ON DUPLICATE KEY UPDATE
+				command_usage_totals.total_count = GREATEST(command_usage_totals.total_count, VALUES(total_count)),
+				command_usage_totals.last_user_id = IF(
+					command_usage_totals.last_used IS NULL OR VALUES(last_used) > command_usage_totals.last_used,
+					VALUES(last_user_id), command_usage_totals.last_user_id
+				),
+				command_usage_totals.chat_id = IF(
+					command_usage_totals.last_used IS NULL OR VALUES(last_used) > command_usage_totals.last_used,
+					VALUES(chat_id), command_usage_totals.chat_id
+				),
+				command_usage_totals.last_used = GREATEST(
+					COALESCE(command_usage_totals.last_used, VALUES(last_used)),
+					COALESCE(VALUES(last_used), command_usage_totals.last_used)
+				)
 			"""
 			self.cursor.execute(query)
-			return [
-				{
-					'command': row['command'],
-					'count': row['total_count'],
-					'chat_id': row['chat_id'],
-					'last_user_id': row['last_user_id'],
-					'last_used': row['last_used']
-				}
-				for row in self.cursor.fetchall()
+			self.conn.commit()
+			return self.cursor.rowcount
+		finally:
+			self.cursor.close()
+			self.cursor = self.conn.cursor(dictionary=True)
+
+	def compact_command_usage(self, raw_days: int = 180, hourly_days: int = 14, daily_days: int = 730,
+							  batch_size: int = 10000) -> dict:
+		"""Drop stale raw rows and expired buckets in small batches; totals keep the counts"""
+		deleted = {"raw": 0, "hour": 0, "day": 0}
+		try:
+			self.cursor.execute("SELECT COUNT(*) as total FROM `command_usage_totals`")
+			has_totals = self.cursor.fetchone()['total'] > 0
+			now = datetime.now()
+			statements = [
+				("hour", "DELETE FROM `command_usage_buckets` WHERE granularity = 'hour' AND bucket_start < %s LIMIT %s", now - timedelta(days=hourly_days)),
+				("day", "DELETE FROM `command_usage_buckets` WHERE granularity = 'day' AND bucket_start < %s LIMIT %s", now - timedelta(days=daily_days))
 			]
+			if has_totals:
+				statements.insert(0, ("raw", "DELETE FROM `command_usage` WHERE last_used < %s LIMIT %s", now - timedelta(days=raw_days)))
+			else:
+				logger.warning("command_usage_totals is empty; run rebuild-command-totals before compacting raw rows")
+			for name, query, cutoff in statements:
+				while True:
+					self.cursor.execute(query, (cutoff, batch_size))
+					self.conn.commit()
+					deleted[name] += self.cursor.rowcount
+					if self.cursor.rowcount < batch_size:
+						break
+			return deleted
 		finally:
 			self.cursor.close()
 			self.cursor = self.conn.cursor(dictionary=True)
@@ -603,6 +966,7 @@ class Database:
 			"""
 			self.cursor.execute(query, (group_id, group_name, added_at, group_name))
 			self.conn.commit()
+			self.invalidate_counts("groups")
 		finally:
 			self.cursor.close()
 			self.cursor = self.conn.cursor(dictionary=True)
@@ -624,15 +988,10 @@ class Database:
 	def get_groups(self):
 		try:
 			query = """
-			SELECT g.*, u.username as last_inline_username, iu.query as last_inline_query, iu.timestamp as last_inline_timestamp
+			SELECT g.*, u.username as last_inline_username, cli.query as last_inline_query, cli.timestamp as last_inline_timestamp
 			FROM `groups` g
-			LEFT JOIN (
-				SELECT chat_id, MAX(timestamp) as max_timestamp
-				FROM `inline_usage`
-				GROUP BY chat_id
-			) latest ON g.group_id = latest.chat_id
-			LEFT JOIN `inline_usage` iu ON latest.chat_id = iu.chat_id AND latest.max_timestamp = iu.timestamp
-			LEFT JOIN `users` u ON iu.user_id = u.user_id
+			LEFT JOIN `chat_last_inline` cli ON g.group_id = cli.chat_id
+			LEFT JOIN `users` u ON cli.user_id = u.user_id
 			"""
 			self.cursor.execute(query)
 			groups = self.cursor.fetchall()
@@ -646,54 +1005,63 @@ class Database:
 
 	# ==================== USER ADDRESS MANAGEMENT ====================
 
+	@staticmethod
+	def _address_row(row: dict) -> dict:
+		return {
+			'id': row['address_id'],
+			'name': row['name'],
+			'address': row['address'],
+			'city': row['city'],
+			'is_default': bool(row['is_default'])
+		}
+
 	def get_user_addresses(self, user_id: int) -> list:
 		"""Get all addresses for a user"""
 		try:
-			query = "SELECT addresses FROM `users` WHERE user_id = %s"
+			query = """
+			SELECT address_id, name, address, city, is_default
+			FROM `addresses`
+			WHERE user_id = %s
+			ORDER BY created_at, address_id
+			"""
 			self.cursor.execute(query, (user_id,))
-			result = self.cursor.fetchone()
-			if not result or not result['addresses']:
-				return []
-			try:
-				addresses = json.loads(result['addresses'])
-				return addresses if isinstance(addresses, list) else []
-			except json.JSONDecodeError:
-				logger.error(f"Error decoding addresses JSON for user {user_id}")
-				return []
+			return [self._address_row(row) for row in self.cursor.fetchall()]
 		finally:
 			self.cursor.close()
 			self.cursor = self.conn.cursor(dictionary=True)
 
 	def get_address_by_id(self, user_id: int, address_id: str) -> dict:
 		"""Get a specific address by ID for a user"""
-		addresses = self.get_user_addresses(user_id)
-		for address in addresses:
-			if address.get('id') == address_id:
-				return address
-		return None
+		try:
+			query = """
+			SELECT address_id, name, address, city, is_default
+			FROM `addresses`
+			WHERE user_id = %s AND address_id = %s
+			"""
+			self.cursor.execute(query, (user_id, address_id))
+			row = self.cursor.fetchone()
+			return self._address_row(row) if row else None
+		finally:
+			self.cursor.close()
+			self.cursor = self.conn.cursor(dictionary=True)
 
 	def save_user_address(self, user_id: int, name: str, address: str, city: str, is_default: bool = False) -> str:
 		"""Save a new address for a user"""
-		addresses = self.get_user_addresses(user_id)
 		address_id = str(uuid.uuid4())
-		new_address = {
-			'id': address_id,
-			'name': name,
-			'address': address,
-			'city': city,
-			'is_default': is_default
-		}
-		if is_default or not addresses:
-			for addr in addresses:
-				addr['is_default'] = False
-			if not addresses:
-				new_address['is_default'] = True
-		addresses.append(new_address)
-		try:
-			query = "UPDATE `users` SET addresses = %s WHERE user_id = %s"
-			self.cursor.execute(query, (json.dumps(addresses), user_id))
+		try:
+			if is_default:
+				self.cursor.execute("UPDATE `addresses` SET is_default = FALSE WHERE user_id = %s", (user_id,))
+			# The first address a user saves becomes the default
+			query = """
+			INSERT INTO `addresses` (user_id, address_id, name, address, city, is_default)
+			SELECT %s, %s, %s, %s, %s, %s OR NOT EXISTS (SELECT 1 FROM `addresses` WHERE user_id = %s)
+			"""
+			self.cursor.execute(query, (user_id, address_id, name, address, city, bool(is_default), user_id))
 			self.conn.commit()
 			return address_id
+		except mysql.connector.Error:
+			self.conn.rollback()
+			raise
 		finally:
 			self.cursor.close()
 			self.cursor = self.conn.cursor(dictionary=True)
@@ -701,42 +1069,121 @@ class Database:
 	def update_user_address(self, user_id: int, address_id: str, name: str = None, address: str = None,
 							 city: str = None, is_default: bool = None) -> bool:
 		"""Update an existing address for a user"""
-		addresses = self.get_user_addresses(user_id)
-		updated = False
-		for i, addr in enumerate(addresses):
-			if addr.get('id') == address_id:
-				if name is not None:
-					addresses[i]['name'] = name
-				if address is not None:
-					addresses[i]['address'] = address
-				if city is not None:
-					addresses[i]['city'] = city
-				if is_default:
-					for j, other_addr in enumerate(addresses):
-						addresses[j]['is_default'] = (j == i)
-				updated = True
-				break
-		if updated:
-			try:
-				query = "UPDATE `users` SET addresses = %s WHERE user_id = %s"
-				self.cursor.execute(query, (json.dumps(addresses), user_id))
-				self.conn.commit()
-			finally:
-				self.cursor.close()
-				self.cursor = self.conn.cursor(dictionary=True)
-		return updated
+		updates = []
+		params = []
+		for column, value in (('name', name), ('address', address), ('city', city)):
+			if value is not None:
+				updates.append(f"{column} = %s")
+				params.append(value)
+		try:
+			if not self._address_exists(user_id, address_id):
+				return False
+			if updates:
+				query = f"UPDATE `addresses` SET {', '.join(updates)} WHERE user_id = %s AND address_id = %s"
+				self.cursor.execute(query, params + [user_id, address_id])
+			if is_default:
+				# Moving the default flag touches only this user's rows, in the same transaction
+				self.cursor.execute(
+					"UPDATE `addresses` SET is_default = (address_id = %s) WHERE user_id = %s",
+					(address_id, user_id)
+				)
+			self.conn.commit()
+			return True
+		except mysql.connector.Error:
+			self.conn.rollback()
+			raise
+		finally:
+			self.cursor.close()
+			self.cursor = self.conn.cursor(dictionary=True)
+
+	def _address_exists(self, user_id: int, address_id: str) -> bool:
+		self.cursor.execute(
+			"SELECT 1 AS found FROM `addresses` WHERE user_id = %s AND address_id = %s",
+			(user_id, address_id)
+		)
+		return self.cursor.fetchone() is not None
 
 	def delete_user_address(self, user_id: int, address_id: str) -> bool:
 		"""Delete an address for a user"""
-		addresses = self.get_user_addresses(user_id)
-		addresses = [addr for addr in addresses if addr.get('id') != address_id]
-		if not any(addr.get('is_default') for addr in addresses) and addresses:
-			addresses[0]['is_default'] = True
 		try:
-			query = "UPDATE `users` SET addresses = %s WHERE user_id = %s"
-			self.cursor.execute(query, (json.dumps(addresses), user_id))
+			self.cursor.execute(
+				"DELETE FROM `addresses` WHERE user_id = %s AND address_id = %s",
+				(user_id, address_id)
+			)
+			deleted = self.cursor.rowcount > 0
+			if deleted:
+				self.cursor.execute(
+					"SELECT 1 AS found FROM `addresses` WHERE user_id = %s AND is_default = TRUE LIMIT 1",
+					(user_id,)
+				)
+				if self.cursor.fetchone() is None:
+					# The default was removed; promote the oldest remaining address
+					self.cursor.execute(
+						"UPDATE `addresses` SET is_default = TRUE WHERE user_id = %s ORDER BY created_at, address_id LIMIT 1",
+						(user_id,)
+					)
 			self.conn.commit()
-			return True
+			return deleted
+		except mysql.connector.Error:
+			self.conn.rollback()
+			raise
+		finally:
+			self.cursor.close()
+			self.cursor = self.conn.cursor(dictionary=True)
+
+	def migrate_user_addresses(self, batch_size: int = 1000) -> int:
+		"""Copy users.addresses JSON arrays into the addresses table; returns rows inserted"""
+		query = """
+		INSERT IGNORE INTO `addresses` (user_id, address_id, name, address, city, is_default, created_at)
+		VALUES (%s, %s, %s, %s, %s, %s, %s)
+		"""
+		inserted = 0
+		last_user_id = None
+		try:
+			while True:
+				if last_user_id is None:
+					self.cursor.execute(
+						"SELECT user_id, addresses FROM `users` WHERE addresses IS NOT NULL ORDER BY user_id LIMIT %s",
+						(batch_size,)
+					)
+				else:
+					self.cursor.execute(
+						"SELECT user_id, addresses FROM `users` WHERE addresses IS NOT NULL AND user_id > %s ORDER BY user_id LIMIT %s",
+						(last_user_id, batch_size)
+					)
+				users = self.cursor.fetchall()
+				if not users:
+					break
+				rows = []
+				base_time = datetime.now()
+				for user in users:
+					try:
+						addresses = json.loads(user['addresses'])
+					except (TypeError, json.JSONDecodeError):
+						logger.error(f"Error decoding addresses JSON for user {user['user_id']}")
+						continue
+					if not isinstance(addresses, list):
+						continue
+					addresses = [addr for addr in addresses if isinstance(addr, dict) and addr.get('id')]
+					default_id = next((addr['id'] for addr in addresses if addr.get('is_default')), None)
+					if default_id is None and addresses:
+						default_id = addresses[0]['id']
+					for position, addr in enumerate(addresses):
+						rows.append((
+							user['user_id'], str(addr['id']), addr.get('name'), addr.get('address'), addr.get('city'),
+							addr['id'] == default_id,
+							# Keep the original list order, which the bot shows to the user
+							base_time + timedelta(microseconds=position)
+						))
+				if rows:
+					self.cursor.executemany(query, rows)
+					inserted += self.cursor.rowcount
+				self.conn.commit()
+				last_user_id = users[-1]['user_id']
+			return inserted
+		except mysql.connector.Error:
+			self.conn.rollback()
+			raise
 		finally:
 			self.cursor.close()
 			self.cursor = self.conn.cursor(dictionary=True)
@@ -747,14 +1194,47 @@ class Database:
 							active_only: bool = True, limit: int = 100, offset: int = 0,
 							user_id: int = None) -> list:
 		"""Get list of available products matching search criteria"""
+		if search_terms:
+			# Ranked ids come from the in-process index; rows come from the product cache
+			ids = product_search_index.search(search_terms, product_type, active_only, user_id, limit, offset)
+			if not ids:
+				return []
+			by_id = product_cache.get_products(ids, self._fetch_products)
+			# The index of another worker may be older than the rows, so the filters are checked again
+			return [
+				by_id[product_id] for product_id in ids
+				if product_id in by_id and self._product_matches(by_id[product_id], product_type, active_only, user_id)
+			]
+		key = ("list", product_type, bool(active_only), user_id, limit, offset)
+		return product_cache.get_listing(
+			key, lambda: self._fetch_product_listing(product_type, active_only, limit, offset, user_id)
+		)
+
+	@staticmethod
+	def _product_matches(product: dict, product_type: str, active_only: bool, user_id: int) -> bool:
+		if active_only and not product['active']:
+			return False
+		if product_type and product['type'] != product_type:
+			return False
+		if user_id and product['created_by'] != user_id:
+			return False
+		return True
+
+	@staticmethod
+	def _decode_product(product: dict) -> dict:
+		if product and product['features']:
+			try:
+				product['features'] = json.loads(product['features'])
+			except json.JSONDecodeError:
+				product['features'] = []
+		return product
+
+	def _fetch_product_listing(self, product_type: str, active_only: bool, limit: int, offset: int,
+							   user_id: int = None) -> list:
 		params = []
 		conditions = []
 		if active_only:
 			conditions.append("active = TRUE")
-		if search_terms:
-			conditions.append("(name LIKE %s OR description LIKE %s)")
-			search_pattern = f"%{search_terms}%"
-			params.extend([search_pattern, search_pattern])
 		if product_type:
 			conditions.append("type = %s")
 			params.append(product_type)
@@ -774,39 +1254,40 @@ class Database:
 		params.extend([limit, offset])
 		try:
 			self.cursor.execute(query, params)
-			products = self.cursor.fetchall()
-			for product in products:
-				if product['features']:
-					try:
-						product['features'] = json.loads(product['features'])
-					except json.JSONDecodeError:
-						product['features'] = []
-			return products
+			return [self._decode_product(product) for product in self.cursor.fetchall()]
 		finally:
 			self.cursor.close()
 			self.cursor = self.conn.cursor(dictionary=True)
 
-	def get_product_by_id(self, product_id: int) -> dict:
-		"""Get product details by ID"""
-		query = """
+	def _fetch_products(self, product_ids: list) -> dict:
+		query = f"""
 		SELECT id, name, description, price, quantity, type, image_url, features, active,
-				 created_at, updated_at, created_by
+				created_at, updated_at, created_by
 		FROM `products`
-		WHERE id = %s
+		WHERE id IN ({", ".join(["%s"] * len(product_ids))})
 		"""
 		try:
-			self.cursor.execute(query, (product_id,))
-			product = self.cursor.fetchone()
-			if product and product['features']:
-				try:
-					product['features'] = json.loads(product['features'])
-				except json.JSONDecodeError:
-					product['features'] = []
-			return product
+			self.cursor.execute(query, tuple(product_ids))
+			return {product['id']: self._decode_product(product) for product in self.cursor.fetchall()}
+		finally:
+			self.cursor.close()
+			self.cursor = self.conn.cursor(dictionary=True)
+
+	def get_product_search_rows(self) -> list:
+		"""Columns the product search index is built from"""
+		try:
+			self.cursor.execute("SELECT id, name, description, type, active, created_by FROM `products`")
+			return self.cursor.fetchall()
 		finally:
 			self.cursor.close()
 			self.cursor = self.conn.cursor(dictionary=True)
 
+	def get_product_by_id(self, product_id: int, *, fresh: bool = False) -> dict:
+		"""Get product details by ID; purchases pass fresh=True, since other workers' changes reach the cache late"""
+		if fresh:
+			return self._fetch_products([product_id]).get(product_id)
+		return product_cache.get_product(product_id, lambda: self._fetch_products([product_id]).get(product_id))
+
 	def create_product(self, name: str, price: float, product_type: str, description: str = None,
 						quantity: int = None, image_url: str = None, features: list = None,
 						active: bool = True, created_by: int = None) -> int:
@@ -822,6 +1303,7 @@ class Database:
 				image_url, features_json, active, created_by
 			))
 			self.conn.commit()
+			product_cache.bump()
 			return self.cursor.lastrowid
 		finally:
 			self.cursor.close()
@@ -868,6 +1350,7 @@ class Database:
 		try:
 			self.cursor.execute(query, params)
 			self.conn.commit()
+			product_cache.bump()
 			return self.cursor.rowcount > 0
 		finally:
 			self.cursor.close()
@@ -879,6 +1362,19 @@ class Database:
 		try:
 			self.cursor.execute(query, (new_quantity, product_id))
 			self.conn.commit()
+			product_cache.bump()
+			return self.cursor.rowcount > 0
+		finally:
+			self.cursor.close()
+			self.cursor = self.conn.cursor(dictionary=True)
+
+	def decrement_product_quantity(self, product_id: int, amount: int) -> bool:
+		"""Take amount off the stock in place, so concurrent purchases on any worker all count"""
+		query = "UPDATE `products` SET quantity = GREATEST(quantity - %s, 0) WHERE id = %s AND quantity IS NOT NULL"
+		try:
+			self.cursor.execute(query, (amount, product_id))
+			self.conn.commit()
+			product_cache.bump()
 			return self.cursor.rowcount > 0
 		finally:
 			self.cursor.close()
@@ -890,6 +1386,7 @@ class Database:
 		try:
 			self.cursor.execute(query, (product_id,))
 			self.conn.commit()
+			product_cache.bump()
 			return self.cursor.rowcount > 0
 		finally:
 			self.cursor.close()
@@ -901,6 +1398,7 @@ class Database:
 		try:
 			self.cursor.execute(query, (product_id,))
 			self.conn.commit()
+			product_cache.bump()
 			return self.cursor.rowcount > 0
 		finally:
 			self.cursor.close()
@@ -1413,6 +1911,66 @@ class Database:
 			self.cursor.close()
 			self.cursor = self.conn.cursor(dictionary=True)
 
+	def get_persistence_records(self, kind: str) -> list:
+		"""All persisted records of one kind (user_data, chat_data, conversation:<name>, ...)"""
+		try:
+			self.cursor.execute(
+				"SELECT record_key, version, data FROM `bot_persistence` WHERE kind = %s",
+				(kind,)
+			)
+			return self.cursor.fetchall()
+		finally:
+			self.cursor.close()
+			# End the read's REPEATABLE READ snapshot, or later reads on this long-lived
+			# connection would not see other workers' writes
+			self.conn.rollback()
+			self.cursor = self.conn.cursor(dictionary=True)
+
+	def get_changed_persistence_records(self, known: list) -> list:
+		"""Records whose version differs from the known one; known is [(kind, record_key, version or None)]"""
+		if not known:
+			return []
+		try:
+			conditions = " OR ".join(["(kind = %s AND record_key = %s AND NOT version <=> %s)"] * len(known))
+			params = tuple(value for record in known for value in record)
+			self.cursor.execute(
+				f"SELECT kind, record_key, version, data FROM `bot_persistence` WHERE {conditions}",
+				params
+			)
+			return self.cursor.fetchall()
+		finally:
+			self.cursor.close()
+			# End the read's REPEATABLE READ snapshot, or later reads on this long-lived
+			# connection would not see other workers' writes
+			self.conn.rollback()
+			self.cursor = self.conn.cursor(dictionary=True)
+
+	def save_persistence_records(self, records: list, deleted: list = ()) -> bool:
+		"""Upsert [(kind, record_key, data, version)] and delete [(kind, record_key)] in one transaction"""
+		try:
+			if records:
+				self.cursor.execute(
+					"INSERT INTO `bot_persistence` (kind, record_key, data, version) VALUES "
+					+ ", ".join(["(%s, %s, %s, %s)"] * len(records))
+					+ " ON DUPLICATE KEY UPDATE data = VALUES(data), version = VALUES(version)",
+					tuple(value for record in records for value in record)
+				)
+			if deleted:
+				conditions = " OR ".join(["(kind = %s AND record_key = %s)"] * len(deleted))
+				self.cursor.execute(
+					f"DELETE FROM `bot_persistence` WHERE {conditions}",
+					tuple(value for record in deleted for value in record)
+				)
+			self.conn.commit()
+			return True
+		except mysql.connector.Error as e:
+			self.conn.rollback()
+			logger.error(f"Error saving persistence records: {str(e)}")
+			return False
+		finally:
+			self.cursor.close()
+			self.cursor = self.conn.cursor(dictionary=True)
+
 	def _hash_password(self, password: str) -> str:
 		"""Hash a password (simplified for demonstration)"""
 		return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
@@ -1426,4 +1984,24 @@ class Database:
 				self.conn.close()
 			logger.debug("Database connection closed")
 		except Exception as e:
-			logger.error(f"Error closing database connection: {str(e)}")
\ No newline at end of file
+			logger.error(f"Error closing database connection: {str(e)}")
+
+def _on_config_change(old, new):
+	# A different MySQL server gets its schema checked and counts cached afresh
+	if new.differs(old, *MYSQL_FIELDS):
+		Database._schema_checked = False
+		Database._indexes_checked = False
+		Database._indexes_present = set()
+		Database._totals_seeded = False
+		with Database._count_lock:
+			Database._count_cache.clear()
+	query_stats.configure(new.slow_query_ms, new.query_stats_window)
+
+config_store.subscribe(_on_config_change)
+
+query_stats.configure(config.slow_query_ms, config.query_stats_window)
+
+# Statements, round trips and time per method for the query stats page and the slow-query log
+query_stats.account_methods(Database)
+# Per-method timings for /metrics; leaves the class untouched when metrics are off
+metrics.instrument_methods(Database)
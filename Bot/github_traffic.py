@@ -0,0 +1,193 @@
+import asyncio
+import logging
+import threading
+import time
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_URL = "https://api.github.com"
+REFRESH_INTERVAL = 300
+REQUEST_TIMEOUT = 15
+# Resources refreshed in the background; commits pages are fetched on demand
+RESOURCES = {
+	"repo": "",
+	"traffic": "/traffic/views",
+	"clones": "/traffic/clones",
+	"referrers": "/traffic/popular/referrers",
+	"popular_content": "/traffic/popular/paths",
+	"contributors": "/contributors"
+}
+
+class _Entry:
+	__slots__ = ("etag", "data", "fetched_at")
+
+	def __init__(self, etag, data, fetched_at):
+		self.etag = etag
+		self.data = data
+		self.fetched_at = fetched_at
+
+class GitHubTrafficRefresher:
+	"""
+	Background refresher for the admin dashboard's GitHub traffic panel.
+
+	All resources are fetched concurrently over one pooled aiohttp session
+	running on a private event loop thread. Responses are kept with their
+	ETag and revalidated with If-None-Match, so unchanged data costs a 304
+	(which GitHub does not count against the rate limit). The dashboard is
+	served from the latest snapshot and never waits on the refresh cycle.
+	"""
+
+	def __init__(self, token: str, owner: str, repo: str, base_url: str = DEFAULT_API_URL,
+				 interval: int = REFRESH_INTERVAL, max_commit_pages: int = 32):
+		self.token = token
+		self.owner = owner
+		self.repo = repo
+		self.base_url = (base_url or DEFAULT_API_URL).rstrip("/")
+		self.interval = interval
+		self.max_commit_pages = max_commit_pages
+		self._entries = {}
+		self._commit_keys = []
+		self._lock = threading.Lock()
+		self._loop = None
+		self._thread = None
+		self._session = None
+		self._started = threading.Event()
+		self._refreshed = threading.Event()
+		self._stop = None
+		self.last_refresh = 0.0
+		self.last_error = None
+
+	@property
+	def repo_url(self) -> str:
+		return f"{self.base_url}/repos/{self.owner}/{self.repo}"
+
+	def start(self) -> None:
+		"""Start the refresher thread (idempotent)."""
+		with self._lock:
+			if self._thread is not None:
+				return
+			self._thread = threading.Thread(target=self._run, name="github-traffic", daemon=True)
+			self._thread.start()
+		self._started.wait(5)
+
+	def stop(self) -> None:
+		if self._loop is not None and self._stop is not None:
+			self._loop.call_soon_threadsafe(self._stop.set)
+		if self._thread is not None:
+			self._thread.join(5)
+
+	def _run(self) -> None:
+		self._loop = asyncio.new_event_loop()
+		asyncio.set_event_loop(self._loop)
+		self._stop = asyncio.Event()
+		try:
+			self._loop.run_until_complete(self._main())
+		finally:
+			self._loop.close()
+
+	async def _main(self) -> None:
+		headers = {"Accept": "application/vnd.github.v3+json"}
+		if self.token:
+			headers["Authorization"] = f"token {self.token}"
+		connector = aiohttp.TCPConnector(limit=8, ttl_dns_cache=300)
+		async with aiohttp.ClientSession(
+			headers=headers, connector=connector, timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+		) as session:
+			self._session = session
+			self._started.set()
+			while not self._stop.is_set():
+				await self.refresh()
+				try:
+					await asyncio.wait_for(self._stop.wait(), self.interval)
+				except asyncio.TimeoutError:
+					pass
+		self._session = None
+
+	async def _fetch(self, url: str, params: dict = None):
+		key = (url, tuple(sorted((params or {}).items())))
+		with self._lock:
+			entry = self._entries.get(key)
+		headers = {"If-None-Match": entry.etag} if entry and entry.etag else {}
+		async with self._session.get(url, params=params, headers=headers) as response:
+			if response.status == 304 and entry:
+				entry.fetched_at = time.time()
+				return entry.data
+			data = await response.json(content_type=None)
+			if response.status >= 400:
+				# Keep serving the last good copy; GitHub's error body is only used when there is none
+				if entry:
+					logger.error(f"GitHub API {response.status} for {url}; serving cached data")
+					return entry.data
+				return data
+			with self._lock:
+				self._entries[key] = _Entry(response.headers.get("ETag"), data, time.time())
+			return data
+
+	async def refresh(self) -> None:
+		"""Revalidate every background resource plus the cached commit pages."""
+		jobs = [self._fetch(self.repo_url + path) for path in RESOURCES.values()]
+		with self._lock:
+			commit_keys = list(self._commit_keys)
+		jobs.extend(self._fetch(f"{self.repo_url}/commits", {"per_page": per_page, "page": page}) for per_page, page in commit_keys)
+		results = await asyncio.gather(*jobs, return_exceptions=True)
+		errors = [result for result in results if isinstance(result, Exception)]
+		if errors:
+			self.last_error = str(errors[0])
+			logger.error(f"GitHub traffic refresh failed for {len(errors)} resources: {self.last_error}")
+		else:
+			self.last_error = None
+		self.last_refresh = time.time()
+		self._refreshed.set()
+
+	def _cached(self, url: str, params: dict = None):
+		key = (url, tuple(sorted((params or {}).items())))
+		with self._lock:
+			entry = self._entries.get(key)
+		return entry.data if entry else None
+
+	def _run_coroutine(self, coroutine, timeout: float = REQUEST_TIMEOUT):
+		self.start()
+		return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result(timeout)
+
+	def _commits(self, per_page: int, page: int):
+		params = {"per_page": per_page, "page": page}
+		with self._lock:
+			if (per_page, page) not in self._commit_keys:
+				self._commit_keys.append((per_page, page))
+				# Only the most recently viewed pages stay in the refresh cycle
+				del self._commit_keys[:-self.max_commit_pages]
+		cached = self._cached(f"{self.repo_url}/commits", params)
+		if cached is None:
+			cached = self._run_coroutine(self._fetch(f"{self.repo_url}/commits", params))
+		return cached
+
+	def snapshot(self, per_page: int = 25, page: int = 1) -> dict:
+		"""Dashboard payload built from cached responses; blocks only on a cold cache."""
+		self.start()
+		# A cold cache waits for the refresh that start() kicked off instead of issuing its own
+		self._refreshed.wait(REQUEST_TIMEOUT * 2)
+		data = {name: self._cached(self.repo_url + path) for name, path in RESOURCES.items()}
+		contributors = data.pop("contributors") or []
+		total_commits = sum(contributor.get("contributions", 0) for contributor in contributors if isinstance(contributor, dict))
+		return {
+			**data,
+			"commits": self._commits(per_page, page),
+			"total_commits": total_commits,
+			"total_pages": (total_commits + per_page - 1) // per_page,
+			"fetched_at": self.last_refresh,
+			"refresh_error": self.last_error
+		}
+
+_refreshers = {}
+_refreshers_lock = threading.Lock()
+
+def get_refresher(token: str, owner: str, repo: str, base_url: str = DEFAULT_API_URL) -> GitHubTrafficRefresher:
+	"""Shared refresher per repository and credentials."""
+	key = (token, owner, repo, base_url)
+	with _refreshers_lock:
+		refresher = _refreshers.get(key)
+		if refresher is None:
+			refresher = _refreshers[key] = GitHubTrafficRefresher(token, owner, repo, base_url)
+	refresher.start()
+	return refresher
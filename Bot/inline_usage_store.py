@@ -0,0 +1,117 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+DEFAULT_MAX_ENTRIES = 10000
+# Telegram delivers the sent message within seconds; anything older is not coming
+DEFAULT_TTL = 15 * 60
+FLUSH_BATCH = 200
+FLUSH_INTERVAL = 60
+
+class InlineUsage:
+	__slots__ = ("user_id", "query", "created_at")
+
+	def __init__(self, user_id: int, query: str, created_at: float):
+		self.user_id = user_id
+		self.query = query
+		self.created_at = created_at
+
+	def row(self, chat_id: int = None) -> tuple:
+		"""(user_id, chat_id, query, timestamp) as inline_usage stores it"""
+		return (self.user_id, chat_id, self.query, datetime.fromtimestamp(self.created_at))
+
+class InlineUsageStore:
+	"""
+	Pending inline usages keyed by inline_message_id, waiting for the chat
+	they were sent to.
+
+	Bounded by max_entries (least recently added go first) and by ttl.
+	Entries that expire or are evicted before their chat is known are not
+	dropped: they are queued and handed out in batches by take_flush_batch()
+	so the caller can log them to inline_usage without a chat.
+	"""
+
+	def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: float = DEFAULT_TTL,
+				 flush_batch: int = FLUSH_BATCH, flush_interval: float = FLUSH_INTERVAL):
+		self.max_entries = max_entries
+		self.ttl = ttl
+		self.flush_batch = flush_batch
+		self.flush_interval = flush_interval
+		self._entries = OrderedDict()
+		self._unresolved = []
+		self._last_flush = time.monotonic()
+		self._lock = threading.Lock()
+		self.counters = {"added": 0, "resolved": 0, "misses": 0, "expired": 0, "evicted": 0, "flushed": 0}
+
+	def __len__(self) -> int:
+		return len(self._entries)
+
+	def add(self, inline_message_id: str, user_id: int, query: str) -> None:
+		now = time.time()
+		with self._lock:
+			self._entries.pop(inline_message_id, None)
+			self._entries[inline_message_id] = InlineUsage(user_id, query, now)
+			self.counters["added"] += 1
+			self._expire(now)
+			while len(self._entries) > self.max_entries:
+				_, usage = self._entries.popitem(last=False)
+				self._unresolved.append(usage)
+				self.counters["evicted"] += 1
+
+	def pop(self, inline_message_id: str) -> InlineUsage:
+		"""The pending usage for a message, or None when unknown or expired."""
+		now = time.time()
+		with self._lock:
+			usage = self._entries.pop(inline_message_id, None)
+			if usage is not None and now - usage.created_at > self.ttl:
+				self._unresolved.append(usage)
+				self.counters["expired"] += 1
+				usage = None
+			self.counters["resolved" if usage is not None else "misses"] += 1
+			return usage
+
+	def _expire(self, now: float) -> None:
+		# Entries are kept in insertion order, so expired ones are all at the front
+		while self._entries:
+			inline_message_id, usage = next(iter(self._entries.items()))
+			if now - usage.created_at <= self.ttl:
+				break
+			del self._entries[inline_message_id]
+			self._unresolved.append(usage)
+			self.counters["expired"] += 1
+
+	def take_flush_batch(self, force: bool = False) -> list:
+		"""Rows for usages that never met their chat, once a batch is full or flush_interval passed."""
+		now = time.monotonic()
+		with self._lock:
+			self._expire(time.time())
+			if not self._unresolved:
+				return []
+			if not force and len(self._unresolved) < self.flush_batch and now - self._last_flush < self.flush_interval:
+				return []
+			batch, self._unresolved = self._unresolved, []
+			self._last_flush = now
+			self.counters["flushed"] += len(batch)
+		return [usage.row() for usage in batch]
+
+	def stats(self) -> dict:
+		with self._lock:
+			entries = list(self._entries.items())
+			unresolved = len(self._unresolved)
+			counters = dict(self.counters)
+		entry_bytes = sum(
+			sys.getsizeof(key) + sys.getsizeof(usage) + sys.getsizeof(usage.query) + sys.getsizeof(usage.user_id)
+			for key, usage in entries
+		)
+		return {
+			**counters,
+			"entries": len(entries),
+			"max_entries": self.max_entries,
+			"pending_flush": unresolved,
+			"oldest_age": time.time() - entries[0][1].created_at if entries else 0.0,
+			"approx_bytes": sys.getsizeof(self._entries) + entry_bytes
+		}
+
+inline_usage_store = InlineUsageStore()
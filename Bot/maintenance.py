@@ -0,0 +1,74 @@
+"""
+Database maintenance commands.
+
+Usage:
+	python -m Bot.maintenance backfill-last-inline
+	python -m Bot.maintenance rebuild-command-totals
+	python -m Bot.maintenance compact-command-usage [--raw-days 180] [--hourly-days 14] [--daily-days 730]
+	python -m Bot.maintenance migrate-addresses [--batch-size 1000]
+"""
+import argparse
+import logging
+import os
+import sys
+
+# Allow running as a script from the repository root as well as with -m
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+	sys.path.insert(0, project_root)
+
+from Bot.database import Database
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def backfill_last_inline(args):
+	"""Populate chat_last_inline from the existing inline_usage log."""
+	rows = Database().backfill_chat_last_inline()
+	logger.info(f"chat_last_inline backfilled ({rows} rows affected)")
+
+def rebuild_command_totals(args):
+	"""Seed command_usage_totals from the per-user command_usage rows."""
+	rows = Database().rebuild_command_usage_totals()
+	logger.info(f"command_usage_totals rebuilt ({rows} rows affected)")
+
+def compact_command_usage(args):
+	"""Delete stale per-user usage rows and expired chart buckets."""
+	deleted = Database().compact_command_usage(args.raw_days, args.hourly_days, args.daily_days)
+	logger.info(f"Compacted command usage: {deleted['raw']} raw rows, {deleted['hour']} hourly and {deleted['day']} daily buckets")
+
+def migrate_addresses(args):
+	"""Copy the users.addresses JSON column into the addresses table."""
+	rows = Database().migrate_user_addresses(args.batch_size)
+	logger.info(f"Migrated {rows} addresses")
+
+COMMANDS = {
+	"backfill-last-inline": backfill_last_inline,
+	"rebuild-command-totals": rebuild_command_totals,
+	"compact-command-usage": compact_command_usage,
+	"migrate-addresses": migrate_addresses
+}
+
+def build_parser() -> argparse.ArgumentParser:
+	parser = argparse.ArgumentParser(description="NumberFansBot database maintenance")
+	subparsers = parser.add_subparsers(dest="command", required=True)
+	subparsers.add_parser("backfill-last-inline", help=backfill_last_inline.__doc__)
+	subparsers.add_parser("rebuild-command-totals", help=rebuild_command_totals.__doc__)
+	compact = subparsers.add_parser("compact-command-usage", help=compact_command_usage.__doc__)
+	compact.add_argument("--raw-days", type=int, default=180, help="keep per-user rows used within this many days")
+	compact.add_argument("--hourly-days", type=int, default=14, help="keep hourly buckets this many days")
+	compact.add_argument("--daily-days", type=int, default=730, help="keep daily buckets this many days")
+	migrate = subparsers.add_parser("migrate-addresses", help=migrate_addresses.__doc__)
+	migrate.add_argument("--batch-size", type=int, default=1000, help="users read per batch")
+	return parser
+
+def main(argv=None):
+	args = build_parser().parse_args(argv)
+	try:
+		COMMANDS[args.command](args)
+	except Exception as e:
+		logger.error(f"{args.command} failed: {str(e)}")
+		sys.exit(1)
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,308 @@
+import functools
+import inspect
+import logging
+import threading
+import time
+from Bot.config import config
+from Bot.Helpers.CallbackRouter import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Decided once per process: with metrics off, decorators return the function
+# unchanged and counters are shared no-op objects
+enabled = config.metrics_enabled
+
+HANDLER_KINDS = {
+	"CommandHandler": "command",
+	"CallbackQueryHandler": "callback",
+	"InlineQueryHandler": "inline",
+	"MessageHandler": "message",
+	"PreCheckoutQueryHandler": "pre_checkout",
+	"ChosenInlineResultHandler": "chosen_inline",
+	"ChatMemberHandler": "chat_member"
+}
+
+def _escape(value) -> str:
+	return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: tuple, values: tuple, extra: str = "") -> str:
+	pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+	if extra:
+		pairs.append(extra)
+	return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _number(value) -> str:
+	if value == float("inf"):
+		return "+Inf"
+	return repr(float(value)) if isinstance(value, float) else str(value)
+
+def _histogram_lines(name: str, label_names: tuple, values: tuple, histogram: LatencyHistogram) -> list:
+	lines = []
+	cumulative = 0
+	for bound, count in zip(histogram.bounds, histogram.counts):
+		cumulative += count
+		le = 'le="' + _number(bound) + '"'
+		lines.append(f"{name}_bucket{_labels(label_names, values, le)} {cumulative}")
+	lines.append(f"{name}_sum{_labels(label_names, values)} {_number(histogram.total)}")
+	lines.append(f"{name}_count{_labels(label_names, values)} {histogram.count}")
+	return lines
+
+class Counter:
+	"""Monotonic counter; label values are passed positionally in label order."""
+	kind = "counter"
+
+	def __init__(self, name: str, help: str, labels: tuple = ()):
+		self.name = name
+		self.help = help
+		self.label_names = labels
+		self._values = {}
+		self._lock = threading.Lock()
+
+	def inc(self, *labels, amount: float = 1) -> None:
+		with self._lock:
+			self._values[labels] = self._values.get(labels, 0) + amount
+
+	def samples(self) -> list:
+		with self._lock:
+			values = list(self._values.items())
+		return [f"{self.name}{_labels(self.label_names, labels)} {_number(value)}" for labels, value in values]
+
+class Histogram:
+	"""Latency histogram per label set, on the LATENCY_BUCKETS the routers already use."""
+	kind = "histogram"
+
+	def __init__(self, name: str, help: str, labels: tuple = ()):
+		self.name = name
+		self.help = help
+		self.label_names = labels
+		self._histograms = {}
+
+	def observe(self, seconds: float, *labels) -> None:
+		histogram = self._histograms.get(labels)
+		if histogram is None:
+			histogram = self._histograms.setdefault(labels, LatencyHistogram())
+		histogram.observe(seconds)
+
+	def samples(self) -> list:
+		lines = []
+		for labels, histogram in list(self._histograms.items()):
+			lines.extend(_histogram_lines(self.name, self.label_names, labels, histogram))
+		return lines
+
+class _Callback:
+	"""Values read from an existing stats source at scrape time, so the hot path pays nothing."""
+
+	def __init__(self, name: str, kind: str, help: str, read, labels: tuple = ()):
+		self.name = name
+		self.kind = kind
+		self.help = help
+		self.label_names = labels
+		self.read = read
+
+	def samples(self) -> list:
+		value = self.read()
+		values = value if isinstance(value, dict) else {(): value}
+		lines = []
+		for labels, value in values.items():
+			if isinstance(value, LatencyHistogram):
+				lines.extend(_histogram_lines(self.name, self.label_names, labels, value))
+			else:
+				lines.append(f"{self.name}{_labels(self.label_names, labels)} {_number(value)}")
+		return lines
+
+class _Noop:
+	"""Stands in for every metric when metrics are disabled."""
+	kind = None
+
+	def inc(self, *labels, amount: float = 1) -> None:
+		pass
+
+	def observe(self, seconds: float, *labels) -> None:
+		pass
+
+NOOP = _Noop()
+
+class MetricsRegistry:
+	"""
+	Process-wide metrics, rendered in the Prometheus text format.
+
+	Each uvicorn worker keeps its own registry; Prometheus adds the workers
+	up when every one of them is scraped.
+	"""
+
+	def __init__(self):
+		self._metrics = []
+		self._lock = threading.Lock()
+
+	def _add(self, metric):
+		if not enabled:
+			return NOOP
+		with self._lock:
+			self._metrics.append(metric)
+		return metric
+
+	def counter(self, name: str, help: str, labels: tuple = ()):
+		return self._add(Counter(name, help, labels))
+
+	def histogram(self, name: str, help: str, labels: tuple = ()):
+		return self._add(Histogram(name, help, labels))
+
+	def gauge_callback(self, name: str, help: str, read, labels: tuple = ()) -> None:
+		"""read() returns a number, or {label values: number}"""
+		self._add(_Callback(name, "gauge", help, read, labels))
+
+	def counter_callback(self, name: str, help: str, read, labels: tuple = ()) -> None:
+		self._add(_Callback(name, "counter", help, read, labels))
+
+	def histogram_callback(self, name: str, help: str, read, labels: tuple = ()) -> None:
+		"""read() returns a LatencyHistogram, or {label values: LatencyHistogram}"""
+		self._add(_Callback(name, "histogram", help, read, labels))
+
+	def render(self) -> str:
+		# Several sources may feed one family (e.g. cache lookups), so group by name
+		families = {}
+		with self._lock:
+			metrics = list(self._metrics)
+		for metric in metrics:
+			family = families.setdefault(metric.name, (metric.kind, metric.help, []))
+			try:
+				family[2].extend(metric.samples())
+			except Exception as e:
+				logger.error(f"Failed to collect metric {metric.name}: {str(e)}")
+		lines = []
+		for name, (kind, help, samples) in families.items():
+			lines.append(f"# HELP {name} {help}")
+			lines.append(f"# TYPE {name} {kind}")
+			lines.extend(samples)
+		return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry()
+
+handler_seconds = registry.histogram("bot_handler_seconds", "Time spent in a Telegram handler callback", ("handler",))
+handler_errors = registry.counter("bot_handler_errors_total", "Handler callbacks that raised", ("handler",))
+updates = registry.counter("bot_updates_total", "Telegram updates processed, by kind", ("kind",))
+inline_queries = registry.counter("bot_inline_queries_total", "Inline queries handled, by command", ("command",))
+db_seconds = registry.histogram("bot_db_seconds", "Time spent in a Database method", ("method",))
+telegram_api_seconds = registry.histogram("bot_telegram_api_seconds", "Time spent in a Telegram Bot API call", ("method",))
+ai_commentary_seconds = registry.histogram("bot_ai_commentary_seconds", "Time spent waiting for AI commentary")
+credits_consumed = registry.counter("bot_credits_consumed_total", "Credits deducted from users")
+cache_requests = registry.counter("bot_cache_requests_total", "Cache lookups, by cache and result", ("cache", "result"))
+
+def timed(histogram, *labels):
+	"""Decorator observing each call's duration in histogram; returns the function itself when metrics are off."""
+	def decorator(function):
+		if histogram is NOOP:
+			return function
+		if inspect.iscoroutinefunction(function):
+			@functools.wraps(function)
+			async def async_wrapper(*args, **kwargs):
+				start = time.perf_counter()
+				try:
+					return await function(*args, **kwargs)
+				finally:
+					histogram.observe(time.perf_counter() - start, *labels)
+			return async_wrapper
+
+		@functools.wraps(function)
+		def wrapper(*args, **kwargs):
+			start = time.perf_counter()
+			try:
+				return function(*args, **kwargs)
+			finally:
+				histogram.observe(time.perf_counter() - start, *labels)
+		return wrapper
+	return decorator
+
+def instrument_methods(cls, histogram=db_seconds):
+	"""Time every public method defined on cls, labelled with the method name."""
+	if not enabled:
+		return cls
+	for name, attribute in list(vars(cls).items()):
+		if not name.startswith("_") and inspect.isfunction(attribute):
+			setattr(cls, name, timed(histogram, name)(attribute))
+	return cls
+
+def handler_name(handler) -> str:
+	kind = HANDLER_KINDS.get(type(handler).__name__, type(handler).__name__)
+	if kind == "inline" and getattr(handler, "pattern", None) is not None:
+		return f"inline:{handler.pattern.pattern.lstrip('^/')}"
+	callback = handler.callback
+	name = getattr(callback, "__qualname__", None) or repr(callback)
+	# Lazy callbacks are named after their module path
+	name = name.removeprefix("Bot.Commands.")
+	return f"{kind}:{name}"
+
+def _instrument_handler(handler) -> None:
+	name = handler_name(handler)
+	callback = handler.callback
+	inline = name.startswith("inline:")
+	command = name.split(":", 1)[1]
+
+	@functools.wraps(callback)
+	async def instrumented(update, context):
+		if inline:
+			inline_queries.inc(command)
+		start = time.perf_counter()
+		try:
+			return await callback(update, context)
+		except Exception:
+			handler_errors.inc(name)
+			raise
+		finally:
+			handler_seconds.observe(time.perf_counter() - start, name)
+
+	handler.callback = instrumented
+
+def _walk_handlers(handlers):
+	from telegram.ext import ConversationHandler
+	for handler in handlers:
+		if isinstance(handler, ConversationHandler):
+			# Instrument the handlers the conversation dispatches to
+			yield from _walk_handlers(handler.entry_points)
+			for state_handlers in handler.states.values():
+				yield from _walk_handlers(state_handlers)
+			yield from _walk_handlers(handler.fallbacks)
+		else:
+			yield handler
+
+def instrument_application(application) -> None:
+	"""Wrap every registered handler callback with timing and error counting; call after registration."""
+	if not enabled:
+		return
+	seen = set()
+	for handlers in application.handlers.values():
+		for handler in _walk_handlers(handlers):
+			if id(handler) not in seen:
+				seen.add(id(handler))
+				_instrument_handler(handler)
+
+def update_kind(update) -> str:
+	for kind in ("message", "edited_message", "callback_query", "inline_query", "chosen_inline_result",
+				 "pre_checkout_query", "my_chat_member", "chat_member", "channel_post"):
+		if getattr(update, kind, None) is not None:
+			return kind
+	return "other"
+
+def api_method(url: str) -> str:
+	"""Bot API method of a request URL; file downloads (/file/bot<token>/<path>) share one label."""
+	if "/file/bot" in url:
+		return "file_download"
+	return url.rsplit("/", 1)[-1]
+
+def telegram_request():
+	"""HTTPXRequest that times each Bot API call, or None (the builder's default) when metrics are off."""
+	if not enabled:
+		return None
+	from telegram.request import HTTPXRequest
+
+	class TimedRequest(HTTPXRequest):
+		async def do_request(self, url, method, *args, **kwargs):
+			start = time.perf_counter()
+			try:
+				return await super().do_request(url, method, *args, **kwargs)
+			finally:
+				telegram_api_seconds.observe(time.perf_counter() - start, api_method(url))
+
+	return TimedRequest(connection_pool_size=256)
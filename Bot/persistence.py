@@ -0,0 +1,328 @@
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import pickle
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from telegram.ext import BasePersistence, ConversationHandler, PersistenceInput
+from Bot.config import config_store, MYSQL_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# Writes arriving within this window are sent as one multi-row upsert
+FLUSH_DELAY = 0.05
+# A user, chat or bot record checked this recently is not asked for again (one update refreshes
+# each of them); conversation states are always checked
+PULL_WINDOW = 1.0
+MAX_CHECKED = 50000
+DELETED = object()
+MISSING = object()
+
+# Types conversation data may contain; anything else is refused when loading
+SAFE_GLOBALS = {
+	("builtins", "set"), ("builtins", "frozenset"), ("builtins", "complex"), ("builtins", "bytearray"),
+	("collections", "OrderedDict"), ("collections", "deque"), ("decimal", "Decimal"),
+	("datetime", "datetime"), ("datetime", "date"), ("datetime", "time"), ("datetime", "timedelta"),
+	("datetime", "timezone")
+}
+
+class _SafeUnpickler(pickle.Unpickler):
+	def find_class(self, module, name):
+		if (module, name) in SAFE_GLOBALS:
+			return super().find_class(module, name)
+		raise pickle.UnpicklingError(f"{module}.{name} is not allowed in persisted data")
+
+def dumps(obj) -> bytes:
+	return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+def loads(data: bytes):
+	return _SafeUnpickler(io.BytesIO(data)).load()
+
+def digest(data: bytes) -> bytes:
+	return hashlib.blake2b(data, digest_size=16).digest()
+
+def conversation_kind(name: str) -> str:
+	return f"conversation:{name}"
+
+class MySQLPersistence(BasePersistence):
+	"""
+	python-telegram-bot persistence shared by every worker through MySQL.
+
+	Each user_data, chat_data, bot_data and conversation entry is one row in
+	bot_persistence, stored with a random version. Reads are served from the
+	application's own dicts; before an update is handled, sync() asks MySQL
+	in a single query for the rows of that update's user, chat and
+	conversations whose version differs from the one this process last saw,
+	so another worker's changes are picked up without transferring
+	unchanged data; release() drops whatever the update did not use. Writes are skipped when the serialized data is unchanged
+	and otherwise coalesced for FLUSH_DELAY into one multi-row upsert.
+
+	All SQL runs on one dedicated thread with its own connection.
+	"""
+
+	def __init__(self, flush_delay: float = FLUSH_DELAY, update_interval: float = 60):
+		super().__init__(
+			store_data=PersistenceInput(bot_data=True, chat_data=True, user_data=True, callback_data=False),
+			update_interval=update_interval
+		)
+		self.flush_delay = flush_delay
+		self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="persistence")
+		self._db = None
+		self._reconnect = False
+		self._records = {}	# (kind, record_key) -> (version, digest of the stored data)
+		self._dirty = {}	# (kind, record_key) -> serialized data or DELETED
+		self._pulled = {}	# (kind, record_key) -> data another worker wrote, not yet applied
+		self._checked = {}	# (kind, record_key) -> monotonic time of the last version check
+		self._flush_task = None
+		self.stats = {"pulls": 0, "pulled": 0, "writes": 0, "rows_written": 0, "unchanged": 0}
+		config_store.subscribe(self._on_config_change)
+
+	def _on_config_change(self, old, new) -> None:
+		if new.differs(old, *MYSQL_FIELDS):
+			self._reconnect = True
+
+	def _call(self, method: str, *args):
+		"""Run a Database method on the persistence thread (reconnects after a failure or a MySQL settings change)."""
+		if self._db is None or self._reconnect:
+			from Bot.database import Database
+			self._reconnect = False
+			self._db = Database()
+		try:
+			return getattr(self._db, method)(*args)
+		except Exception:
+			self._db = None
+			raise
+
+	async def _run(self, method: str, *args):
+		return await asyncio.get_running_loop().run_in_executor(self._executor, self._call, method, *args)
+
+	async def _load(self, kind: str) -> dict:
+		loaded = {}
+		for row in await self._run("get_persistence_records", kind):
+			data = bytes(row["data"])
+			try:
+				loaded[row["record_key"]] = loads(data)
+			except Exception as e:
+				logger.error(f"Skipping unreadable {kind} record {row['record_key']}: {str(e)}")
+				continue
+			self._records[(kind, row["record_key"])] = (row["version"], digest(data))
+		return loaded
+
+	# Loading at startup
+
+	async def get_user_data(self) -> dict:
+		return {int(key): data for key, data in (await self._load("user_data")).items()}
+
+	async def get_chat_data(self) -> dict:
+		return {int(key): data for key, data in (await self._load("chat_data")).items()}
+
+	async def get_bot_data(self) -> dict:
+		return (await self._load("bot_data")).get("", {})
+
+	async def get_callback_data(self):
+		return None
+
+	async def get_conversations(self, name: str) -> dict:
+		loaded = await self._load(conversation_kind(name))
+		return {tuple(json.loads(key)): state for key, state in loaded.items() if state is not None}
+
+	# Writes
+
+	def _stage(self, kind: str, record_key: str, obj) -> None:
+		key = (kind, record_key)
+		data = DELETED if obj is DELETED else dumps(obj)
+		if data is not DELETED and key not in self._dirty and self._records.get(key, (None, None))[1] == digest(data):
+			self.stats["unchanged"] += 1
+			return
+		self._dirty[key] = data
+		if self._flush_task is None:
+			self._flush_task = asyncio.get_running_loop().create_task(self._flush_later())
+
+	async def _flush_later(self) -> None:
+		try:
+			await asyncio.sleep(self.flush_delay)
+		finally:
+			self._flush_task = None
+		await self._write()
+
+	async def _write(self) -> None:
+		if not self._dirty:
+			return
+		dirty, self._dirty = self._dirty, {}
+		records = []
+		deleted = []
+		for (kind, record_key), data in dirty.items():
+			if data is DELETED:
+				deleted.append((kind, record_key))
+			else:
+				records.append((kind, record_key, data, secrets.randbits(62)))
+		try:
+			saved = await self._run("save_persistence_records", records, deleted)
+		except Exception as e:
+			logger.error(f"Failed to write persistence records: {str(e)}")
+			saved = False
+		if not saved:
+			# Keep the failed rows for the next flush unless they were changed again meanwhile
+			for key, data in dirty.items():
+				self._dirty.setdefault(key, data)
+			return
+		self.stats["writes"] += 1
+		self.stats["rows_written"] += len(dirty)
+		for kind, record_key, data, version in records:
+			self._records[(kind, record_key)] = (version, digest(data))
+		for key in deleted:
+			self._records.pop(key, None)
+
+	async def update_user_data(self, user_id: int, data: dict) -> None:
+		self._stage("user_data", str(user_id), data)
+
+	async def update_chat_data(self, chat_id: int, data: dict) -> None:
+		self._stage("chat_data", str(chat_id), data)
+
+	async def update_bot_data(self, data: dict) -> None:
+		self._stage("bot_data", "", data)
+
+	async def update_callback_data(self, data) -> None:
+		pass
+
+	async def update_conversation(self, name: str, key: tuple, new_state) -> None:
+		# Ended conversations are stored as None rather than deleted, so other workers see the change
+		self._stage(conversation_kind(name), json.dumps(list(key)), new_state)
+
+	async def drop_user_data(self, user_id: int) -> None:
+		self._stage("user_data", str(user_id), DELETED)
+
+	async def drop_chat_data(self, chat_id: int) -> None:
+		self._stage("chat_data", str(chat_id), DELETED)
+
+	async def flush(self) -> None:
+		if self._flush_task is not None:
+			self._flush_task.cancel()
+			self._flush_task = None
+		await self._write()
+
+	# Reads of data other workers changed
+
+	async def _pull(self, keys: list, always: list = ()) -> None:
+		"""Fetch the given records if their version moved since this process last saw them."""
+		now = time.monotonic()
+		stale = [key for key in keys if key not in self._dirty and now - self._checked.get(key, 0) > PULL_WINDOW]
+		stale += [key for key in always if key not in self._dirty]
+		if not stale:
+			return
+		if len(self._checked) > MAX_CHECKED:
+			self._checked = {key: checked for key, checked in self._checked.items() if now - checked <= PULL_WINDOW}
+		for key in stale:
+			self._checked[key] = now
+		known = [(kind, record_key, self._records.get((kind, record_key), (None, None))[0]) for kind, record_key in stale]
+		try:
+			rows = await self._run("get_changed_persistence_records", known)
+		except Exception as e:
+			logger.error(f"Failed to refresh persistence records: {str(e)}")
+			return
+		self.stats["pulls"] += 1
+		for row in rows:
+			key = (row["kind"], row["record_key"])
+			if key in self._dirty:
+				# A local change that is not flushed yet is newer
+				continue
+			data = bytes(row["data"])
+			try:
+				self._pulled[key] = loads(data)
+			except Exception as e:
+				logger.error(f"Skipping unreadable {key[0]} record {key[1]}: {str(e)}")
+				continue
+			self._records[key] = (row["version"], digest(data))
+			self.stats["pulled"] += 1
+
+	def _apply(self, key: tuple, target: dict) -> None:
+		data = self._pulled.pop(key, MISSING)
+		if data is not MISSING:
+			target.clear()
+			target.update(data)
+
+	async def refresh_user_data(self, user_id: int, user_data: dict) -> None:
+		key = ("user_data", str(user_id))
+		await self._pull([key])
+		self._apply(key, user_data)
+
+	async def refresh_chat_data(self, chat_id: int, chat_data: dict) -> None:
+		key = ("chat_data", str(chat_id))
+		await self._pull([key])
+		self._apply(key, chat_data)
+
+	async def refresh_bot_data(self, bot_data: dict) -> None:
+		key = ("bot_data", "")
+		await self._pull([key])
+		self._apply(key, bot_data)
+
+	@staticmethod
+	def _conversation_key(handler: ConversationHandler, update):
+		"""Same key ConversationHandler derives for an update, or None when it does not apply."""
+		chat = update.effective_chat
+		user = update.effective_user
+		key = []
+		if handler.per_chat:
+			if chat is None:
+				return None
+			key.append(chat.id)
+		if handler.per_user:
+			if user is None:
+				return None
+			key.append(user.id)
+		if handler.per_message:
+			query = update.callback_query
+			if query is None:
+				return None
+			key.append(query.inline_message_id or query.message.message_id)
+		return tuple(key)
+
+	async def sync(self, application, update) -> list:
+		"""
+		Bring this update's user, chat, bot and conversation state up to date
+		with what other workers wrote, in one round trip. Call it before
+		application.process_update(update).
+		Returns the keys it checked; pass them to release() once the update is done.
+		"""
+		keys = [("bot_data", "")]
+		if update.effective_user is not None:
+			keys.append(("user_data", str(update.effective_user.id)))
+		if update.effective_chat is not None:
+			keys.append(("chat_data", str(update.effective_chat.id)))
+		conversations = []
+		conversation_keys = []
+		for handlers in application.handlers.values():
+			for handler in handlers:
+				if isinstance(handler, ConversationHandler) and handler.persistent:
+					conversation_key = self._conversation_key(handler, update)
+					if conversation_key is not None:
+						key = (conversation_kind(handler.name), json.dumps(list(conversation_key)))
+						conversations.append((handler, conversation_key, key))
+						conversation_keys.append(key)
+		# A conversation can move on another worker within PULL_WINDOW, so its state is always checked
+		await self._pull(keys, conversation_keys)
+		for handler, conversation_key, key in conversations:
+			state = self._pulled.pop(key, MISSING)
+			if state is MISSING:
+				continue
+			# ConversationHandler keeps its states in a private mapping and offers no public setter
+			if state is None:
+				handler._conversations.pop(conversation_key, None)
+			else:
+				handler._conversations[conversation_key] = state
+		return keys + conversation_keys
+
+	def release(self, keys: list) -> None:
+		"""
+		Drop the pulled records an update did not apply (PTB only refreshes
+		the data of handlers that ran), so they can never overwrite newer
+		local data later. Their version is forgotten and the next check
+		fetches them again.
+		"""
+		for key in keys:
+			if self._pulled.pop(key, MISSING) is not MISSING:
+				self._records.pop(key, None)
+				self._checked.pop(key, None)
@@ -0,0 +1,118 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+class ProductCache:
+	"""
+	Versioned read-through cache of decoded product rows.
+
+	Every product mutation made through Database bumps the version, which
+	drops all cached products and listings at once. Entries also expire
+	after max_age seconds so changes made by another process show up.
+	Cached rows are returned as shallow copies; treat nested values such
+	as features as read-only.
+	"""
+
+	def __init__(self, max_products: int = 4096, max_listings: int = 256, max_age: int = 300):
+		self.max_products = max_products
+		self.max_listings = max_listings
+		self.max_age = max_age
+		self.version = 0
+		self._products = OrderedDict()
+		self._listings = OrderedDict()
+		self._listeners = []
+		self._lock = threading.Lock()
+		self._counters = {"hits": 0, "misses": 0}
+
+	def subscribe(self, callback) -> None:
+		"""Call callback() whenever the catalog version changes."""
+		self._listeners.append(callback)
+
+	def bump(self) -> int:
+		"""Invalidate everything after a product change; returns the new version"""
+		with self._lock:
+			self.version += 1
+			self._products.clear()
+			self._listings.clear()
+			version = self.version
+		for callback in self._listeners:
+			try:
+				callback()
+			except Exception as e:
+				logger.error(f"Product cache listener failed: {str(e)}")
+		return version
+
+	def _get(self, store: OrderedDict, key):
+		with self._lock:
+			entry = store.get(key)
+			if entry is not None:
+				version, stored_at, value = entry
+				if version == self.version and time.monotonic() - stored_at < self.max_age:
+					store.move_to_end(key)
+					self._counters["hits"] += 1
+					return True, value
+				del store[key]
+			self._counters["misses"] += 1
+			return False, None
+
+	def _put(self, store: OrderedDict, limit: int, key, version: int, value) -> None:
+		with self._lock:
+			# A load that raced with bump() belongs to an older catalog; don't keep it
+			if version != self.version:
+				return
+			store[key] = (version, time.monotonic(), value)
+			while len(store) > limit:
+				store.popitem(last=False)
+
+	def get_product(self, product_id: int, loader):
+		"""Cached product by id; loader() fetches the decoded row (or None) on a miss."""
+		found, product = self._get(self._products, product_id)
+		if not found:
+			version = self.version
+			product = loader()
+			self._put(self._products, self.max_products, product_id, version, product)
+		return dict(product) if product else product
+
+	def get_products(self, product_ids: list, loader) -> dict:
+		"""Cached products for many ids; loader(missing_ids) returns {id: decoded row}."""
+		found = {}
+		missing = []
+		for product_id in product_ids:
+			hit, product = self._get(self._products, product_id)
+			if hit:
+				if product:
+					found[product_id] = product
+			else:
+				missing.append(product_id)
+		if missing:
+			version = self.version
+			loaded = loader(missing)
+			for product_id in missing:
+				product = loaded.get(product_id)
+				self._put(self._products, self.max_products, product_id, version, product)
+				if product:
+					found[product_id] = product
+		return {product_id: dict(product) for product_id, product in found.items()}
+
+	def get_listing(self, key: tuple, loader) -> list:
+		"""Cached product list for a filter key; loader() returns the decoded rows on a miss."""
+		found, products = self._get(self._listings, key)
+		if not found:
+			version = self.version
+			products = loader()
+			self._put(self._listings, self.max_listings, key, version, products)
+		return [dict(product) for product in products]
+
+	def stats(self) -> dict:
+		with self._lock:
+			return {
+				**self._counters,
+				"version": self.version,
+				"products": len(self._products),
+				"listings": len(self._listings)
+			}
+
+product_cache = ProductCache()
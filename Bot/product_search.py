@@ -0,0 +1,194 @@
+import logging
+import math
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+from collections import OrderedDict
+from functools import lru_cache
+from .product_cache import product_cache
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+NAME_WEIGHT = 3.0
+DESCRIPTION_WEIGHT = 1.0
+# A whole-word hit ranks above a product that only shares the prefix being typed
+EXACT_BONUS = 1.5
+
+def normalize_text(text: str) -> str:
+	"""Case- and accent-insensitive form used for both indexing and queries."""
+	text = unicodedata.normalize("NFKD", (text or "").casefold())
+	# Dotted and dotless i fold together so Turkish and English spellings meet
+	return "".join(char for char in text if not unicodedata.combining(char)).replace("ı", "i")
+
+@lru_cache(maxsize=65536)
+def _normalize_word(word: str) -> tuple:
+	return tuple(TOKEN_PATTERN.findall(normalize_text(word)))
+
+def tokenize(text: str) -> list:
+	# Catalog text repeats a small vocabulary, so normalization is cached per raw word
+	tokens = []
+	for word in TOKEN_PATTERN.findall(unicodedata.normalize("NFC", text or "")):
+		tokens.extend(_normalize_word(word))
+	return tokens
+
+class _Snapshot:
+	"""Immutable index state; searches read one snapshot while a rebuild prepares the next."""
+	__slots__ = ("generation", "postings", "vocabulary", "idf", "documents")
+
+	def __init__(self, generation: int, products):
+		self.generation = generation
+		self.postings = {}
+		self.documents = {}
+		for product in products:
+			product_id = product["id"]
+			self.documents[product_id] = (product.get("type"), bool(product.get("active")), product.get("created_by"))
+			weights = {}
+			for token in tokenize(product.get("description")):
+				weights[token] = max(weights.get(token, 0.0), DESCRIPTION_WEIGHT)
+			for token in tokenize(product.get("name")):
+				weights[token] = max(weights.get(token, 0.0), NAME_WEIGHT)
+			for token, weight in weights.items():
+				self.postings.setdefault(token, {})[product_id] = weight
+		self.vocabulary = sorted(self.postings)
+		total = max(len(self.documents), 1)
+		self.idf = {token: math.log(1 + total / len(docs)) for token, docs in self.postings.items()}
+
+	def term_scores(self, term: str) -> dict:
+		"""Best score per product for every indexed token starting with term."""
+		scores = {}
+		index = bisect_left(self.vocabulary, term)
+		while index < len(self.vocabulary) and self.vocabulary[index].startswith(term):
+			token = self.vocabulary[index]
+			factor = self.idf[token] * (EXACT_BONUS if token == term else 1.0)
+			for product_id, weight in self.postings[token].items():
+				score = weight * factor
+				if score > scores.get(product_id, 0.0):
+					scores[product_id] = score
+			index += 1
+		return scores
+
+class ProductSearchIndex:
+	"""
+	In-process inverted index over product names and descriptions.
+
+	Every query term is matched as a word prefix, so partial words typed into
+	the inline shop already find products. Results are ranked by a weighted
+	idf score (name hits count more than description hits), and ranked id
+	lists are cached per (terms, filters) until the index is rebuilt.
+	"""
+
+	def __init__(self, loader=None, max_age: int = 300, cache_size: int = 512):
+		self.loader = loader or self._load_from_database
+		self.max_age = max_age
+		self.cache_size = cache_size
+		self._snapshot = None
+		self._built_at = 0.0
+		self._stale = True
+		self._generation = 0
+		self._results = OrderedDict()
+		self._lock = threading.Lock()
+		self._build_lock = threading.Lock()
+
+	@staticmethod
+	def _load_from_database():
+		# Imported here because Database imports this module
+		from Bot.database import Database
+		return Database().get_product_search_rows()
+
+	def build(self, products=None) -> None:
+		"""Rebuild the index from the given products, or from the loader."""
+		started = time.monotonic()
+		# Taken before the rows are read, so a product change during the load makes this build stale
+		with self._lock:
+			self._generation += 1
+			generation = self._generation
+		if products is None:
+			products = self.loader()
+		snapshot = _Snapshot(generation, products)
+		with self._lock:
+			if generation == self._generation:
+				self._snapshot = snapshot
+				self._built_at = time.monotonic()
+				self._stale = False
+				self._results.clear()
+			elif self._snapshot is None:
+				# Better than nothing for the first search; it stays stale and the next one rebuilds
+				self._snapshot = snapshot
+				self._built_at = time.monotonic()
+			else:
+				logger.info("Product search index build discarded: products changed while it was loading")
+				return
+		logger.info(f"Product search index built: {len(snapshot.documents)} products, {len(snapshot.vocabulary)} terms in {time.monotonic() - started:.2f}s")
+
+	def mark_stale(self) -> None:
+		"""Called after product changes; the next search rebuilds the index."""
+		with self._lock:
+			# Discard any build already reading the old rows
+			self._generation += 1
+			self._stale = True
+			self._results.clear()
+
+	def _current(self) -> _Snapshot:
+		if not (self._stale or self._snapshot is None or time.monotonic() - self._built_at > self.max_age):
+			return self._snapshot
+		if self._snapshot is None:
+			with self._build_lock:
+				if self._snapshot is None or self._stale:
+					self.build()
+		elif self._build_lock.acquire(blocking=False):
+			# One caller rebuilds; concurrent searches keep using the previous snapshot meanwhile
+			try:
+				self.build()
+			finally:
+				self._build_lock.release()
+		return self._snapshot
+
+	def search(self, terms: str, product_type: str = None, active_only: bool = True,
+			   created_by: int = None, limit: int = 100, offset: int = 0) -> list:
+		"""Ranked product ids matching every term as a word prefix."""
+		query_terms = tuple(dict.fromkeys(tokenize(terms)))
+		if not query_terms:
+			return []
+		snapshot = self._current()
+		key = (snapshot.generation, query_terms, product_type, bool(active_only), created_by)
+		with self._lock:
+			ranked = self._results.get(key)
+			if ranked is not None:
+				self._results.move_to_end(key)
+		if ranked is None:
+			ranked = self._rank(snapshot, query_terms, product_type, active_only, created_by)
+			with self._lock:
+				self._results[key] = ranked
+				while len(self._results) > self.cache_size:
+					self._results.popitem(last=False)
+		return list(ranked[offset:offset + limit])
+
+	@staticmethod
+	def _rank(snapshot: _Snapshot, query_terms: tuple, product_type, active_only, created_by) -> tuple:
+		per_term = sorted((snapshot.term_scores(term) for term in query_terms), key=len)
+		if not per_term[0]:
+			return ()
+		totals = dict(per_term[0])
+		for scores in per_term[1:]:
+			totals = {product_id: total + scores[product_id] for product_id, total in totals.items() if product_id in scores}
+			if not totals:
+				return ()
+		matches = []
+		for product_id, score in totals.items():
+			doc_type, active, owner = snapshot.documents[product_id]
+			if active_only and not active:
+				continue
+			if product_type and doc_type != product_type:
+				continue
+			if created_by and owner != created_by:
+				continue
+			matches.append((-score, -product_id))
+		matches.sort()
+		return tuple(-product_id for _, product_id in matches)
+
+product_search_index = ProductSearchIndex()
+# Any catalog change made through Database makes the index rebuild on its next search
+product_cache.subscribe(product_search_index.mark_stale)
@@ -0,0 +1,318 @@
+import contextvars
+import functools
+import inspect
+import logging
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Top offenders are summed over this many seconds, kept in BUCKET-second slices
+WINDOW = 15 * 60
+BUCKET = 60
+# Queries outside any Database method (e.g. helpers using db.cursor directly)
+OUTSIDE = "(outside Database)"
+
+_STRING = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_LIST = re.compile(r"\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))+\s*\)")
+_ROWS = re.compile(r"(\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+")
+_SPACE = re.compile(r"\s+")
+
+@functools.lru_cache(maxsize=4096)
+def normalize_sql(sql: str) -> str:
+	"""SQL with literals replaced and IN lists / multi-row VALUES collapsed, so one shape is one key."""
+	sql = _STRING.sub("?", sql)
+	sql = _NUMBER.sub("?", sql)
+	sql = _LIST.sub("(...)", sql)
+	sql = _ROWS.sub(r"\1, ...", sql)
+	return _SPACE.sub(" ", sql).strip()
+
+def param_shape(params) -> str:
+	"""Types of the parameters, never their values (which may be personal data)."""
+	if params is None:
+		return "()"
+	if isinstance(params, dict):
+		return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in params.items()) + "}"
+	if isinstance(params, (list, tuple)):
+		if len(params) > 8:
+			kinds = sorted({type(value).__name__ for value in params})
+			return f"({len(params)} x {'|'.join(kinds)})"
+		return "(" + ", ".join(type(value).__name__ for value in params) + ")"
+	return type(params).__name__
+
+class QueryTally:
+	"""Statements, round trips and time used by one method call, update or request."""
+	__slots__ = ("statements", "round_trips", "seconds", "parent")
+
+	def __init__(self, parent: "QueryTally" = None):
+		self.statements = 0
+		self.round_trips = 0
+		self.seconds = 0.0
+		self.parent = parent
+
+	def add(self, statements: int, round_trips: int, seconds: float) -> None:
+		self.statements += statements
+		self.round_trips += round_trips
+		self.seconds += seconds
+
+	def as_dict(self) -> dict:
+		return {"statements": self.statements, "round_trips": self.round_trips, "ms": round(self.seconds * 1000, 3)}
+
+# (name, tally) of the Database method and of the update or admin request being served
+_method = contextvars.ContextVar("query_method", default=None)
+_scope = contextvars.ContextVar("query_scope", default=None)
+
+class QueryStats:
+	"""
+	Rolling-window totals per Database method, per normalized statement and
+	per scope (Telegram update or admin request), plus the slow-query log.
+	"""
+
+	def __init__(self, window: int = WINDOW, bucket: int = BUCKET, slow_ms: float = 200):
+		self.window = window
+		self.bucket = bucket
+		self.slow_ms = slow_ms
+		self.slow_queries = 0
+		self._buckets = deque()
+		self._lock = threading.Lock()
+
+	def _current(self) -> dict:
+		# Called with the lock held
+		start = int(time.time()) // self.bucket * self.bucket
+		if not self._buckets or self._buckets[-1][0] != start:
+			self._buckets.append((start, {"methods": {}, "statements": {}, "scopes": {}}))
+			while self._buckets and self._buckets[0][0] <= start - self.window:
+				self._buckets.popleft()
+		return self._buckets[-1][1]
+
+	@staticmethod
+	def _bump(table: dict, key, statements: int, round_trips: int, seconds: float, calls: int = 1, duration: float = None) -> list:
+		entry = table.get(key)
+		if entry is None:
+			# calls, statements, round trips, seconds, slowest
+			entry = table[key] = [0, 0, 0, 0.0, 0.0]
+		entry[0] += calls
+		entry[1] += statements
+		entry[2] += round_trips
+		entry[3] += seconds
+		duration = seconds if duration is None else duration
+		if duration > entry[4]:
+			entry[4] = duration
+		return entry
+
+	def record_statement(self, sql: str, method: str, statements: int, round_trips: int, seconds: float, duration: float = None) -> None:
+		"""duration is the statement's whole time so far, when seconds is only its fetch"""
+		key = (normalize_sql(sql), method)
+		with self._lock:
+			self._bump(self._current()["statements"], key, statements, round_trips, seconds, round_trips, duration)
+
+	def record_method(self, method: str, tally: QueryTally) -> None:
+		with self._lock:
+			self._bump(self._current()["methods"], method, tally.statements, tally.round_trips, tally.seconds)
+
+	def record_scope(self, scope: str, tally: QueryTally) -> None:
+		with self._lock:
+			self._bump(self._current()["scopes"], scope, tally.statements, tally.round_trips, tally.seconds)
+
+	def check_slow(self, sql: str, params, method: str, seconds: float) -> bool:
+		"""Log the statement if it took slow_ms or longer; True when it was logged."""
+		if not self.slow_ms or seconds * 1000 < self.slow_ms:
+			return False
+		self.slow_queries += 1
+		scope = _scope.get()
+		logger.warning(
+			f"Slow query {seconds * 1000:.1f} ms in {method}"
+			f"{' during ' + scope[0] if scope else ''}: {normalize_sql(sql)} params={param_shape(params)}"
+		)
+		return True
+
+	def top(self, kind: str = "methods", sort: str = "time", limit: int = 20) -> list:
+		"""Largest entries of the window by total time ("time"), executions ("count") or statements."""
+		totals = {}
+		with self._lock:
+			self._current()
+			for _, tables in self._buckets:
+				for key, (calls, statements, round_trips, seconds, slowest) in tables[kind].items():
+					entry = totals.setdefault(key, [0, 0, 0, 0.0, 0.0])
+					entry[0] += calls
+					entry[1] += statements
+					entry[2] += round_trips
+					entry[3] += seconds
+					entry[4] = max(entry[4], slowest)
+		order = {"time": 3, "count": 0, "statements": 1}.get(sort, 3)
+		rows = []
+		for key, (calls, statements, round_trips, seconds, slowest) in sorted(totals.items(), key=lambda item: -item[1][order])[:limit]:
+			row = {"sql": key[0], "method": key[1]} if kind == "statements" else {"name": key}
+			row.update({
+				"calls": calls,
+				"statements": statements,
+				"round_trips": round_trips,
+				"total_ms": round(seconds * 1000, 3),
+				"mean_ms": round(seconds * 1000 / calls, 3) if calls else 0.0,
+				"max_ms": round(slowest * 1000, 3)
+			})
+			if kind != "statements":
+				row["statements_per_call"] = round(statements / calls, 2) if calls else 0.0
+			rows.append(row)
+		return rows
+
+query_stats = QueryStats()
+
+def configure(slow_ms: float = None, window: int = None) -> None:
+	if slow_ms is not None:
+		query_stats.slow_ms = slow_ms
+	if window is not None:
+		query_stats.window = window
+
+def _account(sql: str, statements: int, round_trips: int, seconds: float) -> str:
+	method = _method.get()
+	name = method[0] if method else OUTSIDE
+	tally = method[1] if method else None
+	if tally is not None:
+		tally.add(statements, round_trips, seconds)
+	scope = _scope.get()
+	if scope is not None:
+		scope[1].add(statements, round_trips, seconds)
+	if sql is not None:
+		query_stats.record_statement(sql, name, statements, round_trips, seconds)
+	return name
+
+class AccountingCursor:
+	"""mysql.connector cursor that reports every execute and fetch; anything else is passed through."""
+
+	def __init__(self, cursor):
+		self._cursor = cursor
+		self._last = None	# (sql, params, method, seconds so far, slow already logged)
+
+	def __getattr__(self, name):
+		return getattr(self._cursor, name)
+
+	def __iter__(self):
+		return iter(self._cursor)
+
+	def _executed(self, sql, params, statements: int, started: float) -> None:
+		seconds = time.perf_counter() - started
+		method = _account(sql, statements, 1, seconds)
+		self._last = (sql, params, method, seconds, query_stats.check_slow(sql, params, method, seconds))
+
+	def _fetched(self, started: float) -> None:
+		seconds = time.perf_counter() - started
+		_account(None, 0, 0, seconds)
+		if self._last is not None:
+			sql, params, method, total, logged = self._last
+			total += seconds
+			query_stats.record_statement(sql, method, 0, 0, seconds, total)
+			# Unbuffered cursors read the rows here, so the slow check covers execute plus fetch
+			self._last = (sql, params, method, total, logged or query_stats.check_slow(sql, params, method, total))
+
+	def execute(self, operation, params=None, multi=False):
+		started = time.perf_counter()
+		try:
+			return self._cursor.execute(operation, params, multi) if multi else self._cursor.execute(operation, params)
+		finally:
+			self._executed(operation, params, 1, started)
+
+	def executemany(self, operation, seq_params):
+		seq_params = seq_params if isinstance(seq_params, (list, tuple)) else list(seq_params)
+		started = time.perf_counter()
+		try:
+			return self._cursor.executemany(operation, seq_params)
+		finally:
+			self._executed(operation, seq_params, len(seq_params), started)
+
+	def fetchone(self):
+		started = time.perf_counter()
+		try:
+			return self._cursor.fetchone()
+		finally:
+			self._fetched(started)
+
+	def fetchall(self):
+		started = time.perf_counter()
+		try:
+			return self._cursor.fetchall()
+		finally:
+			self._fetched(started)
+
+	def fetchmany(self, size=None):
+		started = time.perf_counter()
+		try:
+			return self._cursor.fetchmany() if size is None else self._cursor.fetchmany(size)
+		finally:
+			self._fetched(started)
+
+class AccountingConnection:
+	"""mysql.connector connection whose cursors are AccountingCursors; commits and rollbacks count as round trips."""
+
+	def __init__(self, connection):
+		self._connection = connection
+
+	def __getattr__(self, name):
+		return getattr(self._connection, name)
+
+	def cursor(self, *args, **kwargs):
+		return AccountingCursor(self._connection.cursor(*args, **kwargs))
+
+	def _round_trip(self, name: str, *args, **kwargs):
+		started = time.perf_counter()
+		try:
+			return getattr(self._connection, name)(*args, **kwargs)
+		finally:
+			_account(None, 0, 1, time.perf_counter() - started)
+
+	def commit(self):
+		return self._round_trip("commit")
+
+	def rollback(self):
+		return self._round_trip("rollback")
+
+	def start_transaction(self, *args, **kwargs):
+		return self._round_trip("start_transaction", *args, **kwargs)
+
+def account_methods(cls):
+	"""Attribute the queries of every public method of cls to that method (inner calls count toward outer ones too)."""
+	for name, attribute in list(vars(cls).items()):
+		if name.startswith("_") or not inspect.isfunction(attribute):
+			continue
+
+		def wrap(function, name=name):
+			@functools.wraps(function)
+			def accounted(*args, **kwargs):
+				parent = _method.get()
+				tally = QueryTally(parent[1] if parent else None)
+				token = _method.set((name, tally))
+				try:
+					return function(*args, **kwargs)
+				finally:
+					_method.reset(token)
+					if tally.parent is not None:
+						tally.parent.add(tally.statements, tally.round_trips, tally.seconds)
+					query_stats.record_method(name, tally)
+			return accounted
+
+		setattr(cls, name, wrap(attribute))
+	return cls
+
+def begin(scope: str):
+	"""Start counting the queries of one update or request; pass the result to end()."""
+	return _scope.set((scope, QueryTally()))
+
+def end(token) -> QueryTally:
+	scope, tally = _scope.get()
+	_scope.reset(token)
+	query_stats.record_scope(scope, tally)
+	if logger.isEnabledFor(logging.DEBUG):
+		logger.debug(f"{scope}: {tally.statements} statements, {tally.round_trips} round trips, {tally.seconds * 1000:.1f} ms")
+	return tally
+
+@contextmanager
+def scope(name: str):
+	token = begin(name)
+	try:
+		yield _scope.get()[1]
+	finally:
+		end(token)
@@ -0,0 +1,194 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from Bot.Helpers.CallbackRouter import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 16
+DEFAULT_MAXSIZE = 1000
+DEDUP_SIZE = 10000
+# Update fields whose payload carries the chat or user the update belongs to
+UPDATE_KINDS = (
+	"message", "edited_message", "channel_post", "edited_channel_post", "callback_query",
+	"inline_query", "chosen_inline_result", "shipping_query", "pre_checkout_query",
+	"poll_answer", "my_chat_member", "chat_member", "chat_join_request"
+)
+
+def update_chat_key(data: dict):
+	"""Chat (or user) an update belongs to; updates with the same key are processed in order."""
+	for kind in UPDATE_KINDS:
+		payload = data.get(kind)
+		if not isinstance(payload, dict):
+			continue
+		for holder in (payload, payload.get("message") or {}):
+			chat = holder.get("chat")
+			if isinstance(chat, dict) and "id" in chat:
+				return chat["id"]
+		for field in ("from", "user"):
+			user = payload.get(field)
+			if isinstance(user, dict) and "id" in user:
+				return user["id"]
+		break
+	return data.get("update_id")
+
+class UpdateQueue:
+	"""
+	Webhook ingestion queue.
+
+	submit() is called from the webhook request and returns at once: the
+	update is deduplicated by update_id and queued behind the earlier
+	updates of its chat. N worker tasks on a private event loop thread take
+	whichever chat is ready next, so each chat's updates are processed one
+	at a time in arrival order while other chats proceed in parallel. At
+	most maxsize updates are pending; beyond that submit() reports "full"
+	and the webhook answers with an error so Telegram redelivers later.
+
+	Everything the updates touch (the Telegram application, its HTTP pool,
+	persistence) must live on that loop, so on_start runs there before the
+	workers begin and on_stop after they have drained.
+	"""
+
+	def __init__(self, process, workers: int = DEFAULT_WORKERS, maxsize: int = DEFAULT_MAXSIZE,
+				 dedup_size: int = DEDUP_SIZE, on_start=None, on_stop=None):
+		self.process = process
+		self.on_start = on_start
+		self.on_stop = on_stop
+		self.workers = max(1, workers)
+		self.maxsize = max(1, maxsize)
+		self.dedup_size = dedup_size
+		self._seen = OrderedDict()
+		self._pending = 0
+		self._chats = {}	# chat key -> deque of (queued_at, update); owned by the loop thread
+		self._ready = None
+		self._lock = threading.Lock()
+		self._loop = None
+		self._thread = None
+		self._started = threading.Event()
+		self.counters = {"received": 0, "queued": 0, "duplicates": 0, "rejected": 0, "processed": 0, "failed": 0}
+		self.max_depth = 0
+		self.wait_histogram = LatencyHistogram()
+		self.process_histogram = LatencyHistogram()
+
+	def start(self) -> None:
+		"""Start the worker thread (idempotent)."""
+		with self._lock:
+			if self._thread is not None:
+				return
+			self._thread = threading.Thread(target=self._run, name="update-queue", daemon=True)
+			self._thread.start()
+		self._started.wait(5)
+
+	def stop(self, timeout: float = 30) -> None:
+		"""Let the workers finish what is queued, then stop the loop."""
+		if self._loop is None or self._loop.is_closed():
+			return
+		asyncio.run_coroutine_threadsafe(self._drain(), self._loop)
+		self._thread.join(timeout)
+
+	async def _drain(self) -> None:
+		while self.depth():
+			await asyncio.sleep(0.05)
+		if self.on_stop is not None:
+			try:
+				await self.on_stop()
+			except Exception as e:
+				logger.error(f"Update queue shutdown hook failed: {str(e)}")
+		for _ in range(self.workers):
+			self._ready.put_nowait(None)
+
+	def _run(self) -> None:
+		self._loop = asyncio.new_event_loop()
+		asyncio.set_event_loop(self._loop)
+		self._ready = asyncio.Queue()
+		# Updates submitted while on_start runs wait in their chat's backlog
+		self._started.set()
+		try:
+			if self.on_start is not None:
+				try:
+					self._loop.run_until_complete(self.on_start())
+				except Exception as e:
+					logger.error(f"Update queue startup hook failed: {str(e)}")
+			workers = [self._loop.create_task(self._worker()) for _ in range(self.workers)]
+			self._loop.run_until_complete(asyncio.gather(*workers))
+		finally:
+			self._loop.close()
+
+	def submit(self, data: dict) -> str:
+		"""Queue a raw update; returns "queued", "duplicate" or "full"."""
+		self.start()
+		update_id = data.get("update_id")
+		with self._lock:
+			self.counters["received"] += 1
+			if update_id is not None and update_id in self._seen:
+				self.counters["duplicates"] += 1
+				return "duplicate"
+			if self._pending >= self.maxsize:
+				self.counters["rejected"] += 1
+				return "full"
+			if update_id is not None:
+				self._seen[update_id] = None
+				if len(self._seen) > self.dedup_size:
+					self._seen.popitem(last=False)
+			self._pending += 1
+			self.counters["queued"] += 1
+			if self._pending > self.max_depth:
+				self.max_depth = self._pending
+		self._loop.call_soon_threadsafe(self._enqueue, update_chat_key(data), (time.perf_counter(), data))
+		return "queued"
+
+	def _enqueue(self, key, item) -> None:
+		backlog = self._chats.get(key)
+		if backlog is None:
+			self._chats[key] = deque((item,))
+			self._ready.put_nowait(key)
+		else:
+			# The chat is already scheduled or being processed; the worker picks this up after the earlier ones
+			backlog.append(item)
+
+	async def _worker(self) -> None:
+		while True:
+			key = await self._ready.get()
+			if key is None:
+				return
+			backlog = self._chats[key]
+			queued_at, data = backlog[0]
+			started = time.perf_counter()
+			failed = False
+			try:
+				await self.process(data)
+			except Exception as e:
+				failed = True
+				logger.error(f"Failed to process update {data.get('update_id')}: {str(e)}")
+			finished = time.perf_counter()
+			backlog.popleft()
+			if backlog:
+				self._ready.put_nowait(key)
+			else:
+				del self._chats[key]
+			with self._lock:
+				self._pending -= 1
+				self.counters["failed" if failed else "processed"] += 1
+				self.wait_histogram.observe(started - queued_at)
+				self.process_histogram.observe(finished - started)
+
+	def depth(self) -> int:
+		with self._lock:
+			return self._pending
+
+	def stats(self) -> dict:
+		chats = list(self._chats.values())
+		with self._lock:
+			return {
+				**self.counters,
+				"depth": self._pending,
+				"max_depth": self.max_depth,
+				"capacity": self.maxsize,
+				"active_chats": len(chats),
+				"largest_chat_backlog": max((len(backlog) for backlog in chats), default=0),
+				"workers": self.workers,
+				"queue_wait": self.wait_histogram.snapshot(),
+				"processing": self.process_histogram.snapshot()
+			}
@@ -6,9 +6,11 @@ import json
 import requests
 import aiohttp
 import urllib
+from Bot import metrics
 from Bot.cache import Cache
-from Bot.config import Config
+from Bot.config import config
 from Bot.database import Database
+from Bot.inline_usage_store import inline_usage_store
 from Bot.Helpers.i18n import I18n
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, User, Message
 from telegram.ext import (
@@ -23,7 +25,6 @@ from pathlib import Path
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
-config = Config()
 
 async def uptodate_query(update: Update = None, context: ContextTypes.DEFAULT_TYPE = None):
 	"""
@@ -192,6 +193,7 @@ async def timeout(update: Update, context: ContextTypes.DEFAULT_TYPE, lang: str
 	context.user_data.clear()
 	return ConversationHandler.END
 
+@metrics.timed(metrics.ai_commentary_seconds)
 async def get_ai_commentary(response: str, lang: str) -> str:
 	i18n = I18n()
 	prompt = i18n.t("AI_PROMPT", lang, response=response)
@@ -282,36 +284,36 @@ async def chat_member_update(update: Update, context: ContextTypes.DEFAULT_TYPE)
 				'admins': json.dumps(admins) if admins else None
 			})
 
+def log_unresolved_inline_usages(rows: list) -> None:
+	"""Write inline usages whose chat never became known, in one batch."""
+	try:
+		Database().log_inline_usages(rows)
+	except Exception as e:
+		logger.error(f"Failed to flush {len(rows)} inline usages: {str(e)}")
+
 async def chosen_inline_result(update: Update, context: ContextTypes.DEFAULT_TYPE):
 	result = update.chosen_inline_result
 	if result.inline_message_id:	# Only store if sent to a chat
-		if 'inline_usages' not in context.bot_data:
-			context.bot_data['inline_usages'] = {}
-		context.bot_data['inline_usages'][result.inline_message_id] = {
-			'user_id': result.from_user.id,
-			'query': result.query
-		}
+		inline_usage_store.add(result.inline_message_id, result.from_user.id, result.query)
+		rows = inline_usage_store.take_flush_batch()
+		if rows:
+			await asyncio.to_thread(log_unresolved_inline_usages, rows)
 
 async def message_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
 	message = update.message
 	if message.inline_message_id:
 		inline_message_id = message.inline_message_id
 		chat_id = message.chat.id
-		db = Database()
-		if 'inline_usages' in context.bot_data and inline_message_id in context.bot_data['inline_usages']:
-			usage = context.bot_data['inline_usages'].pop(inline_message_id)
-			db.log_inline_usage(usage['user_id'], chat_id, usage['query'])
+		usage = inline_usage_store.pop(inline_message_id)
+		if usage is not None:
+			db = Database()
+			db.log_inline_usage(usage.user_id, chat_id, usage.query)
 			if db.is_group_blacklisted(chat_id):
 				await context.bot.edit_message_text(
 					inline_message_id=inline_message_id,
 					text="This bot is not allowed in this group."
 				)
 
-def log_inline_usage(self, user_id: int, chat_id: int, query: str):
-	query = "INSERT INTO inline_usage (user_id, chat_id, query, timestamp) VALUES (%s, %s, %s, %s)"
-	self.cursor.execute(query, (user_id, chat_id, query, datetime.now()))
-	self.conn.commit()
-
 async def get_warning_description(value, language):
 	"""
 	Check if the value exists in warningNumbers.json and return the description for the given language.
@@ -402,6 +404,7 @@ async def check_credits(update, context):
 	if not db.is_beta_tester(user_id):
 		if not db.is_teskilat(user_id):
 			db.decrement_credits(user_id)
+			metrics.credits_consumed.inc()
 
 	return True
 
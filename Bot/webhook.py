@@ -0,0 +1,86 @@
+import asyncio
+import hmac
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Telegram updates are a few KB; anything far larger is not a real update
+MAX_BODY = 1024 * 1024
+TEXT_HEADERS = [(b"content-type", b"text/plain; charset=utf-8")]
+
+class WebhookFront:
+	"""
+	ASGI front for the Telegram webhook.
+
+	POST /bot<token> is answered here without going through Flask: the body
+	is read, parsed and handed to the UpdateQueue, and the response goes out
+	as soon as the update is queued. Every other request, including the
+	admin panel, is passed to the fallback ASGI app unchanged. Lifespan
+	events start the queue and let it drain on shutdown.
+	"""
+
+	def __init__(self, token: str, queue, fallback, max_body: int = MAX_BODY):
+		self.path = f"/bot{token}"
+		self.queue = queue
+		self.fallback = fallback
+		self.max_body = max_body
+
+	async def __call__(self, scope, receive, send):
+		if scope["type"] == "http" and scope["method"] == "POST" and scope["path"].startswith("/bot") \
+				and hmac.compare_digest(scope["path"].encode(), self.path.encode()):
+			await self._webhook(receive, send)
+		elif scope["type"] == "lifespan":
+			await self._lifespan(receive, send)
+		else:
+			await self.fallback(scope, receive, send)
+
+	async def _respond(self, send, status: int, body: bytes, headers: list = None) -> None:
+		await send({"type": "http.response.start", "status": status, "headers": TEXT_HEADERS + (headers or [])})
+		await send({"type": "http.response.body", "body": body})
+
+	async def _webhook(self, receive, send) -> None:
+		chunks = []
+		size = 0
+		while True:
+			message = await receive()
+			if message["type"] == "http.disconnect":
+				return
+			chunk = message.get("body", b"")
+			size += len(chunk)
+			if size > self.max_body:
+				await self._respond(send, 413, b"Too large")
+				return
+			chunks.append(chunk)
+			if not message.get("more_body"):
+				break
+		try:
+			update_data = json.loads(b"".join(chunks))
+		except ValueError:
+			await self._respond(send, 400, b"Invalid update")
+			return
+		if not isinstance(update_data, dict):
+			await self._respond(send, 400, b"Invalid update")
+			return
+		try:
+			status = self.queue.submit(update_data)
+		except Exception as e:
+			logger.error(f"Error queueing update: {str(e)}")
+			await self._respond(send, 500, b"Error")
+			return
+		if status == "full":
+			# Telegram redelivers later instead of us holding the request open
+			await self._respond(send, 503, b"Busy", [(b"retry-after", b"5")])
+		else:
+			await self._respond(send, 200, b"OK")
+
+	async def _lifespan(self, receive, send) -> None:
+		while True:
+			message = await receive()
+			if message["type"] == "lifespan.startup":
+				self.queue.start()
+				await send({"type": "lifespan.startup.complete"})
+			elif message["type"] == "lifespan.shutdown":
+				await asyncio.get_running_loop().run_in_executor(None, self.queue.stop)
+				await send({"type": "lifespan.shutdown.complete"})
+				return
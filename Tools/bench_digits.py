@@ -0,0 +1,73 @@
+"""
+Micro-benchmark: dict-per-character digit conversion vs compiled translate tables.
+
+Run from the repository root:
+	python Tools/bench_digits.py [--count 20000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Bot.Helpers.DigitConverter import digit_converter
+
+def legacy_indian(metin):
+	number_map = {
+		'0': '٠', '1': '١', '2': '٢', '3': '٣', '4': '٤',
+		'5': '٥', '6': '٦', '7': '٧', '8': '٨', '9': '٩', ' ': ' '
+	}
+	return ''.join(number_map.get(char, char) for char in metin)
+
+def legacy_abjad_indian(metin):
+	na = ""
+	chars = re.findall(r'.', metin, re.UNICODE)
+	num_map = {
+		"0": "٠", "1": "١", "2": "٢", "3": "٣", "4": "٤",
+		"5": "٥", "6": "٦", "7": "٧", "8": "٨", "9": "٩"
+	}
+	for char in chars:
+		na += num_map.get(char, char if char != " " else " ")
+	return na
+
+def legacy_invert(metin):
+	number_map = {
+		'0': '٠', '1': '١', '2': '٢', '3': '٣', '4': '٤',
+		'5': '٥', '6': '٦', '7': '٧', '8': '٨', '9': '٩',
+		'٠': '0', '١': '1', '٢': '2', '٣': '3', '٤': '4',
+		'٥': '5', '٦': '6', '٧': '7', '٨': '8', '٩': '9', ' ': ' '
+	}
+	return ''.join(number_map.get(char, char) for char in metin)
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--count", type=int, default=20000, help="numbers per batch")
+	parser.add_argument("--repeat", type=int, default=5)
+	args = parser.parse_args()
+
+	rng = random.Random(7)
+	numbers = [str(rng.randint(0, 10 ** rng.randint(1, 12))) for _ in range(args.count)]
+	inverted = [legacy_invert(number) for number in numbers]
+
+	assert [legacy_indian(n) for n in numbers] == digit_converter.convert_many(numbers, "indian")
+	assert [legacy_abjad_indian(n) for n in numbers] == [digit_converter.to_indian(n) for n in numbers]
+	assert [legacy_invert(n) for n in inverted] == digit_converter.convert_many(inverted, "invert")
+
+	cases = [
+		("NumberConverter.indian (dict)", lambda: [legacy_indian(n) for n in numbers]),
+		("Abjad.indian (re.findall)", lambda: [legacy_abjad_indian(n) for n in numbers]),
+		("to_indian (translate)", lambda: [digit_converter.to_indian(n) for n in numbers]),
+		("convert_many indian", lambda: digit_converter.convert_many(numbers, "indian")),
+		("invert (dict)", lambda: [legacy_invert(n) for n in inverted]),
+		("convert_many invert", lambda: digit_converter.convert_many(inverted, "invert")),
+	]
+	print(f"{args.count} numbers, best of {args.repeat}")
+	for name, func in cases:
+		best = min(timeit.repeat(func, number=1, repeat=args.repeat))
+		print(f"{name:<32} {best * 1000:9.2f} ms")
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,89 @@
+"""
+Benchmark the in-process product search index on a synthetic catalog.
+
+Compares index build time, cold and cached prefix queries against a
+linear substring scan that mirrors the old LIKE '%term%' filter.
+
+Run from the repository root:
+	python Tools/bench_product_search.py [--products 100000] [--queries 200]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Bot.product_search import ProductSearchIndex, normalize_text
+
+WORDS = (
+	"gümüş altın yüzük kolye bileklik tesbih vefk muska tılsım kitap rehber el yapımı "
+	"doğal taş kehribar akik firuze yakut zümrüt kaplama set hediye özel baskı dijital "
+	"pdf ebook numeroloji ebced cifir havas esma dua sure ayet mıknatıs ahşap deri kutu "
+	"amulet talisman ring necklace bracelet stone amber silver gold guide course lesson"
+).split()
+TYPES = ("physical", "digital", "service")
+
+def synthetic_catalog(count: int, rng: random.Random) -> list:
+	return [
+		{
+			"id": product_id,
+			"name": " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 5))) + f" {product_id}",
+			"description": " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 30))),
+			"type": rng.choice(TYPES),
+			"active": rng.random() < 0.9,
+			"created_by": rng.randint(1, 200)
+		}
+		for product_id in range(1, count + 1)
+	]
+
+def linear_scan(catalog: list, terms: str, limit: int = 100) -> list:
+	needle = normalize_text(terms)
+	matches = [
+		product["id"] for product in catalog
+		if product["active"] and (needle in normalize_text(product["name"]) or needle in normalize_text(product["description"]))
+	]
+	return sorted(matches, reverse=True)[:limit]
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--products", type=int, default=100000)
+	parser.add_argument("--queries", type=int, default=200)
+	parser.add_argument("--scan-queries", type=int, default=5, help="linear scans are slow; time only a few")
+	args = parser.parse_args()
+
+	rng = random.Random(42)
+	catalog = synthetic_catalog(args.products, rng)
+	# As-you-type prefixes of one or two words, as sent by the inline shop
+	queries = []
+	for _ in range(args.queries):
+		words = [rng.choice(WORDS) for _ in range(rng.randint(1, 2))]
+		typed = " ".join(words)
+		queries.append(typed[:rng.randint(2, len(typed))])
+
+	index = ProductSearchIndex(loader=lambda: catalog)
+	started = time.perf_counter()
+	index.build()
+	print(f"catalog: {args.products} products")
+	print(f"index build: {(time.perf_counter() - started) * 1000:.0f} ms")
+
+	started = time.perf_counter()
+	hits = sum(len(index.search(query)) for query in queries)
+	cold = time.perf_counter() - started
+	print(f"index, uncached: {cold / len(queries) * 1000:.2f} ms/query ({hits} results)")
+
+	started = time.perf_counter()
+	for query in queries:
+		index.search(query)
+	warm = time.perf_counter() - started
+	print(f"index, cached:   {warm / len(queries) * 1000:.3f} ms/query")
+
+	started = time.perf_counter()
+	for query in queries[:args.scan_queries]:
+		linear_scan(catalog, query)
+	scan = time.perf_counter() - started
+	print(f"linear LIKE-style scan: {scan / args.scan_queries * 1000:.2f} ms/query")
+
+if __name__ == "__main__":
+	main()
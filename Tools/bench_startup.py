@@ -0,0 +1,91 @@
+"""
+Import time of the bot's entry modules and cost of loading the command aliases.
+
+Each target is imported in a fresh interpreter under `python -X importtime`,
+so the numbers are cold-start costs of this checkout. Placeholder credentials
+are set so Config can be built; nothing connects to Telegram or MySQL at
+import time. The alias part compares reading Config/command_aliases.json
+with extracting COMMAND_ALIASES from every locale file.
+
+Run from the repository root:
+	python Tools/bench_startup.py [--target Bot.asgi] [--top 15] [--runs 3]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from Bot.Helpers.CommandAliases import CommandAliases, read_locales, MANIFEST_PATH
+
+PLACEHOLDER_ENV = {
+	"TELEGRAM_TOKEN": "123456:bench",
+	"FLASK_SECRET_KEY": "bench",
+	"MYSQL_HOST": "127.0.0.1",
+	"MYSQL_USER": "bench",
+	"MYSQL_PASSWORD": "bench",
+	"MYSQL_DATABASE": "bench"
+}
+
+def import_times(target: str) -> tuple:
+	"""(total microseconds, {module: cumulative microseconds}) for one cold import."""
+	env = dict(os.environ)
+	for key, value in PLACEHOLDER_ENV.items():
+		env.setdefault(key, value)
+	result = subprocess.run(
+		[sys.executable, "-X", "importtime", "-c", f"import {target}"],
+		cwd=ROOT, env=env, capture_output=True, text=True
+	)
+	if result.returncode != 0:
+		raise RuntimeError(f"import {target} failed:\n{result.stderr.strip().splitlines()[-1]}")
+	modules = {}
+	for line in result.stderr.splitlines():
+		if not line.startswith("import time:") or "|" not in line:
+			continue
+		parts = [part.strip() for part in line[len("import time:"):].split("|")]
+		if not parts[1].isdigit():
+			continue
+		modules[parts[2].strip()] = int(parts[1])
+	return modules.get(target, 0), modules
+
+def time_call(function, runs: int) -> float:
+	samples = []
+	for _ in range(runs):
+		start = time.perf_counter()
+		function()
+		samples.append(time.perf_counter() - start)
+	return statistics.median(samples) * 1000
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument("--target", action="append", help="module to import (repeatable; default Bot.bot and Bot.asgi)")
+	parser.add_argument("--top", type=int, default=15, help="slowest modules to list per target")
+	parser.add_argument("--runs", type=int, default=3, help="runs per measurement; the median is reported")
+	args = parser.parse_args()
+
+	for target in args.target or ["Bot.bot", "Bot.asgi"]:
+		try:
+			runs = [import_times(target) for _ in range(args.runs)]
+		except RuntimeError as e:
+			print(e)
+			continue
+		total = statistics.median(run[0] for run in runs) / 1000
+		print(f"import {target}: {total:.1f} ms (median of {args.runs})")
+		project = {name: cumulative for name, cumulative in runs[-1][1].items() if name.startswith("Bot.") and name != target}
+		for name, cumulative in sorted(project.items(), key=lambda item: -item[1])[:args.top]:
+			print(f"	{cumulative / 1000:8.1f} ms  {name}")
+
+	if MANIFEST_PATH.exists():
+		manifest = time_call(CommandAliases.load, args.runs)
+		print(f"aliases from {MANIFEST_PATH.name}: {manifest:.2f} ms")
+	else:
+		print(f"{MANIFEST_PATH} is missing; run Tools/build_alias_manifest.py")
+	locales = time_call(lambda: CommandAliases(read_locales()), args.runs)
+	print(f"aliases from the locale files: {locales:.2f} ms")
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,125 @@
+"""
+Requests per second on the webhook path: Flask through asgiref vs the native front.
+
+Both variants hand updates to the same UpdateQueue with a no-op handler,
+so the numbers measure only the HTTP layer. Requests are driven in-process
+through the ASGI interface, without sockets, so server and client costs do
+not mask the adapter.
+
+Run from the repository root:
+	python Tools/bench_webhook.py [--requests 20000] [--concurrency 64]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from asgiref.wsgi import WsgiToAsgi
+from flask import Flask, request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Bot.update_queue import UpdateQueue
+from Bot.webhook import WebhookFront
+
+TOKEN = "123456:bench"
+
+def build_flask(queue) -> Flask:
+	"""Same route shape as admin_panel.telegram_webhook."""
+	flask_app = Flask(__name__)
+
+	@flask_app.route("/bot<path:path>", methods=["POST"])
+	def telegram_webhook(path):
+		if not path.startswith(TOKEN):
+			return "Invalid token", 403
+		update_data = request.get_json()
+		if not isinstance(update_data, dict):
+			return "Invalid update", 400
+		if queue.submit(update_data) == "full":
+			return "Busy", 503, {"Retry-After": "5"}
+		return "OK", 200
+
+	@flask_app.route("/en/login")
+	def login():
+		return "login"
+
+	return flask_app
+
+def make_body(update_id: int) -> bytes:
+	return json.dumps({
+		"update_id": update_id,
+		"message": {"message_id": update_id, "date": 0, "chat": {"id": update_id % 500, "type": "private"},
+					"from": {"id": update_id % 500, "is_bot": False, "first_name": "Bench"}, "text": "/abjad test"}
+	}).encode()
+
+async def call(app, path: str, body: bytes, method: str = "POST") -> int:
+	scope = {
+		"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method,
+		"scheme": "https", "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+		"headers": [(b"host", b"bench"), (b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+		"client": ("127.0.0.1", 1), "server": ("bench", 443)
+	}
+	sent = False
+	status = None
+
+	async def receive():
+		nonlocal sent
+		if not sent:
+			sent = True
+			return {"type": "http.request", "body": body, "more_body": False}
+		await asyncio.sleep(3600)
+		return {"type": "http.disconnect"}
+
+	async def send(message):
+		nonlocal status
+		if message["type"] == "http.response.start":
+			status = message["status"]
+
+	await app(scope, receive, send)
+	return status
+
+async def run(app, first_id: int, count: int, concurrency: int) -> float:
+	path = f"/bot{TOKEN}"
+	next_id = first_id
+
+	async def client():
+		nonlocal next_id
+		while next_id < first_id + count:
+			update_id = next_id
+			next_id += 1
+			status = await call(app, path, make_body(update_id))
+			assert status == 200, status
+
+	started = time.perf_counter()
+	await asyncio.gather(*(client() for _ in range(concurrency)))
+	return count / (time.perf_counter() - started)
+
+async def main_async(count: int, concurrency: int) -> None:
+	async def noop(data):
+		pass
+
+	queue = UpdateQueue(noop, workers=16, maxsize=count * 4, dedup_size=count * 4)
+	flask_asgi = WsgiToAsgi(build_flask(queue))
+	front = WebhookFront(TOKEN, queue, flask_asgi)
+
+	assert await call(front, "/en/login", b"", "GET") == 200
+	assert await call(front, "/botwrong", b"{}") == 403
+	await run(flask_asgi, 1, 500, concurrency)
+	await run(front, 1000, 500, concurrency)
+
+	flask_rate = await run(flask_asgi, 100000, count, concurrency)
+	native_rate = await run(front, 200000, count, concurrency)
+	print(f"Flask via WsgiToAsgi: {flask_rate:8.0f} req/s")
+	print(f"native WebhookFront:  {native_rate:8.0f} req/s ({native_rate / flask_rate:.1f}x)")
+	queue.stop()
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument("--requests", type=int, default=20000)
+	parser.add_argument("--concurrency", type=int, default=64)
+	args = parser.parse_args()
+	asyncio.run(main_async(args.requests, args.concurrency))
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,38 @@
+"""
+Precompute Config/command_aliases.json from the COMMAND_ALIASES of every locale.
+
+The bot reads this small manifest at startup instead of the 55-70 KB locale
+files. It is rebuilt in the Docker image; if a locale file is newer than
+the manifest, the bot falls back to reading the locales.
+
+Run from the repository root:
+	python Tools/build_alias_manifest.py [--check]
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Bot.Helpers.CommandAliases import MANIFEST_PATH, build_manifest
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument("--check", action="store_true", help="exit 1 if the manifest is out of date instead of writing it")
+	args = parser.parse_args()
+	manifest = build_manifest()
+	text = json.dumps(manifest, ensure_ascii=False, indent="\t", sort_keys=True) + "\n"
+	if args.check:
+		current = MANIFEST_PATH.read_text(encoding="utf-8") if MANIFEST_PATH.exists() else None
+		if current != text:
+			print(f"{MANIFEST_PATH} is out of date")
+			sys.exit(1)
+		print(f"{MANIFEST_PATH} is up to date")
+		return
+	MANIFEST_PATH.write_text(text, encoding="utf-8")
+	commands = {command for aliases in manifest["languages"].values() for command in aliases}
+	print(f"Wrote {MANIFEST_PATH}: {len(manifest['languages'])} languages, {len(commands)} commands")
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,129 @@
+"""
+Local stand-in for the GitHub REST endpoints the traffic dashboard reads.
+
+Serves deterministic JSON with ETags and answers If-None-Match with 304,
+so the refresher can be exercised without a token or network access.
+
+Run from the repository root:
+	python Tools/fake_github_server.py [--port 8765]          # serve until interrupted
+	python Tools/fake_github_server.py --check                # run the refresher against it
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+OWNER = "octo"
+REPO = "numbers"
+
+def make_state(commit_count: int = 120) -> dict:
+	commits = [
+		{"sha": hashlib.sha1(str(index).encode()).hexdigest(), "commit": {"message": f"Commit {index}"}}
+		for index in range(commit_count, 0, -1)
+	]
+	return {
+		"": {"full_name": f"{OWNER}/{REPO}", "stargazers_count": 42, "forks_count": 7},
+		"/traffic/views": {"count": 310, "uniques": 55, "views": []},
+		"/traffic/clones": {"count": 12, "uniques": 4, "clones": []},
+		"/traffic/popular/referrers": [{"referrer": "github.com", "count": 20, "uniques": 9}],
+		"/traffic/popular/paths": [{"path": f"/{OWNER}/{REPO}", "title": REPO, "count": 80, "uniques": 30}],
+		"/contributors": [{"login": "octocat", "contributions": commit_count}],
+		"/commits": commits
+	}
+
+def build_app(state: dict, stats: dict, delay: float = 0.0) -> web.Application:
+	async def handle(request):
+		prefix = f"/repos/{OWNER}/{REPO}"
+		if not request.path.startswith(prefix):
+			return web.json_response({"message": "Not Found"}, status=404)
+		resource = request.path[len(prefix):]
+		if resource not in state:
+			return web.json_response({"message": "Not Found"}, status=404)
+		if delay:
+			await asyncio.sleep(delay)
+		data = state[resource]
+		if resource == "/commits":
+			per_page = int(request.query.get("per_page", 30))
+			page = int(request.query.get("page", 1))
+			data = data[(page - 1) * per_page:page * per_page]
+		body = json.dumps(data).encode()
+		etag = '"' + hashlib.md5(body).hexdigest() + '"'
+		stats["requests"] += 1
+		if request.headers.get("If-None-Match") == etag:
+			stats["not_modified"] += 1
+			return web.Response(status=304, headers={"ETag": etag})
+		return web.Response(body=body, content_type="application/json", headers={"ETag": etag})
+
+	app = web.Application()
+	app.router.add_get("/{tail:.*}", handle)
+	return app
+
+def serve_in_thread(port: int, state: dict, stats: dict, delay: float = 0.0):
+	"""Start the fake server on a background loop; returns once it accepts connections."""
+	ready = threading.Event()
+
+	def run():
+		loop = asyncio.new_event_loop()
+		asyncio.set_event_loop(loop)
+		runner = web.AppRunner(build_app(state, stats, delay))
+		loop.run_until_complete(runner.setup())
+		loop.run_until_complete(web.TCPSite(runner, "127.0.0.1", port).start())
+		ready.set()
+		loop.run_forever()
+
+	threading.Thread(target=run, daemon=True).start()
+	ready.wait(5)
+
+def check(port: int, delay: float) -> int:
+	from Bot.github_traffic import GitHubTrafficRefresher
+
+	state = make_state()
+	stats = {"requests": 0, "not_modified": 0}
+	serve_in_thread(port, state, stats, delay)
+	refresher = GitHubTrafficRefresher("token", OWNER, REPO, f"http://127.0.0.1:{port}", interval=3600)
+
+	started = time.perf_counter()
+	snapshot = refresher.snapshot(per_page=25, page=1)
+	cold = time.perf_counter() - started
+	assert snapshot["repo"]["full_name"] == f"{OWNER}/{REPO}", snapshot
+	assert snapshot["total_commits"] == 120 and snapshot["total_pages"] == 5, snapshot
+	assert len(snapshot["commits"]) == 25
+	print(f"cold snapshot: {cold * 1000:.1f} ms for {stats['requests']} requests with {delay * 1000:.0f} ms latency each")
+
+	started = time.perf_counter()
+	for _ in range(1000):
+		refresher.snapshot(per_page=25, page=1)
+	print(f"cached snapshot: {(time.perf_counter() - started):.3f} ms/request")
+
+	refresher._run_coroutine(refresher.refresh())
+	print(f"revalidation: {stats['not_modified']} of {stats['requests']} responses were 304")
+	assert stats["not_modified"] == 7, stats
+
+	state["/traffic/views"] = {"count": 311, "uniques": 56, "views": []}
+	refresher._run_coroutine(refresher.refresh())
+	assert refresher.snapshot()["traffic"]["count"] == 311
+	print("changed resource picked up after revalidation")
+	refresher.stop()
+	return 0
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument("--port", type=int, default=8765)
+	parser.add_argument("--delay", type=float, default=0.05, help="simulated per-request latency in seconds")
+	parser.add_argument("--check", action="store_true", help="run the refresher against the fake server and exit")
+	args = parser.parse_args()
+	if args.check:
+		sys.exit(check(args.port, args.delay))
+	stats = {"requests": 0, "not_modified": 0}
+	print(f"Fake GitHub API on http://127.0.0.1:{args.port} (GITHUB_API_URL), repo {OWNER}/{REPO}")
+	web.run_app(build_app(make_state(), stats, args.delay), host="127.0.0.1", port=args.port)
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,218 @@
+"""
+Minimal local IMAP server for exercising the Papara mailbox worker.
+
+Implements just what the worker uses: LOGIN, SELECT/EXAMINE, UID SEARCH
+(UID range, FROM, SINCE), UID FETCH of a UID set with INTERNALDATE and
+BODY.PEEK[], NOOP, IDLE/DONE and LOGOUT. Messages can be added
+while clients are connected; idling clients get an EXISTS push.
+
+Run from the repository root:
+	python Tools/fake_imap_server.py --check [--no-idle]
+"""
+import argparse
+import imaplib
+import os
+import re
+import socketserver
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from email.message import EmailMessage
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class Mailbox:
+	def __init__(self):
+		self.messages = []	# (uid, sender, raw bytes, internal date as a timestamp)
+		self.next_uid = 1
+		self.condition = threading.Condition()
+
+	def add(self, sender: str, subject: str, body: str, received_at: float = None) -> int:
+		msg = EmailMessage()
+		msg["From"] = sender
+		msg["To"] = "shop@example.com"
+		msg["Subject"] = subject
+		msg.set_content(body)
+		with self.condition:
+			uid = self.next_uid
+			self.next_uid += 1
+			self.messages.append((uid, sender, msg.as_bytes(), received_at or time.time()))
+			self.condition.notify_all()
+		return uid
+
+def parse_uid_set(text: str, highest: int) -> set:
+	"""UIDs named by a set such as 1,3,5:7 or 4:*"""
+	uids = set()
+	for part in text.split(","):
+		first, _, last = part.partition(":")
+		first = highest if first == "*" else int(first)
+		last = first if not last else highest if last == "*" else int(last)
+		uids.update(range(min(first, last), max(first, last) + 1))
+	return uids
+
+class IMAPHandler(socketserver.StreamRequestHandler):
+	def send(self, line: str) -> None:
+		self.wfile.write(line.encode() + b"\r\n")
+		self.wfile.flush()
+
+	def handle(self):
+		server = self.server
+		mailbox = server.mailbox
+		capabilities = "IMAP4rev1" + (" IDLE" if server.idle else "")
+		self.send(f"* OK [CAPABILITY {capabilities}] fake IMAP ready")
+		while True:
+			line = self.rfile.readline()
+			if not line:
+				return
+			tag, _, rest = line.decode().strip().partition(" ")
+			command, _, args = rest.partition(" ")
+			command = command.upper()
+			server.commands.append(command if command != "UID" else "UID " + args.split(" ")[0].upper())
+			if command == "CAPABILITY":
+				self.send(f"* CAPABILITY {capabilities}")
+				self.send(f"{tag} OK CAPABILITY completed")
+			elif command == "LOGIN":
+				self.send(f"{tag} OK LOGIN completed")
+			elif command in ("SELECT", "EXAMINE"):
+				self.reported = len(mailbox.messages)
+				self.send(f"* {self.reported} EXISTS")
+				self.send("* FLAGS (\\Seen)")
+				self.send(f"{tag} OK [READ-ONLY] {command} completed")
+			elif command == "NOOP":
+				self.send(f"{tag} OK NOOP completed")
+			elif command == "UID":
+				self.uid_command(tag, args)
+			elif command == "IDLE":
+				self.idle(tag)
+			elif command == "LOGOUT":
+				self.send("* BYE logging out")
+				self.send(f"{tag} OK LOGOUT completed")
+				return
+			else:
+				self.send(f"{tag} BAD unsupported command")
+
+	def uid_command(self, tag: str, args: str) -> None:
+		mailbox = self.server.mailbox
+		subcommand, _, rest = args.partition(" ")
+		if subcommand.upper() == "SEARCH":
+			start = int(re.search(r"UID (\d+):\*", rest).group(1))
+			sender = re.search(r'FROM "([^"]+)"', rest).group(1)
+			since = re.search(r"SINCE (\d{1,2}-[A-Za-z]{3}-\d{4})", rest)
+			# SINCE compares the date part of the internal date only, as servers do
+			since = datetime.strptime(since.group(1), "%d-%b-%Y").date() if since else None
+			matching = [
+				uid for uid, frm, _, received_at in mailbox.messages
+				if sender in frm and (since is None or datetime.fromtimestamp(received_at, timezone.utc).date() >= since)
+			]
+			# Like real servers, "n:*" includes the highest UID even when it is below n
+			uids = [uid for uid in matching if uid >= start] or matching[-1:]
+			self.send("* SEARCH " + " ".join(str(uid) for uid in uids))
+			self.send(f"{tag} OK SEARCH completed")
+		elif subcommand.upper() == "FETCH":
+			uids = parse_uid_set(rest.split(" ")[0], mailbox.messages[-1][0] if mailbox.messages else 0)
+			self.server.fetch_commands += 1
+			for sequence, (uid, _, raw, received_at) in enumerate(mailbox.messages, 1):
+				if uid in uids:
+					self.server.fetched.append(uid)
+					header = f"* {sequence} FETCH (UID {uid} INTERNALDATE {imaplib.Time2Internaldate(received_at)} BODY[] {{{len(raw)}}}"
+					self.wfile.write(header.encode() + b"\r\n" + raw + b")\r\n")
+			self.send(f"{tag} OK FETCH completed")
+		else:
+			self.send(f"{tag} BAD unsupported UID command")
+
+	def idle(self, tag: str) -> None:
+		mailbox = self.server.mailbox
+		self.send("+ idling")
+		done = threading.Event()
+
+		def push():
+			# Mail that arrived since the count last reported to this session is announced at once
+			with mailbox.condition:
+				while not done.is_set() and len(mailbox.messages) == self.reported:
+					mailbox.condition.wait(0.2)
+			if not done.is_set():
+				self.reported = len(mailbox.messages)
+				self.send(f"* {self.reported} EXISTS")
+
+		pusher = threading.Thread(target=push, daemon=True)
+		pusher.start()
+		line = self.rfile.readline()
+		done.set()
+		pusher.join()
+		if line.strip().upper() == b"DONE":
+			self.send(f"{tag} OK IDLE terminated")
+
+class FakeIMAPServer(socketserver.ThreadingTCPServer):
+	daemon_threads = True
+	allow_reuse_address = True
+
+	def __init__(self, address, idle: bool = True):
+		super().__init__(address, IMAPHandler)
+		self.mailbox = Mailbox()
+		self.idle = idle
+		self.commands = []
+		self.fetched = []
+		self.fetch_commands = 0
+
+def wait_for(predicate, timeout: float = 5.0) -> float:
+	started = time.perf_counter()
+	while not predicate():
+		if time.perf_counter() - started > timeout:
+			raise AssertionError("timed out")
+		time.sleep(0.005)
+	return time.perf_counter() - started
+
+def check(idle: bool) -> int:
+	from Bot.Helpers.papara_mailbox import PaparaMailboxWorker, PAPARA_SENDER
+
+	server = FakeIMAPServer(("127.0.0.1", 0), idle=idle)
+	threading.Thread(target=server.serve_forever, daemon=True).start()
+	mailbox = server.mailbox
+	# Older than a payment request can live, so the first sync must not fetch it
+	mailbox.add(f"Papara <{PAPARA_SENDER}>", "Hesabına para geldi", "Açıklama: payment_41_1600000000",
+				received_at=time.time() - 30 * 24 * 3600)
+	mailbox.add(f"Papara <{PAPARA_SENDER}>", "Hesabına para geldi", "Açıklama: payment_42_1700000000")
+	mailbox.add("friend@example.com", "Hello", "payment_1_1 is not a Papara mail")
+	mailbox.add(f"Papara <{PAPARA_SENDER}>", "Kampanya", "payment_7_7 in an advert")
+
+	worker = PaparaMailboxWorker("shop@example.com", "secret", host="127.0.0.1", port=server.server_address[1],
+								 use_ssl=False, poll_interval=0.2)
+	worker.start()
+	worker.synced.wait(5)
+	assert worker.has_payment("payment_42_1700000000")
+	assert not worker.has_payment("payment_1_1") and not worker.has_payment("payment_7_7")
+	assert not worker.has_payment("payment_41_1600000000")
+	# Both Papara mails of the first sync come in one UID FETCH
+	assert server.fetch_commands == 1, server.fetch_commands
+
+	mailbox.add(f"Papara <{PAPARA_SENDER}>", "Hesabına para geldi", "Açıklama: payment_43_1700000100")
+	latency = wait_for(lambda: worker.has_payment("payment_43_1700000100"))
+	mode = "IDLE" if idle else "NOOP polling"
+	print(f"{mode}: new payment indexed {latency * 1000:.0f} ms after delivery")
+
+	started = time.perf_counter()
+	for _ in range(100000):
+		worker.has_payment("payment_43_1700000100")
+	print(f"lookup: {(time.perf_counter() - started) * 10:.3f} us")
+
+	assert sorted(server.fetched) == [2, 4, 5], server.fetched
+	print(f"fetched UIDs {server.fetched} in {server.fetch_commands} FETCH commands; logins: {server.commands.count('LOGIN')}")
+	worker.stop()
+	server.shutdown()
+	return 0
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument("--port", type=int, default=1143)
+	parser.add_argument("--no-idle", action="store_true", help="do not advertise IDLE")
+	parser.add_argument("--check", action="store_true", help="run the mailbox worker against the server and exit")
+	args = parser.parse_args()
+	if args.check:
+		sys.exit(check(not args.no_idle))
+	server = FakeIMAPServer(("127.0.0.1", args.port), idle=not args.no_idle)
+	print(f"Fake IMAP server on 127.0.0.1:{args.port}")
+	server.serve_forever()
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,198 @@
+"""
+Load-test harness that replays Telegram updates against the bot webhook.
+
+Updates come from a JSON-lines recording (one update per line) or are
+generated as text messages spread over a number of chats. A share of them
+can be sent twice to exercise update_id deduplication. Ack latency and
+status codes are reported per run.
+
+Run from the repository root:
+	python Tools/replay_updates.py --url https://host/bot<TOKEN> --file updates.jsonl
+	python Tools/replay_updates.py --check    # inline vs queued webhook, with a simulated slow handler
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import aiohttp
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Bot.update_queue import UpdateQueue, update_chat_key
+
+def load_updates(path: str) -> list:
+	with open(path, encoding="utf-8") as f:
+		return [json.loads(line) for line in f if line.strip()]
+
+def generate_updates(count: int, chats: int) -> list:
+	updates = []
+	for update_id in range(1, count + 1):
+		chat_id = 1000 + update_id % chats
+		updates.append({
+			"update_id": update_id,
+			"message": {
+				"message_id": update_id,
+				"date": int(time.time()),
+				"chat": {"id": chat_id, "type": "private"},
+				"from": {"id": chat_id, "is_bot": False, "first_name": "Load"},
+				"text": f"/abjad test {update_id}"
+			}
+		})
+	return updates
+
+def with_duplicates(updates: list, share: float, seed: int = 7) -> list:
+	"""Insert redeliveries shortly after the original, like Telegram's retries."""
+	rng = random.Random(seed)
+	replayed = []
+	for update in updates:
+		replayed.append(update)
+		if rng.random() < share:
+			replayed.append(update)
+	return replayed
+
+def percentile(values: list, q: float) -> float:
+	if not values:
+		return 0.0
+	ordered = sorted(values)
+	return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+async def replay(url: str, updates: list, concurrency: int) -> dict:
+	latencies = []
+	statuses = {}
+	semaphore = asyncio.Semaphore(concurrency)
+	connector = aiohttp.TCPConnector(limit=concurrency)
+
+	async def send(session, update):
+		async with semaphore:
+			started = time.perf_counter()
+			async with session.post(url, json=update) as response:
+				await response.read()
+				latencies.append(time.perf_counter() - started)
+				statuses[response.status] = statuses.get(response.status, 0) + 1
+
+	started = time.perf_counter()
+	async with aiohttp.ClientSession(connector=connector) as session:
+		# Keep each chat's updates in order on the wire, as Telegram does
+		by_chat = {}
+		for update in updates:
+			by_chat.setdefault(update_chat_key(update), []).append(update)
+
+		async def send_chat(chat_updates):
+			for update in chat_updates:
+				await send(session, update)
+
+		await asyncio.gather(*(send_chat(chat_updates) for chat_updates in by_chat.values()))
+	elapsed = time.perf_counter() - started
+	return {
+		"sent": len(latencies),
+		"elapsed": elapsed,
+		"rate": len(latencies) / elapsed if elapsed else 0.0,
+		"p50": percentile(latencies, 0.5),
+		"p95": percentile(latencies, 0.95),
+		"max": max(latencies, default=0.0),
+		"statuses": statuses
+	}
+
+def report(label: str, result: dict) -> None:
+	print(f"{label}: {result['sent']} requests in {result['elapsed']:.2f} s ({result['rate']:.0f}/s), "
+		  f"ack p50 {result['p50'] * 1000:.1f} ms, p95 {result['p95'] * 1000:.1f} ms, "
+		  f"max {result['max'] * 1000:.1f} ms, statuses {result['statuses']}")
+
+def build_webhook(process, queue=None) -> web.Application:
+	"""Stand-in for the Flask webhook: inline processing, or submit to an UpdateQueue."""
+	async def handle(request):
+		data = await request.json()
+		if queue is None:
+			await process(data)
+			return web.Response(text="OK")
+		if queue.submit(data) == "full":
+			return web.Response(text="Busy", status=503, headers={"Retry-After": "5"})
+		return web.Response(text="OK")
+
+	app = web.Application()
+	app.router.add_post("/bot{tail:.*}", handle)
+	return app
+
+async def serve(app: web.Application):
+	runner = web.AppRunner(app)
+	await runner.setup()
+	site = web.TCPSite(runner, "127.0.0.1", 0)
+	await site.start()
+	port = site._server.sockets[0].getsockname()[1]
+	return runner, f"http://127.0.0.1:{port}/botTOKEN"
+
+async def check(count: int, chats: int, delay: float, workers: int, concurrency: int) -> int:
+	updates = generate_updates(count, chats)
+	replayed = with_duplicates(updates, 0.1)
+
+	handled = []
+
+	async def slow_handler(data):
+		# Blocking pieces (DB writes, HTTP calls) are simulated with a sleep
+		await asyncio.sleep(delay)
+		handled.append(data)
+
+	runner, url = await serve(build_webhook(slow_handler))
+	report("inline", await replay(url, updates[:count // 4], concurrency))
+	await runner.cleanup()
+
+	handled.clear()
+	queue = UpdateQueue(slow_handler, workers=workers, maxsize=count * 2)
+	runner, url = await serve(build_webhook(slow_handler, queue))
+	result = await replay(url, replayed, concurrency)
+	report("queued", result)
+	started = time.perf_counter()
+	while queue.depth():
+		await asyncio.sleep(0.01)
+	print(f"queue drained {(time.perf_counter() - started):.2f} s after the last ack")
+	await runner.cleanup()
+
+	stats = queue.stats()
+	print(f"queue stats: received {stats['received']}, duplicates {stats['duplicates']}, "
+		  f"max depth {stats['max_depth']}, wait p95 {stats['queue_wait']['p95'] * 1000:.0f} ms")
+	assert len(handled) == count, (len(handled), count)
+	assert stats["duplicates"] == len(replayed) - count, stats
+	last_seen = {}
+	for data in handled:
+		chat = update_chat_key(data)
+		assert data["update_id"] > last_seen.get(chat, 0), f"chat {chat} processed out of order"
+		last_seen[chat] = data["update_id"]
+	print("every update processed once, in order per chat")
+
+	handled.clear()
+	small = UpdateQueue(slow_handler, workers=2, maxsize=4)
+	runner, url = await serve(build_webhook(slow_handler, small))
+	result = await replay(url, generate_updates(50, 10), concurrency)
+	await runner.cleanup()
+	assert result["statuses"].get(503), result
+	print(f"backpressure: {result['statuses'].get(503)} of 50 rejected with 503 when the queue is full")
+	queue.stop()
+	small.stop()
+	return 0
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument("--url", help="webhook URL, e.g. https://host/bot<TOKEN>")
+	parser.add_argument("--file", help="JSON-lines file of recorded updates")
+	parser.add_argument("--generate", type=int, default=2000, help="number of synthetic updates without --file")
+	parser.add_argument("--chats", type=int, default=200, help="chats the synthetic updates are spread over")
+	parser.add_argument("--duplicates", type=float, default=0.0, help="share of updates sent twice")
+	parser.add_argument("--concurrency", type=int, default=64)
+	parser.add_argument("--check", action="store_true", help="compare inline and queued processing locally and exit")
+	parser.add_argument("--delay", type=float, default=0.05, help="simulated handler time in --check mode")
+	parser.add_argument("--workers", type=int, default=16, help="queue workers in --check mode")
+	args = parser.parse_args()
+	if args.check:
+		sys.exit(asyncio.run(check(args.generate, args.chats, args.delay, args.workers, args.concurrency)))
+	if not args.url:
+		parser.error("--url is required unless --check is given")
+	updates = load_updates(args.file) if args.file else generate_updates(args.generate, args.chats)
+	updates = with_duplicates(updates, args.duplicates)
+	report("replay", asyncio.run(replay(args.url, updates, args.concurrency)))
+
+if __name__ == "__main__":
+	main()